@@ -0,0 +1,127 @@
+"""Deterministic synthetic ORC files for benchmarks.
+
+The same arguments always produce the same file, so timings from different
+runs and different machines are comparable. Columns cycle through the
+enabled kinds; every column gets nulls at the requested density.
+"""
+import argparse
+from typing import List, Sequence
+
+import numpy as np
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+
+SCALAR_KINDS = ('int', 'double', 'string', 'timestamp')
+NESTED_KINDS = ('list_int', 'list_struct', 'struct')
+KINDS = SCALAR_KINDS + NESTED_KINDS
+
+_WORDS = np.array(['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel',
+                   'india', 'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa'])
+
+
+def _validity(rng: np.random.Generator, rows: int, null_density: float):
+    if null_density <= 0:
+        return None
+    return pyarrow.array(rng.random(rows) >= null_density)
+
+
+def _with_nulls(array: pyarrow.Array, valid) -> pyarrow.Array:
+    if valid is None:
+        return array
+    return pc.if_else(valid, array, pyarrow.nulls(len(array), array.type))
+
+
+def _offsets(rng: np.random.Generator, rows: int, max_length: int) -> np.ndarray:
+    lengths = rng.integers(0, max_length + 1, rows)
+    return np.concatenate([[0], np.cumsum(lengths)]).astype(np.int32)
+
+
+def make_column(kind: str, rows: int, rng: np.random.Generator, null_density: float) -> pyarrow.Array:
+    """Build one column of the given kind."""
+    valid = _validity(rng, rows, null_density)
+    if kind == 'int':
+        array = pyarrow.array(rng.integers(0, 1_000_000, rows))
+    elif kind == 'double':
+        array = pyarrow.array(rng.normal(100.0, 25.0, rows))
+    elif kind == 'string':
+        words = _WORDS[rng.integers(0, len(_WORDS), rows)]
+        numbers = rng.integers(0, 10_000, rows).astype(str)
+        array = pyarrow.array(np.char.add(np.char.add(words, '-'), numbers))
+    elif kind == 'timestamp':
+        millis = 1_600_000_000_000 + rng.integers(0, 10 ** 10, rows)
+        array = pyarrow.array(millis, type=pyarrow.timestamp('ms'))
+    elif kind == 'list_int':
+        offsets = _offsets(rng, rows, 8)
+        array = pyarrow.ListArray.from_arrays(offsets, pyarrow.array(rng.integers(0, 1000, offsets[-1])))
+    elif kind == 'list_struct':
+        offsets = _offsets(rng, rows, 4)
+        count = int(offsets[-1])
+        values = pyarrow.StructArray.from_arrays(
+            [pyarrow.array(_WORDS[rng.integers(0, len(_WORDS), count)]),
+             pyarrow.array(rng.integers(0, 100, count))],
+            names=['key', 'value']
+        )
+        array = pyarrow.ListArray.from_arrays(offsets, values)
+    elif kind == 'struct':
+        array = pyarrow.StructArray.from_arrays(
+            [pyarrow.array(rng.integers(0, 1000, rows)),
+             pyarrow.array(_WORDS[rng.integers(0, len(_WORDS), rows)]),
+             pyarrow.array(rng.random(rows))],
+            names=['x', 'label', 'weight']
+        )
+    else:
+        raise ValueError(f"Unknown column kind '{kind}', expected one of: {', '.join(KINDS)}")
+    return _with_nulls(array, valid)
+
+
+def make_table(rows: int, columns: int, nested: Sequence[str] = NESTED_KINDS,
+               null_density: float = 0.05, seed: int = 0) -> pyarrow.Table:
+    """Build a deterministic table.
+
+    Args:
+        rows: Number of rows
+        columns: Number of columns
+        nested: Nested kinds to include alongside the scalar ones
+        null_density: Fraction of null cells per column
+        seed: Random seed
+
+    Returns:
+        The table
+    """
+    kinds: List[str] = list(SCALAR_KINDS) + [kind for kind in NESTED_KINDS if kind in nested]
+    rng = np.random.default_rng(seed)
+    arrays, names = [], []
+    for index in range(columns):
+        kind = kinds[index % len(kinds)]
+        arrays.append(make_column(kind, rows, rng, null_density))
+        names.append(f"{kind}_{index}")
+    return pyarrow.Table.from_arrays(arrays, names=names)
+
+
+def generate(path: str, rows: int, columns: int, nested: Sequence[str] = NESTED_KINDS,
+             null_density: float = 0.05, seed: int = 0, stripe_size: int = 64 << 20) -> pyarrow.Schema:
+    """Write a deterministic synthetic ORC file and return its schema."""
+    table = make_table(rows, columns, nested, null_density, seed)
+    orc.write_table(table, path, stripe_size=stripe_size)
+    return table.schema
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic ORC file.")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=14)
+    parser.add_argument("--nested", default=",".join(NESTED_KINDS),
+                        help="comma separated nested kinds to include (empty for none)")
+    parser.add_argument("--null-density", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    nested = [kind for kind in args.nested.split(",") if kind]
+    schema = generate(args.path, args.rows, args.columns, nested, args.null_density, args.seed)
+    print(f"Wrote {args.rows:,} rows x {len(schema)} columns to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Time the editor's hot paths on a synthetic ORC file.
+
+Each case is prepared outside the timed region and then run ``--repeat``
+times; the best and median wall times are reported together with the peak
+resident set size reached while the case ran and the Arrow memory pool
+usage afterwards. Results are written as JSON and can be compared against
+an earlier run with ``--baseline``::
+
+    python -m benchmarks.run --rows 200000 --output baseline.json
+    python -m benchmarks.run --rows 200000 --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import pyarrow
+
+from benchmarks.generator import NESTED_KINDS, generate
+from src.data.data_manager import ORCDataManager
+
+# Rows touched by the per-row cases; enough to average out call overhead
+ROW_SAMPLE = 1000
+
+
+class SkipCase(Exception):
+    """Raised while preparing a case that cannot run here (e.g. no display)."""
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _max_rss_bytes() -> int:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PeakRSS:
+    """Sample the resident set size on a thread while a case runs."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _rss_bytes() or 0)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if _rss_bytes() is None:
+            # No /proc: fall back to the process high-water mark
+            self.peak = _max_rss_bytes()
+            return self
+        self.peak = _rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._thread is None:
+            self.peak = _max_rss_bytes()
+            return
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_bytes() or 0)
+
+
+class Context:
+    """The generated file and the state shared between cases."""
+
+    def __init__(self, path: str, workdir: str):
+        self.path = path
+        self.workdir = workdir
+
+    def loaded(self) -> ORCDataManager:
+        manager = ORCDataManager()
+        manager.load_file(self.path)
+        return manager
+
+    def sample_rows(self, manager: ORCDataManager) -> List[int]:
+        rows = len(manager.df)
+        step = max(1, rows // ROW_SAMPLE)
+        return list(range(0, rows, step))[:ROW_SAMPLE]
+
+    def edits(self, manager: ORCDataManager) -> List[Dict]:
+        """Scalar edits that write back each sampled row's own values."""
+        columns = [column for column in manager.df.columns
+                   if pd.api.types.is_numeric_dtype(manager.df[column].dtype)
+                   or pd.api.types.is_string_dtype(manager.df[column].dtype)]
+        return [(row, {column: manager.df.at[row, column] for column in columns})
+                for row in self.sample_rows(manager)]
+
+
+def prepare_load_file(ctx: Context) -> Callable[[], None]:
+    return lambda: ORCDataManager().load_file(ctx.path)
+
+
+def prepare_convert_to_pandas(ctx: Context) -> Callable[[], None]:
+    manager = ctx.loaded()
+    table = manager.table
+    return lambda: manager._convert_to_pandas(table)
+
+
+def prepare_is_empty_column(ctx: Context) -> Callable[[], None]:
+    manager = ctx.loaded()
+    columns = list(manager.df.columns)
+
+    def run():
+        for column in columns:
+            manager.is_empty_column(column)
+    return run
+
+
+def prepare_get_row_display_values(ctx: Context) -> Callable[[], None]:
+    manager = ctx.loaded()
+    rows = ctx.sample_rows(manager)
+
+    def run():
+        for row in rows:
+            manager.get_row_display_values(row)
+    return run
+
+
+def prepare_update_row(ctx: Context) -> Callable[[], None]:
+    manager = ctx.loaded()
+    edits = ctx.edits(manager)
+
+    def run():
+        for row, values in edits:
+            manager.update_row(row, values)
+    return run
+
+
+def prepare_create_table(ctx: Context) -> Callable[[], None]:
+    manager = ctx.loaded()
+    for row, values in ctx.edits(manager):
+        manager.update_row(row, values)
+    return manager._create_table
+
+
+def prepare_write_table(ctx: Context) -> Callable[[], None]:
+    manager = ctx.loaded()
+    table = manager._create_table()
+    destination = os.path.join(ctx.workdir, 'written.orc')
+    return lambda: manager._write_table(destination, table)
+
+
+def prepare_treeview(ctx: Context) -> Callable[[], None]:
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:  # ImportError or TclError without a display
+        raise SkipCase(f"no Tk display ({str(e).splitlines()[0]})")
+    root.withdraw()
+
+    from src.ui.orc_editor import ORCEditor
+    editor = ORCEditor(root)
+    editor.data_manager.load_file(ctx.path)
+    editor.current_file = ctx.path
+
+    def run():
+        editor.update_table_view()
+        root.update_idletasks()
+    run.cleanup = root.destroy
+    return run
+
+
+CASES = [
+    ('load_file', prepare_load_file),
+    ('_convert_to_pandas', prepare_convert_to_pandas),
+    ('is_empty_column', prepare_is_empty_column),
+    ('get_row_display_values', prepare_get_row_display_values),
+    ('update_row', prepare_update_row),
+    ('_create_table', prepare_create_table),
+    ('_write_table', prepare_write_table),
+    ('treeview', prepare_treeview),
+]
+
+
+def run_case(ctx: Context, prepare: Callable, repeat: int) -> Dict:
+    """Prepare and time one case; returns its result record."""
+    try:
+        run = prepare(ctx)
+    except SkipCase as e:
+        return {'skipped': str(e)}
+
+    times = []
+    arrow_before = pyarrow.total_allocated_bytes()
+    try:
+        with PeakRSS() as rss:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - started)
+    finally:
+        cleanup = getattr(run, 'cleanup', None)
+        if cleanup is not None:
+            cleanup()
+    arrow_after = pyarrow.total_allocated_bytes()
+
+    return {
+        'seconds': min(times),
+        'median': statistics.median(times),
+        'runs': times,
+        'peak_rss_mb': round(rss.peak / (1 << 20), 1),
+        'arrow_bytes': arrow_after,
+        'arrow_delta': arrow_after - arrow_before,
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print a comparison against a baseline and return the regressed cases."""
+    if results['dataset'] != baseline.get('dataset'):
+        print("warning: the baseline was recorded on a different dataset, "
+              "ratios are not comparable", file=sys.stderr)
+
+    regressions = []
+    print(f"\n{'case':<26}{'baseline':>12}{'current':>12}{'ratio':>9}{'rss MB':>14}")
+    for name, current in results['cases'].items():
+        previous = baseline.get('cases', {}).get(name)
+        if 'seconds' not in current or not previous or 'seconds' not in previous:
+            continue
+        ratio = current['seconds'] / previous['seconds'] if previous['seconds'] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = '  slower'
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        rss = f"{previous['peak_rss_mb']:.0f}->{current['peak_rss_mb']:.0f}"
+        print(f"{name:<26}{previous['seconds']:>11.4f}s{current['seconds']:>11.4f}s"
+              f"{ratio:>8.2f}x{rss:>14}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ORC editor's hot paths.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=14)
+    parser.add_argument("--nested", default=",".join(NESTED_KINDS),
+                        help="comma separated nested kinds to include (empty for none)")
+    parser.add_argument("--null-density", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--case", action="append", dest="cases",
+                        help="only run this case (repeatable)")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 when a case regressed")
+    args = parser.parse_args(argv)
+
+    nested = [kind for kind in args.nested.split(",") if kind]
+    cases = [(name, prepare) for name, prepare in CASES if not args.cases or name in args.cases]
+    if args.cases and len(cases) != len(set(args.cases)):
+        known = ', '.join(name for name, _ in CASES)
+        parser.error(f"unknown case, expected some of: {known}")
+
+    results = {
+        'dataset': {
+            'rows': args.rows,
+            'columns': args.columns,
+            'nested': nested,
+            'null_density': args.null_density,
+            'seed': args.seed,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'pyarrow': pyarrow.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+        },
+        'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'cases': {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'synthetic.orc')
+        generate(path, args.rows, args.columns, nested, args.null_density, args.seed)
+        print(f"Synthetic file: {args.rows:,} rows x {args.columns} columns, "
+              f"{os.path.getsize(path) / (1 << 20):.1f} MB")
+        ctx = Context(path, workdir)
+        for name, prepare in cases:
+            result = run_case(ctx, prepare, args.repeat)
+            results['cases'][name] = result
+            if 'skipped' in result:
+                print(f"{name:<26}skipped: {result['skipped']}")
+            else:
+                print(f"{name:<26}{result['seconds']:>10.4f}s  median {result['median']:.4f}s  "
+                      f"peak RSS {result['peak_rss_mb']:.0f} MB  "
+                      f"arrow {result['arrow_bytes'] / (1 << 20):.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
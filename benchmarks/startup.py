@@ -0,0 +1,103 @@
+"""Measure how long the editor takes to put its window on screen.
+
+Every sample runs in a fresh interpreter so module caches do not carry
+over. Three timings are taken:
+
+* ``ui import``: importing ``src.ui.orc_editor``, which is all the work
+  done before the window is created;
+* ``eager import``: the same plus every module the editor warms up in the
+  background, i.e. what startup cost when everything was imported up front;
+* ``first paint``: from interpreter start to the window being drawn (needs
+  a display, skipped otherwise).
+
+::
+
+    python -m benchmarks.startup --repeat 5 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, Optional
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORT = """
+import time
+started = time.perf_counter()
+import src.ui.orc_editor
+print(time.perf_counter() - started)
+"""
+
+_EAGER = """
+import importlib, time
+started = time.perf_counter()
+import src.ui.orc_editor
+for name in src.ui.orc_editor.WARM_UP_MODULES:
+    importlib.import_module(name)
+print(time.perf_counter() - started)
+"""
+
+_PAINT = """
+import time
+started = time.perf_counter()
+import tkinter as tk
+root = tk.Tk()
+from src.ui.orc_editor import ORCEditor
+ORCEditor(root)
+root.update()
+print(time.perf_counter() - started)
+root.destroy()
+"""
+
+
+def _sample(code: str) -> Optional[float]:
+    """Run a snippet in a fresh interpreter and return the seconds it printed."""
+    completed = subprocess.run([sys.executable, '-c', code], cwd=_ROOT,
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def measure(code: str, repeat: int) -> Optional[Dict]:
+    """Median and best of several fresh-interpreter samples, None if it cannot run."""
+    samples = []
+    for _ in range(repeat):
+        seconds = _sample(code)
+        if seconds is None:
+            return None
+        samples.append(seconds)
+    return {'seconds': min(samples), 'median': statistics.median(samples), 'runs': samples}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the editor's startup time.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, code in (('ui import', _IMPORT), ('eager import', _EAGER), ('first paint', _PAINT)):
+        result = measure(code, args.repeat)
+        if result is None:
+            results[name] = {'skipped': 'cannot run here (no display?)'}
+            print(f"{name:<14}skipped")
+            continue
+        results[name] = result
+        print(f"{name:<14}{result['median'] * 1000:>8.0f} ms median, {result['seconds'] * 1000:.0f} ms best")
+
+    if 'seconds' in results['ui import'] and 'seconds' in results['eager import']:
+        saved = results['eager import']['median'] - results['ui import']['median']
+        print(f"Deferred until after the window appears: {saved * 1000:.0f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Command line interface for scripted, display-free edits of ORC files.
+
+Usage::
+
+    python -m src.cli apply fixes.json data/*.orc --output-dir fixed/
+    python -m src.cli apply fixes.json part-0001.orc --in-place
+    python -m src.cli apply fixes.json data/*.orc --output-dir fixed/ --workers 8 --memory-limit 4096
+    python -m src.cli diff original.orc edited.orc --key id --json diff.json
+    python -m src.cli export data.orc subset.parquet --columns id,status --where 'status == "FAILED"'
+    python -m src.cli import dump.csv fixture.orc --schema-from reference.orc
+
+Nothing here imports tkinter, so it runs on machines without a display.
+"""
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from src.data.batch import FileOutcome, run_batch
+from src.data.operations import Pipeline, load_script
+from src.exceptions.orc_exceptions import ORCEditorError
+
+
+def _destination(args: argparse.Namespace, source: str) -> str:
+    """Work out where the edited copy of a file goes."""
+    if args.in_place:
+        return source
+    if args.output_dir:
+        return os.path.join(args.output_dir, os.path.basename(source))
+    return args.output
+
+
+def _check_destinations(args: argparse.Namespace) -> Optional[str]:
+    """Return an error message if the output options don't fit the inputs."""
+    chosen = sum(bool(option) for option in (args.output, args.output_dir, args.in_place))
+    if chosen != 1:
+        return "choose exactly one of --output, --output-dir or --in-place"
+    if args.output and len(args.files) > 1:
+        return "--output only works with a single input file, use --output-dir"
+    if args.output_dir:
+        names = [os.path.basename(path) for path in args.files]
+        if len(set(names)) != len(names):
+            return "input files share a name, so they would overwrite each other in --output-dir"
+    return None
+
+
+def run_apply(args: argparse.Namespace) -> int:
+    error = _check_destinations(args)
+    if error:
+        print(f"error: {error}", file=sys.stderr)
+        return 2
+
+    try:
+        specs = load_script(args.script)
+        # Fail on a malformed script before starting any workers
+        Pipeline.from_specs(specs)
+    except ORCEditorError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    def report(outcome: FileOutcome) -> None:
+        if not outcome.ok:
+            print(f"{outcome.source}: FAILED: {outcome.error}", file=sys.stderr)
+        elif not args.quiet:
+            print(f"{outcome.source} -> {outcome.destination}: {outcome.rows_in:,} rows in, "
+                  f"{outcome.rows_out:,} rows out, {outcome.seconds:.2f}s")
+
+    jobs = [(source, _destination(args, source)) for source in args.files]
+    summary = run_batch(jobs, specs, workers=args.workers,
+                        memory_limit_mb=args.memory_limit, on_done=report)
+    if not args.quiet or summary.failed:
+        print(summary.format(), file=sys.stderr if summary.failed else sys.stdout)
+
+    return 1 if summary.failed else 0
+
+
+def run_diff(args: argparse.Namespace) -> int:
+    from src.data.orc_diff import diff_files
+
+    try:
+        result = diff_files(args.left, args.right, args.key, memory_budget_mb=args.memory_budget,
+                            max_examples=args.examples)
+    except (ORCEditorError, OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if args.json == "-":
+        print(result.to_json())
+    else:
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                f.write(result.to_json())
+        print(result.summary())
+        for difference in result.schema_differences:
+            print(f"schema: {difference}")
+        for name, count in result.column_changes.items():
+            print(f"  {name}: {count:,} rows changed")
+
+    return 1 if result.has_differences else 0
+
+
+def run_export(args: argparse.Namespace) -> int:
+    from src.data.export import export_file
+
+    columns = [name.strip() for name in args.columns.split(",")] if args.columns else None
+    try:
+        result = export_file(args.source, args.destination, args.format, columns, args.where)
+    except (ORCEditorError, OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    if not args.quiet:
+        print(f"{args.source} -> {result.destination} ({result.format}): "
+              f"{result.rows:,} rows, {result.seconds:.2f}s")
+    return 0
+
+
+def run_import(args: argparse.Namespace) -> int:
+    from src.data.data_manager import ORCDataManager
+
+    try:
+        result = ORCDataManager.import_file(args.source, args.destination, args.format,
+                                            args.schema_from)
+    except (ORCEditorError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    for mismatch in result.mismatches:
+        print(f"schema: {mismatch}", file=sys.stderr)
+    if not args.quiet:
+        print(f"{args.source} ({result.format}) -> {result.destination}: "
+              f"{result.rows:,} rows in {result.batches} blocks, {result.seconds:.2f}s")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli",
+                                     description="Edit ORC files without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    apply_parser = commands.add_parser(
+        "apply", help="apply an operations script to ORC files, one stripe at a time"
+    )
+    apply_parser.add_argument("script", help="JSON operations script")
+    apply_parser.add_argument("files", nargs="+", help="ORC files to edit")
+    apply_parser.add_argument("-o", "--output", help="output file (single input only)")
+    apply_parser.add_argument("--output-dir", help="directory for the edited files")
+    apply_parser.add_argument("--in-place", action="store_true", help="overwrite the input files")
+    apply_parser.add_argument("-j", "--workers", type=int,
+                              help="worker processes (default: one per core)")
+    apply_parser.add_argument("--memory-limit", type=int, metavar="MB",
+                              help="address-space cap per worker process, in MB (Unix only)")
+    apply_parser.add_argument("-q", "--quiet", action="store_true", help="only report failures")
+    apply_parser.set_defaults(handler=run_apply)
+
+    diff_parser = commands.add_parser(
+        "diff", help="compare the rows of two ORC files (exit status 1 if they differ)"
+    )
+    diff_parser.add_argument("left", help="original ORC file")
+    diff_parser.add_argument("right", help="changed ORC file")
+    diff_parser.add_argument("-k", "--key", action="append", default=[],
+                             help="key column identifying a row (repeatable)")
+    diff_parser.add_argument("--json", metavar="FILE",
+                             help="write the full report as JSON ('-' for stdout)")
+    diff_parser.add_argument("--examples", type=int, default=100,
+                             help="changed rows whose values are reported (default: 100)")
+    diff_parser.add_argument("--memory-budget", type=int, default=512, metavar="MB",
+                             help="memory for row hashes before spilling to disk (default: 512)")
+    diff_parser.set_defaults(handler=run_diff)
+
+    export_parser = commands.add_parser(
+        "export", help="export an ORC file to Parquet, CSV, JSON Lines or Arrow IPC, streaming"
+    )
+    export_parser.add_argument("source", help="ORC file to export")
+    export_parser.add_argument("destination", help="output file; the extension picks the format")
+    export_parser.add_argument("-f", "--format", choices=["parquet", "csv", "ndjson", "arrow"],
+                               help="output format, overriding the extension")
+    export_parser.add_argument("-c", "--columns", help="comma separated columns to export, in order")
+    export_parser.add_argument("-w", "--where", help="filter expression selecting rows to export")
+    export_parser.add_argument("-q", "--quiet", action="store_true", help="only report failures")
+    export_parser.set_defaults(handler=run_export)
+
+    import_parser = commands.add_parser(
+        "import", help="convert a CSV, JSON Lines or Parquet file to ORC, streaming"
+    )
+    import_parser.add_argument("source", help="file to import")
+    import_parser.add_argument("destination", help="ORC file to write")
+    import_parser.add_argument("-f", "--format", choices=["csv", "ndjson", "parquet"],
+                               help="input format, overriding the extension")
+    import_parser.add_argument("-s", "--schema-from", metavar="ORC_FILE",
+                               help="coerce the data to this ORC file's schema (default: infer)")
+    import_parser.add_argument("-q", "--quiet", action="store_true", help="only report failures")
+    import_parser.set_defaults(handler=run_import)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+
+from src.data.orc_diff import DiffResult
+
+
+class DiffView(tk.Toplevel):
+    COLUMNS = [
+        ("change", "Change", 80),
+        ("left_row", "Left row", 80),
+        ("right_row", "Right row", 80),
+        ("column", "Column", 140),
+        ("left", "Left value", 260),
+        ("right", "Right value", 260),
+    ]
+
+    def __init__(self, parent, left, right):
+        super().__init__(parent)
+        self.title(f"Compare: {left} ↔ {right}")
+        self.geometry("1000x500")
+        self.result = None
+
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        header = ttk.Frame(main_frame)
+        header.pack(fill=tk.X, pady=(0, 5))
+        self.status = ttk.Label(header, text="Comparing...")
+        self.status.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.save_button = ttk.Button(header, text="Save JSON...", command=self.save_json,
+                                      state=tk.DISABLED)
+        self.save_button.pack(side=tk.RIGHT)
+
+        self.details = ttk.Label(main_frame, text="", foreground="gray", justify=tk.LEFT)
+        self.details.pack(fill=tk.X, pady=(0, 5))
+
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(tree_frame, columns=[key for key, _, _ in self.COLUMNS],
+                                 show="headings")
+        for key, heading, width in self.COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width)
+        self.tree.tag_configure("added", foreground="dark green")
+        self.tree.tag_configure("removed", foreground="dark red")
+
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def set_progress(self, text: str) -> None:
+        """Show the current phase of the comparison"""
+        self.status.configure(text=text)
+
+    def show_result(self, result: DiffResult) -> None:
+        """Fill the view with a computed diff"""
+        self.result = result
+        self.save_button.configure(state=tk.NORMAL)
+        self.status.configure(text=result.summary())
+
+        details = []
+        if result.column_changes:
+            details.append("Changed columns: " + ", ".join(
+                f"{name} ({count:,})" for name, count in result.column_changes.items()))
+        if result.schema_differences:
+            details.append("Schema: " + "; ".join(result.schema_differences))
+        if result.duplicate_keys:
+            details.append(f"{result.duplicate_keys:,} rows repeat a key; "
+                           "they are matched in order of appearance")
+        shown = len(result.added_examples) + len(result.removed_examples) + len(result.modified_examples)
+        total = len(result.added) + len(result.removed) + len(result.modified)
+        if shown < total:
+            details.append(f"Showing {shown:,} of {total:,} changed rows")
+        self.details.configure(text="\n".join(details))
+
+        for change in result.modified_examples:
+            for name, (old, new) in change.changes.items():
+                self.tree.insert("", "end", values=[
+                    "modified", change.left_row, change.right_row, name, str(old), str(new)
+                ])
+        for row, values in result.removed_examples:
+            self.tree.insert("", "end", tags=("removed",), values=[
+                "removed", row, "", "", str(values), ""
+            ])
+        for row, values in result.added_examples:
+            self.tree.insert("", "end", tags=("added",), values=[
+                "added", "", row, "", "", str(values)
+            ])
+
+    def save_json(self):
+        """Write the diff report to a JSON file"""
+        filename = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if filename:
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(self.result.to_json())
@@ -6,6 +6,9 @@ from tkinter import ttk, messagebox
 import numpy as np
 import pandas as pd
 
+from src.data.preview import format_cell, is_long
+from src.utils import timing
+
 
 class EditDialog(tk.Toplevel):
     def __init__(self, parent, df, row_idx, visible_columns):
@@ -43,8 +46,14 @@ class EditDialog(tk.Toplevel):
         self._setup_bindings()
 
     def _create_edit_widgets(self, visible_columns):
-        """Create the edit widgets for each column."""
+        """Create the edit widgets for each column.
+
+        Long lists and strings are shown as a read-only preview; they are
+        only written out in full when opened in the larger editor.
+        """
         self.edit_widgets = {}
+        self.initial_text = {}
+        self.collapsed = set()
         for idx, col in enumerate(visible_columns):
             # Label (Column name)
             ttk.Label(self.edit_frame, text=col, anchor="e").grid(
@@ -58,27 +67,37 @@ class EditDialog(tk.Toplevel):
             # Get and format value
             value = self.df.iloc[self.row_idx][col]
 
-            # Handle arrays and lists
-            if isinstance(value, (np.ndarray, list)):
-                if isinstance(value, np.ndarray):
-                    entry_value = f"[{','.join(map(str, value.tolist()))}]" if value.size > 0 else "[]"
-                else:  # list
-                    entry_value = f"[{','.join(map(str, value))}]" if value else "[]"
+            if is_long(value):
+                entry.insert(0, format_cell(value))
+                entry.configure(state="readonly")
+                self.collapsed.add(col)
             else:
-                # Handle scalar values
-                entry_value = str(value) if pd.notna(value) else ""
-
-            entry.insert(0, entry_value)
+                entry.insert(0, self._full_text(value))
+            self.initial_text[col] = entry.get()
             self.edit_widgets[col] = entry
 
             # Bind double-click event for complex fields
-            if isinstance(value, (np.ndarray, list, dict)):
+            if isinstance(value, (np.ndarray, list, dict)) or col in self.collapsed:
                 entry.bind("<Double-1>", lambda e, col=col: self.open_larger_editor(col))
 
+    @staticmethod
+    def _full_text(value):
+        """The complete text of a value, as it is entered."""
+        # Handle arrays and lists
+        if isinstance(value, (np.ndarray, list)):
+            if isinstance(value, np.ndarray):
+                return f"[{','.join(map(str, value.tolist()))}]" if value.size > 0 else "[]"
+            return f"[{','.join(map(str, value))}]" if value else "[]"
+        # Handle scalar values; nulls are empty, NaN stays "nan" so it is kept
+        return "" if value is None or value is pd.NA or value is pd.NaT else str(value)
+
     def open_larger_editor(self, column):
         """Open a larger editor for complex fields."""
-        # Get the current value from the entry widget
-        current_value = self.edit_widgets[column].get()
+        # Get the current value from the entry widget, or in full if it shows a preview
+        if column in self.collapsed:
+            current_value = self._full_text(self.df.iloc[self.row_idx][column])
+        else:
+            current_value = self.edit_widgets[column].get()
 
         # Pretty-print the value for easier editing
         try:
@@ -133,6 +152,8 @@ class EditDialog(tk.Toplevel):
         edited_value = editor_text.get("1.0", tk.END).strip()
 
         # Update the corresponding entry widget in the EditDialog
+        self.collapsed.discard(column)
+        self.edit_widgets[column].configure(state="normal")
         self.edit_widgets[column].delete(0, tk.END)
         self.edit_widgets[column].insert(0, edited_value)
 
@@ -171,9 +192,20 @@ class EditDialog(tk.Toplevel):
 
     def save(self):
         """Save the changes made in the dialog"""
+        with timing.span("parse"):
+            parsed = self._parse_values()
+        if parsed:
+            self.destroy()
+
+    def _parse_values(self) -> bool:
+        """Convert the changed fields to column values; False if one is invalid"""
         self.result = {}
         for col, widget in self.edit_widgets.items():
+            if col in self.collapsed:
+                continue  # Only a preview is shown, the value was not edited
             value = widget.get()
+            if value == self.initial_text[col]:
+                continue  # Unchanged, so the stored value is kept exactly
             original_dtype = self.df[col].dtype
             sample_value = self.df.iloc[0][col]  # Get sample value to help determine type
 
@@ -212,13 +244,18 @@ class EditDialog(tk.Toplevel):
                                         value = items  # Keep as strings
                     except ValueError as e:
                         messagebox.showerror("Error", f"Invalid list format for column '{col}': {str(e)}")
-                        return
+                        return False
+                elif not value.strip() and (pd.api.types.is_numeric_dtype(original_dtype)
+                                            or pd.api.types.is_datetime64_any_dtype(original_dtype)):
+                    value = None  # An empty field is a null
                 elif pd.api.types.is_integer_dtype(original_dtype):
-                    value = 0 if not value.strip() else int(float(value))
+                    value = int(float(value))
                 elif pd.api.types.is_float_dtype(original_dtype):
-                    value = 0.0 if not value.strip() else float(value)
+                    value = float(value)
                 elif pd.api.types.is_bool_dtype(original_dtype):
                     value = value.strip().lower() in ('true', '1', 't', 'y', 'yes')
+                elif pd.api.types.is_datetime64_any_dtype(original_dtype):
+                    value = pd.Timestamp(value.strip())
 
                 self.result[col] = value
             except (ValueError, TypeError) as e:
@@ -226,6 +263,6 @@ class EditDialog(tk.Toplevel):
                     "Error",
                     f"Invalid value for column '{col}'. Expected type: {original_dtype}\nError: {str(e)}"
                 )
-                return
+                return False
 
-        self.destroy()
+        return True
@@ -0,0 +1,88 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+
+class ExportDialog(tk.Toplevel):
+    FILE_TYPES = [
+        ("Parquet files", "*.parquet"),
+        ("CSV files", "*.csv"),
+        ("JSON Lines files", "*.ndjson *.jsonl"),
+        ("Arrow IPC files", "*.arrow *.feather"),
+    ]
+
+    def __init__(self, parent, columns, filter_text=""):
+        super().__init__(parent)
+        self.title("Export")
+        self.result = None
+
+        # Make dialog modal
+        self.transient(parent)
+        self.grab_set()
+        self.geometry("420x420")
+
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Column projection, every column selected by default
+        ttk.Label(main_frame, text="Columns:").pack(anchor="w")
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.columns = tk.Listbox(list_frame, selectmode=tk.MULTIPLE, exportselection=False)
+        for column in columns:
+            self.columns.insert(tk.END, column)
+        self.columns.select_set(0, tk.END)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.columns.yview)
+        self.columns.configure(yscrollcommand=scrollbar.set)
+        self.columns.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        selection_frame = ttk.Frame(main_frame)
+        selection_frame.pack(fill=tk.X)
+        ttk.Button(selection_frame, text="All",
+                   command=lambda: self.columns.select_set(0, tk.END)).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(selection_frame, text="None",
+                   command=lambda: self.columns.select_clear(0, tk.END)).pack(side=tk.LEFT)
+
+        # Only offered when a filter is active
+        self.filtered = tk.BooleanVar(value=bool(filter_text))
+        filter_check = ttk.Checkbutton(
+            main_frame,
+            text=f"Only rows matching the filter: {filter_text}" if filter_text else "No filter active",
+            variable=self.filtered
+        )
+        filter_check.pack(anchor="w", pady=10)
+        if not filter_text:
+            filter_check.state(['disabled'])
+
+        help_text = "Nested columns are written as JSON text in CSV files"
+        ttk.Label(main_frame, text=help_text, font=("", 8), foreground="gray").pack(anchor="w")
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="Export...", command=self.export).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.LEFT, padx=5)
+
+        self.bind("<Escape>", lambda e: self.cancel())
+
+    def export(self):
+        """Ask for the destination and close with the chosen options."""
+        columns = [self.columns.get(index) for index in self.columns.curselection()]
+        if not columns:
+            messagebox.showerror("Error", "Select at least one column", parent=self)
+            return
+
+        filename = filedialog.asksaveasfilename(parent=self, defaultextension=".parquet",
+                                                filetypes=self.FILE_TYPES)
+        if not filename:
+            return
+
+        self.result = {
+            'filename': filename,
+            'columns': columns,
+            'filtered': self.filtered.get(),
+        }
+        self.destroy()
+
+    def cancel(self):
+        """Cancel the dialog."""
+        self.destroy()
@@ -0,0 +1,92 @@
+import os
+import tkinter as tk
+from tkinter import ttk
+
+
+class FileTab(ttk.Frame):
+    """One page of the workspace notebook: an open file and its table view.
+
+    The tab owns the file's data backend. What the filter and find bars
+    showed is kept here while another tab is active, and the rendered rows
+    are dropped then, so a hidden tab holds no Treeview items.
+    """
+
+    def __init__(self, parent, on_double_click, on_right_click):
+        super().__init__(parent)
+        self.data_manager = None
+        self.current_file = None
+
+        # Filter and find state restored when the tab is shown again
+        self.filter_expression = ""
+        self.filter_status = ""
+        self.find_query = ""
+        self.find_status = ""
+        self.find_matches = []
+        self.find_position = -1
+
+        self._selection = ()
+        self._focus = ""
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self._create_table_view(on_double_click, on_right_click)
+
+    def _create_table_view(self, on_double_click, on_right_click):
+        # Create canvas and scrollbars
+        canvas = tk.Canvas(self)
+        vscrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
+        hscrollbar = ttk.Scrollbar(self, orient="horizontal", command=canvas.xview)
+
+        # Create frame inside canvas for the treeview
+        self.tree_frame = ttk.Frame(canvas)
+
+        # Create Treeview
+        self.tree = ttk.Treeview(self.tree_frame)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        # Configure canvas
+        canvas.configure(yscrollcommand=vscrollbar.set, xscrollcommand=hscrollbar.set)
+
+        # Add bindings for double-click and the context menus
+        self.tree.bind('<Double-1>', lambda e: on_double_click())
+        self.tree.bind('<Button-3>', on_right_click)
+
+        # Layout
+        canvas.grid(row=0, column=0, sticky="nsew")
+        vscrollbar.grid(row=0, column=1, sticky="ns")
+        hscrollbar.grid(row=1, column=0, sticky="ew")
+
+        # Create window inside canvas
+        canvas.create_window((0, 0), window=self.tree_frame, anchor="nw")
+
+        # Configure scroll region when frame changes
+        self.tree_frame.bind("<Configure>",
+                             lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+
+    @property
+    def title(self) -> str:
+        """Text of the notebook tab."""
+        return os.path.basename(self.current_file) if self.current_file else "Untitled"
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether no file was opened in the tab yet."""
+        return self.data_manager is None or not self.data_manager.loaded
+
+    def hide(self) -> None:
+        """Drop the rendered rows and the backend's display caches while another tab is shown."""
+        self._selection = self.tree.selection()
+        self._focus = self.tree.focus()
+        self.tree.delete(*self.tree.get_children())
+        if self.data_manager is not None:
+            self.data_manager.release_display_caches()
+
+    def restore_selection(self) -> None:
+        """Select the rows selected before the tab was hidden, once they are rendered again."""
+        selection = [item for item in self._selection if self.tree.exists(item)]
+        if selection:
+            self.tree.selection_set(selection)
+        if self._focus and self.tree.exists(self._focus):
+            self.tree.focus(self._focus)
+            self.tree.see(self._focus)
+        self._selection, self._focus = (), ""
@@ -0,0 +1,45 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class FilterBar(ttk.Frame):
+    def __init__(self, parent, on_apply, on_clear):
+        super().__init__(parent)
+        self._on_apply = on_apply
+        self._on_clear = on_clear
+        self._create_widgets()
+
+    def _create_widgets(self):
+        """Create the expression entry, buttons and status label"""
+        ttk.Label(self, text="Filter:").pack(side=tk.LEFT, padx=(5, 5))
+
+        self.entry = ttk.Entry(self, width=50)
+        self.entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        self.entry.bind("<Return>", lambda e: self._on_apply(self.get_expression()))
+        self.entry.bind("<Escape>", lambda e: self.clear())
+
+        ttk.Button(self, text="Apply",
+                   command=lambda: self._on_apply(self.get_expression())).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self, text="Clear", command=self.clear).pack(side=tk.LEFT, padx=5)
+
+        self.status = ttk.Label(self, text="", foreground="gray")
+        self.status.pack(side=tk.LEFT, padx=10)
+
+    def get_expression(self) -> str:
+        """Get the current filter expression"""
+        return self.entry.get().strip()
+
+    def set_expression(self, text: str) -> None:
+        """Show an expression without applying it"""
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, text)
+
+    def clear(self):
+        """Empty the entry and notify the owner"""
+        self.entry.delete(0, tk.END)
+        self.set_status("")
+        self._on_clear()
+
+    def set_status(self, text: str) -> None:
+        """Show a status message such as the row count or an error"""
+        self.status.configure(text=text)
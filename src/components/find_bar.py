@@ -0,0 +1,59 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class FindBar(ttk.Frame):
+    SEARCH_DELAY_MS = 150
+
+    def __init__(self, parent, on_search, on_next, on_previous):
+        super().__init__(parent)
+        self._on_search = on_search
+        self._on_next = on_next
+        self._on_previous = on_previous
+        self._pending_search = None
+        self._create_widgets()
+
+    def _create_widgets(self):
+        """Create the search entry, navigation buttons and status label"""
+        ttk.Label(self, text="Find:").pack(side=tk.LEFT, padx=(5, 5))
+
+        self.entry = ttk.Entry(self, width=30)
+        self.entry.pack(side=tk.LEFT, padx=5)
+        self.entry.bind("<KeyRelease>", self._on_key_release)
+        self.entry.bind("<Return>", lambda e: self._on_next())
+        self.entry.bind("<Shift-Return>", lambda e: self._on_previous())
+
+        ttk.Button(self, text="Previous", command=self._on_previous).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self, text="Next", command=self._on_next).pack(side=tk.LEFT, padx=5)
+
+        self.status = ttk.Label(self, text="", foreground="gray")
+        self.status.pack(side=tk.LEFT, padx=10)
+
+    def _on_key_release(self, event):
+        """Debounce typing so the search runs once the user pauses"""
+        if event.keysym in ("Return", "Shift_L", "Shift_R"):
+            return
+        if self._pending_search is not None:
+            self.after_cancel(self._pending_search)
+        self._pending_search = self.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _run_search(self):
+        """Run the search callback with the current query"""
+        self._pending_search = None
+        self._on_search(self.get_query())
+
+    def get_query(self) -> str:
+        """Get the current search text"""
+        return self.entry.get().strip()
+
+    def set_query(self, text: str) -> None:
+        """Show a search text without searching"""
+        if self._pending_search is not None:
+            self.after_cancel(self._pending_search)
+            self._pending_search = None
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, text)
+
+    def set_status(self, text: str) -> None:
+        """Show a status message such as the match count"""
+        self.status.configure(text=text)
@@ -0,0 +1,149 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+
+import pyarrow
+
+from src.data.nested import child_count, children, get, is_expandable, parse_leaf
+from src.data.preview import format_cell
+from src.utils import timing
+from src.utils.config import Config
+
+
+class NestedExplorer(tk.Toplevel):
+    """Tree view of one struct, list or map cell, expanded on demand.
+
+    Children are read from the Arrow child arrays of the cell when a node is
+    opened, long lists are shown a page at a time, and a leaf can be edited
+    by double-clicking it.
+    """
+
+    def __init__(self, parent, data_manager, row_idx, column, on_change=None):
+        super().__init__(parent)
+        self.title(f"Explore: {column} (row {row_idx:,})")
+        self.geometry("700x500")
+        self.data_manager = data_manager
+        self.row_idx = row_idx
+        self.column = column
+        self.on_change = on_change
+        self.cell = data_manager.cell(row_idx, column)
+
+        # Tree item -> path from the cell; placeholder and paging items are kept apart
+        self._paths = {}
+        self._placeholders = set()
+        self._more = {}
+
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.status = ttk.Label(main_frame, text="Double-click a value to edit it", foreground="gray")
+        self.status.pack(fill=tk.X, pady=(0, 5))
+
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(tree_frame, columns=["type", "value"], show="tree headings")
+        self.tree.heading("#0", text="Field")
+        self.tree.heading("type", text="Type")
+        self.tree.heading("value", text="Value")
+        self.tree.column("#0", width=180)
+        self.tree.column("type", width=160)
+        self.tree.column("value", width=320)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<<TreeviewOpen>>", self._on_open)
+        self.tree.bind("<Double-1>", self._on_double_click)
+
+        root = self._insert("", column, ())
+        self.tree.item(root, open=True)
+        self._expand(root)
+
+    def _describe(self, array):
+        """Type and value text of a one-element array."""
+        if not array.is_valid()[0].as_py():
+            return str(array.type), "null"
+        if pyarrow.types.is_struct(array.type):
+            return str(array.type), f"{array.type.num_fields} fields"
+        if is_expandable(array.type):
+            return str(array.type), f"{child_count(array):,} items"
+        return str(array.type), format_cell(array[0].as_py())
+
+    def _insert(self, parent, text, path):
+        """Add a node, with a placeholder child when it can be expanded."""
+        array = get(self.cell, path)
+        item = self.tree.insert(parent, "end", text=text, values=self._describe(array))
+        self._paths[item] = path
+        if child_count(array) and is_expandable(array.type):
+            self._placeholders.add(self.tree.insert(item, "end", text="…"))
+        return item
+
+    def _on_open(self, event=None):
+        self._expand(self.tree.focus())
+
+    def _expand(self, item):
+        """Replace the placeholder of a node with its first page of children."""
+        placeholders = [child for child in self.tree.get_children(item) if child in self._placeholders]
+        if not placeholders:
+            return
+        self.tree.delete(*placeholders)
+        self._placeholders.difference_update(placeholders)
+        self._add_page(item, 0)
+
+    def _add_page(self, item, start):
+        """Add up to a page of children starting at a position, and a 'more' node."""
+        path = self._paths[item]
+        array = get(self.cell, path)
+        stop = start + Config.EXPLORER_PAGE_SIZE
+        for step, _ in children(array, start, stop):
+            self._insert(item, step if isinstance(step, str) else f"[{step}]", path + (step,))
+        remaining = child_count(array) - stop
+        if remaining > 0 and not pyarrow.types.is_struct(array.type):
+            page = min(remaining, Config.EXPLORER_PAGE_SIZE)
+            more = self.tree.insert(item, "end", text=f"Show next {page:,} of {remaining:,} more...")
+            self._more[more] = (item, stop)
+
+    def _on_double_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if item in self._more:
+            parent, start = self._more.pop(item)
+            self.tree.delete(item)
+            self._add_page(parent, start)
+            return "break"
+        if item not in self._paths:
+            return None
+        array = get(self.cell, self._paths[item])
+        if is_expandable(array.type):
+            return None
+        self._edit_leaf(item, array)
+        return "break"
+
+    def _edit_leaf(self, item, array):
+        """Ask for a new leaf value and write it back to the cell."""
+        current = array[0].as_py()
+        text = simpledialog.askstring(
+            "Edit Value",
+            f"{self.tree.item(item, 'text')} ({array.type}); leave empty for null:",
+            initialvalue="" if current is None else str(current),
+            parent=self
+        )
+        if text is None:
+            return
+
+        path = self._paths[item]
+        try:
+            with timing.operation("edit value"):
+                self.data_manager.update_leaf(self.row_idx, self.column, path, parse_leaf(text, array.type))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e), parent=self)
+            return
+
+        self.cell = self.data_manager.cell(self.row_idx, self.column)
+        self.tree.item(item, values=self._describe(get(self.cell, path)))
+        self.status.configure(text=f"Updated {self.column}{''.join(self._label(step) for step in path)}")
+        if self.on_change is not None:
+            self.on_change()
+
+    @staticmethod
+    def _label(step):
+        return f".{step}" if isinstance(step, str) else f"[{step}]"
@@ -0,0 +1,64 @@
+import tkinter as tk
+from tkinter import ttk
+
+from src.data.column_profile import ColumnProfile
+
+
+class ProfilePanel(tk.Toplevel):
+    def __init__(self, parent, column_name):
+        super().__init__(parent)
+        self.title(f"Profile: {column_name}")
+        self.geometry("520x480")
+
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.status = ttk.Label(main_frame, text="Profiling...")
+        self.status.pack(fill=tk.X, pady=(0, 5))
+
+        self.summary = ttk.Treeview(main_frame, columns=["value", "bound"], show="tree headings",
+                                    height=8)
+        self.summary.heading("#0", text="Measure")
+        self.summary.heading("value", text="Estimate")
+        self.summary.heading("bound", text="Error bound")
+        self.summary.column("#0", width=140)
+        self.summary.column("value", width=160)
+        self.summary.column("bound", width=180)
+        self.summary.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(main_frame, text="Most frequent values").pack(anchor="w")
+        self.top = ttk.Treeview(main_frame, columns=["value", "count"], show="headings")
+        self.top.heading("value", text="Value")
+        self.top.heading("count", text="Count (guaranteed - at most)")
+        self.top.column("value", width=240)
+        self.top.column("count", width=240)
+        self.top.pack(fill=tk.BOTH, expand=True)
+
+    def set_progress(self, done: int, total: int) -> None:
+        """Show the profiling progress"""
+        if total:
+            self.status.configure(text=f"Profiling block {done} of {total}...")
+
+    def show_profile(self, profile: ColumnProfile) -> None:
+        """Fill the panel with a computed profile"""
+        self.status.configure(
+            text=f"{profile.type} - sketches use {profile.sketch_bytes / 1024:,.0f} KiB"
+        )
+
+        rows = [
+            ("Rows", f"{profile.rows:,}", "exact"),
+            ("Nulls", f"{profile.null_count:,}", "exact"),
+            ("Values", f"{profile.values_profiled:,}", "exact"),
+        ]
+        if profile.distinct_estimate is not None:
+            rows.append(("Distinct", f"~{profile.distinct_estimate:,}",
+                         f"±{profile.distinct_error:.2%} (1 std. error)"))
+        for q, value in profile.quantiles.items():
+            rows.append((f"Quantile {q:g}", f"{value:,.6g}",
+                         f"rank ±{profile.quantile_rank_error[q]:.2%}"))
+        for label, value, bound in rows:
+            self.summary.insert("", "end", text=label, values=[value, bound])
+
+        for value, low, high in profile.heavy_hitters:
+            count = f"{low:,}" if low == high else f"{low:,} - {high:,}"
+            self.top.insert("", "end", values=[str(value), count])
@@ -0,0 +1,83 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict
+
+from src.data.column_stats import ColumnStatistics
+
+
+class StatisticsPanel(tk.Toplevel):
+    COLUMNS = [
+        ("column", "Column", 140),
+        ("type", "Type", 120),
+        ("count", "Values", 80),
+        ("nulls", "Nulls", 70),
+        ("min", "Min", 110),
+        ("max", "Max", 110),
+        ("distinct", "Distinct", 80),
+        ("top", "Top values", 220),
+        ("lengths", "List lengths", 180),
+    ]
+
+    def __init__(self, parent, row_count=None):
+        super().__init__(parent)
+        self.title("Column Statistics")
+        self.geometry("1000x400")
+
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Row count comes from the footer, so it is shown before the scan finishes
+        self.status = ttk.Label(main_frame, text="")
+        self.status.pack(fill=tk.X, pady=(0, 5))
+        self.row_count = row_count
+        self.set_progress(0, 0)
+
+        self.tree = ttk.Treeview(main_frame, columns=[key for key, _, _ in self.COLUMNS],
+                                 show="headings")
+        for key, heading, width in self.COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width)
+
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def set_progress(self, done: int, total: int) -> None:
+        """Show the scan progress"""
+        rows = f"{self.row_count:,} rows" if self.row_count is not None else ""
+        if total:
+            self.status.configure(text=f"{rows} - scanning stripe {done} of {total}...")
+        else:
+            self.status.configure(text=f"{rows} - computing statistics...")
+
+    def show_statistics(self, statistics: Dict[str, ColumnStatistics]) -> None:
+        """Fill the table with computed statistics"""
+        for item in self.tree.get_children():
+            self.tree.delete(item)
+
+        for stats in statistics.values():
+            if stats.distinct_estimate is None:
+                distinct = ""
+            elif stats.distinct_exact:
+                distinct = f"{stats.distinct_estimate:,}"
+            else:
+                distinct = f"~{stats.distinct_estimate:,}"
+
+            top = ", ".join(f"{value}: {count:,}" for value, count in stats.top_values)
+            lengths = ", ".join(f"{bucket}: {count:,}" for bucket, count in stats.list_lengths.items())
+
+            self.tree.insert("", "end", values=[
+                stats.name,
+                stats.type,
+                f"{stats.count:,}",
+                f"{stats.null_count:,}",
+                "" if stats.min is None else str(stats.min),
+                "" if stats.max is None else str(stats.max),
+                distinct,
+                top,
+                lengths,
+            ])
+
+        rows = f"{self.row_count:,} rows" if self.row_count is not None else ""
+        self.status.configure(text=f"{rows} - {len(statistics)} columns")
@@ -0,0 +1,49 @@
+import tkinter as tk
+from tkinter import ttk
+
+from src.utils import timing
+
+
+class StatusBar(ttk.Frame):
+    """Shows the timing breakdown of the last operation."""
+
+    POLL_MS = 250
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self._generation = None
+        self._create_widgets()
+        self._poll()
+
+    def _create_widgets(self):
+        """Create the breakdown and memory labels and the profiling switch"""
+        self.label = ttk.Label(self, text="Ready", foreground="gray", anchor="w")
+        self.label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+
+        self.memory_label = ttk.Label(self, text="", foreground="gray")
+        self.memory_label.pack(side=tk.RIGHT, padx=5)
+
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self,
+            text="Profile next operation",
+            variable=self.profile_var,
+            command=lambda: timing.profile_next(self.profile_var.get())
+        ).pack(side=tk.RIGHT, padx=5)
+
+    def set_memory(self, text: str, over_budget: bool = False) -> None:
+        """Show the memory summary, highlighted when over budget"""
+        self.memory_label.configure(text=text, foreground="dark red" if over_budget else "gray")
+
+    def _poll(self):
+        """Pick up operations finished since the last check"""
+        generation, operation = timing.last_operation()
+        if generation != self._generation and operation is not None:
+            self._generation = generation
+            text = operation.breakdown()
+            if operation.profile_path:
+                text += f"  (profile: {operation.profile_path})"
+            if not timing.profile_pending():
+                self.profile_var.set(False)
+            self.label.configure(text=text)
+        self.after(self.POLL_MS, self._poll)
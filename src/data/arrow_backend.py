@@ -0,0 +1,667 @@
+"""Backend that keeps an ORC file on disk and decodes stripes on demand.
+
+Nothing but the stripe row offsets is read when a file is opened. Rows are
+shown by decoding the stripes they fall in (a few decoded stripes are kept
+in an LRU cache shared by every open file), and edits are kept as an overlay of single-cell Arrow
+arrays that is spliced into each stripe as it is read. Saving streams the
+merged stripes to a temporary file next to the destination and renames it
+into place, so memory use is bounded by the stripe size, not the file size.
+"""
+import ast
+import logging
+import itertools
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow
+import pyarrow.orc as orc
+
+from src.data.backend import DataBackend, ValidationResult, convert_to_pandas, format_rows
+from src.data.column_profile import ColumnProfile, ColumnProfiler
+from src.data.export import ExportResult, write_batches
+from src.data.preview import preview_table
+from src.data.search_index import is_indexable
+from src.data.operations import Pipeline
+from src.exceptions.orc_exceptions import (FilterExpressionError, ORCLoadError, ORCSaveError,
+                                          UnsupportedOperationError)
+from src.utils import timing
+from src.utils.config import Config
+from src.utils.files import replacing
+from src.utils.filter_expression import compile_filter
+from src.utils.memory import Consumer, MemoryManager
+
+logger = logging.getLogger('orc_editor.data')
+
+ROW_ID_COLUMN = '__row_id__'
+
+# stripe -> row in the stripe -> column -> one-element array with the new value
+Edits = Dict[int, Dict[int, Dict[str, pyarrow.Array]]]
+
+
+class _StripeReader:
+    """Reads stripes of a file with added columns and edited cells merged in.
+
+    Readers are cheap to copy; a copy is a snapshot that background jobs can
+    use while the editor keeps changing the original.
+    """
+
+    def __init__(self, filename: str, schema: pyarrow.Schema, row_offsets: List[int],
+                 added: Dict[str, Any], edits: Edits, file_columns: Optional[set] = None):
+        self.filename = filename
+        self.schema = schema
+        self.row_offsets = row_offsets
+        self.added = added
+        self.edits = edits
+        self._file_columns = file_columns if file_columns is not None else set(schema.names)
+        self._local = threading.local()
+
+    @property
+    def num_stripes(self) -> int:
+        return len(self.row_offsets) - 1
+
+    def copy(self) -> '_StripeReader':
+        """Snapshot the overlay; the arrays themselves are immutable."""
+        edits = {stripe: {row: dict(cells) for row, cells in rows.items()}
+                 for stripe, rows in self.edits.items()}
+        return _StripeReader(self.filename, self.schema, self.row_offsets, dict(self.added), edits,
+                             self._file_columns)
+
+    def stripe_of_row(self, row: int) -> int:
+        """Get the index of the stripe holding a row."""
+        return bisect_right(self.row_offsets, row) - 1
+
+    def _file(self) -> orc.ORCFile:
+        # ORCFile readers are not shared between threads
+        orc_file = getattr(self._local, 'orc_file', None)
+        if orc_file is None:
+            orc_file = self._local.orc_file = orc.ORCFile(self.filename)
+        return orc_file
+
+    def read(self, stripe: int, columns: Optional[List[str]] = None) -> pyarrow.Table:
+        """Decode a stripe with the overlay applied.
+
+        Args:
+            stripe: Index of the stripe
+            columns: Columns to read, in order; all columns when None
+
+        Returns:
+            The current data of the stripe's rows
+        """
+        columns = self.schema.names if columns is None else columns
+        num_rows = self.row_offsets[stripe + 1] - self.row_offsets[stripe]
+        from_file = [name for name in columns if name in self._file_columns]
+        batch = self._file().read_stripe(stripe, columns=from_file) if from_file else None
+
+        arrays = []
+        for name in columns:
+            field = self.schema.field(name)
+            if name in self._file_columns:
+                array = batch.column(name)
+            elif self.added.get(name) is None:
+                array = pyarrow.nulls(num_rows, field.type)
+            else:
+                array = pyarrow.repeat(pyarrow.scalar(self.added[name], type=field.type), num_rows)
+            arrays.append(self._splice(array, name, self.edits.get(stripe, {})))
+        return pyarrow.Table.from_arrays(arrays, schema=pyarrow.schema(
+            [self.schema.field(name) for name in columns]))
+
+    @staticmethod
+    def _splice(array: pyarrow.Array, column: str,
+                rows: Dict[int, Dict[str, pyarrow.Array]]) -> pyarrow.Array:
+        """Replace the edited cells of one column of a stripe."""
+        cells = sorted((row, values[column]) for row, values in rows.items() if column in values)
+        if not cells:
+            return array
+        pieces, start = [], 0
+        for row, value in cells:
+            pieces.append(array.slice(start, row - start))
+            pieces.append(value)
+            start = row + 1
+        pieces.append(array.slice(start))
+        return pyarrow.concat_arrays(pieces)
+
+
+class _StripeCache:
+    """Decoded stripes of every open file, the least recently used dropped first.
+
+    Entries are keyed by (owner, stripe); the capacity,
+    ``Config.LAZY_STRIPE_CACHE``, bounds the stripes of all files together.
+    """
+
+    def __init__(self):
+        self._tables: 'OrderedDict[Tuple[int, int], pyarrow.Table]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner: int, stripe: int) -> Optional[pyarrow.Table]:
+        with self._lock:
+            table = self._tables.get((owner, stripe))
+            if table is not None:
+                self._tables.move_to_end((owner, stripe))
+            return table
+
+    def put(self, owner: int, stripe: int, table: pyarrow.Table) -> None:
+        with self._lock:
+            self._tables[(owner, stripe)] = table
+            while len(self._tables) > Config.LAZY_STRIPE_CACHE:
+                self._tables.popitem(last=False)
+
+    def drop(self, owner: int, stripe: Optional[int] = None) -> None:
+        """Forget one stripe of an owner, or all of them."""
+        with self._lock:
+            if stripe is not None:
+                self._tables.pop((owner, stripe), None)
+                return
+            for key in [key for key in self._tables if key[0] == owner]:
+                del self._tables[key]
+
+    def nbytes(self, owner: int) -> int:
+        with self._lock:
+            return sum(table.get_total_buffer_size() for (key, _), table in self._tables.items()
+                       if key == owner)
+
+
+_stripe_cache = _StripeCache()
+_cache_owners = itertools.count()
+
+
+class ArrowBackend(DataBackend):
+    """Backend reading stripes on demand, for files too large for pandas.
+
+    Only the first ``Config.LAZY_DISPLAY_ROWS`` selected rows are shown in
+    the table view; filters and search cover every row.
+    """
+
+    display_limit = Config.LAZY_DISPLAY_ROWS
+    supports_schema_operations = False
+
+    def __init__(self, memory: Optional[MemoryManager] = None):
+        self._reader: Optional[_StripeReader] = None
+        self._cache_owner = next(_cache_owners)
+        self._empty_columns: Dict[str, bool] = {}
+        super().__init__(memory)
+
+    @property
+    def loaded(self) -> bool:
+        return self._reader is not None
+
+    @property
+    def num_rows(self) -> int:
+        return 0 if self._reader is None else self._reader.row_offsets[-1]
+
+    @property
+    def column_names(self) -> List[str]:
+        return [] if self._reader is None else list(self._reader.schema.names)
+
+    def load_file(self, filename: str) -> bool:
+        """Open an ORC file, reading only its stripe layout.
+
+        Args:
+            filename: Path to the ORC file to load
+
+        Returns:
+            bool: True if file was opened successfully
+
+        Raises:
+            ORCLoadError: If the file cannot be read
+        """
+        try:
+            with timing.span("read"):
+                self._open(filename)
+            return True
+
+        except FileNotFoundError:
+            raise ORCLoadError(f"File not found: {filename}")
+        except PermissionError:
+            raise ORCLoadError(f"Permission denied accessing file: {filename}")
+        except pyarrow.lib.ArrowInvalid as e:
+            raise ORCLoadError(f"Invalid ORC file format: {str(e)}")
+        except Exception as e:
+            raise ORCLoadError(f"Failed to load file: {str(e)}")
+
+    def _open(self, filename: str) -> None:
+        """Read the stripe row offsets and drop every edit and cache."""
+        orc_file = orc.ORCFile(filename)
+        schema = orc_file.schema
+        # Row counts per stripe come from decoding its cheapest column
+        probe = next((field.name for field in schema if not pyarrow.types.is_nested(field.type)),
+                     schema.names[0] if schema.names else None)
+        row_offsets = [0]
+        for stripe in range(orc_file.nstripes):
+            rows = orc_file.read_stripe(stripe, columns=[probe]).num_rows if probe else 0
+            row_offsets.append(row_offsets[-1] + rows)
+
+        self.current_file = filename
+        self.original_metadata = schema.metadata if schema.metadata else {}
+        self.original_schema = schema
+        self._reader = _StripeReader(filename, schema, row_offsets, {}, {})
+        self._drop_stripes()
+        self._empty_columns = {}
+        self._reset_derived_state()
+
+    def save_file(self, filename: str) -> ValidationResult:
+        """Stream every stripe, with edits applied, to an ORC file.
+
+        The data is written to a temporary file in the destination directory
+        and renamed over the destination, so the source can be overwritten.
+        The saved file is then reopened as the current file.
+
+        Args:
+            filename: Path to save the ORC file
+
+        Returns:
+            ValidationResult containing any schema differences
+
+        Raises:
+            ORCSaveError: If writing or validating the file fails
+        """
+        if self._reader is None:
+            raise ORCSaveError("No data to save")
+
+        reader = self._reader
+        try:
+            with timing.span("write"):
+                with replacing(filename) as temporary, orc.ORCWriter(temporary) as writer:
+                    for stripe in range(reader.num_stripes):
+                        writer.write(reader.read(stripe))
+                    if reader.num_stripes == 0:
+                        writer.write(reader.schema.empty_table())
+        except Exception as e:
+            raise ORCSaveError(f"Failed to write file: {str(e)}")
+
+        with timing.span("validate"):
+            try:
+                from src.utils.schema_validator import SchemaValidator
+                expected = self.original_schema
+                differences = SchemaValidator.compare_schemas(expected, orc.ORCFile(filename).schema)
+                self._open(filename)
+            except Exception as e:
+                raise ORCSaveError(f"Failed to validate saved file: {str(e)}")
+        self._restart_journal()
+        return ValidationResult(has_differences=bool(differences), differences=differences)
+
+    def _stripe(self, stripe: int) -> pyarrow.Table:
+        """Get a decoded stripe, from the cache when possible."""
+        table = _stripe_cache.get(self._cache_owner, stripe)
+        if table is None:
+            table = self._reader.read(stripe)
+            _stripe_cache.put(self._cache_owner, stripe, table)
+        return table
+
+    def _drop_stripes(self, stripe: Optional[int] = None) -> None:
+        """Forget one decoded stripe, or all of them."""
+        _stripe_cache.drop(self._cache_owner, stripe)
+
+    def release_display_caches(self) -> None:
+        """Drop the decoded stripes; they are read again when rows are shown."""
+        self._drop_stripes()
+
+    def _group_by_stripe(self, rows: Sequence[int]) -> List[Tuple[int, np.ndarray]]:
+        """Split sorted or unsorted row positions into (stripe, local rows) runs."""
+        rows = np.asarray(rows, dtype=np.int64)
+        stripes = np.searchsorted(self._reader.row_offsets, rows, side='right') - 1
+        groups = []
+        boundaries = np.flatnonzero(np.diff(stripes)) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(rows)]):
+            if start == end:
+                continue
+            stripe = int(stripes[start])
+            groups.append((stripe, rows[start:end] - self._reader.row_offsets[stripe]))
+        return groups
+
+    def display_rows(self, rows: Sequence[int], columns: List[str]) -> List[List[str]]:
+        """Render rows as the strings shown in the table view.
+
+        Only the requested rows of each stripe are converted to pandas, after
+        long lists and strings were cut down in Arrow.
+
+        Args:
+            rows: Row positions to render
+            columns: Columns to render, in order
+
+        Returns:
+            One list of cell strings per row
+        """
+        if self._reader is None:
+            return []
+        rendered = []
+        for stripe, local in self._group_by_stripe(rows):
+            table = self._stripe(stripe).select(columns).take(pyarrow.array(local))
+            table, hidden = preview_table(table)
+            rendered.extend(format_rows(convert_to_pandas(table), range(len(local)), columns, hidden))
+        return rendered
+
+    def row_frame(self, row_idx: int, columns: List[str]) -> pd.DataFrame:
+        """Get one row as a single-row DataFrame, as the edit dialog expects."""
+        if self._reader is None or not 0 <= row_idx < self.num_rows:
+            raise ValueError("Invalid row index")
+        stripe = self._reader.stripe_of_row(row_idx)
+        local = row_idx - self._reader.row_offsets[stripe]
+        return convert_to_pandas(self._stripe(stripe).select(columns).slice(local, 1))
+
+    def is_empty_column(self, column: str) -> bool:
+        """Check if a column holds only nulls or empty lists.
+
+        Deciding this needs every stripe, so it is answered from the column
+        statistics once they were collected; until then no column counts as
+        empty and every column is shown.
+
+        Args:
+            column: Name of the column to check
+
+        Returns:
+            True if the column is known to be empty, False otherwise
+        """
+        if column not in self.column_names:
+            return True
+        if column not in self._empty_columns:
+            statistics = self.get_statistics() if self.statistics is not None else None
+            if statistics is None:
+                return False
+            for name, stats in statistics.items():
+                self._empty_columns[name] = (stats.count == 0
+                                             or set(stats.list_lengths) == {"0"})
+        return self._empty_columns.get(column, False)
+
+    def update_row(self, row_idx: int, new_values: Dict[str, Any]) -> None:
+        """Record new values for a row in the edit overlay.
+
+        Values are converted to the column type right away, so invalid
+        values are rejected here rather than on save.
+
+        Args:
+            row_idx: Index of the row to update
+            new_values: Dictionary mapping column names to new values
+
+        Raises:
+            ValueError: If the row is invalid or a value does not fit its column
+        """
+        if self._reader is None or not 0 <= row_idx < self.num_rows:
+            raise ValueError("Invalid row index")
+
+        converted = {}
+        for col, value in new_values.items():
+            if col not in self._reader.schema.names:
+                continue
+            try:
+                converted[col] = self._to_array(value, self._reader.schema.field(col).type)
+            except (pyarrow.lib.ArrowException, TypeError, ValueError) as e:
+                logger.debug("Row update failed for row %d with values %r", row_idx, new_values,
+                             exc_info=True)
+                raise ValueError(f"Failed to update row: invalid value for '{col}': {str(e)}")
+
+        for col, array in converted.items():
+            self._set_cell(row_idx, col, array)
+
+    def cell(self, row_idx: int, column: str) -> pyarrow.Array:
+        """Get the current value of one cell as a one-element Arrow array."""
+        if self._reader is None or not 0 <= row_idx < self.num_rows:
+            raise ValueError("Invalid row index")
+        if column not in self._reader.schema.names:
+            raise ValueError(f"Column '{column}' does not exist")
+        stripe = self._reader.stripe_of_row(row_idx)
+        local = row_idx - self._reader.row_offsets[stripe]
+        return self._stripe(stripe).column(column).slice(local, 1).combine_chunks()
+
+    def _column_array(self, column: str, rows: np.ndarray) -> pyarrow.Array:
+        """Get the current values of one column at some row positions.
+
+        Only that column is decoded, stripe by stripe, bypassing the cache.
+        """
+        if column not in self._reader.schema.names:
+            raise ValueError(f"Column '{column}' does not exist")
+        arrays = [self._reader.read(stripe, [column]).column(0).take(pyarrow.array(local)).combine_chunks()
+                  for stripe, local in self._group_by_stripe(rows)]
+        if not arrays:
+            return pyarrow.array([], type=self._reader.schema.field(column).type)
+        return pyarrow.concat_arrays(arrays)
+
+    def _set_cell(self, row_idx: int, column: str, array: pyarrow.Array) -> None:
+        """Put a new cell value in the edit overlay."""
+        stripe = self._reader.stripe_of_row(row_idx)
+        local = row_idx - self._reader.row_offsets[stripe]
+        self._reader.edits.setdefault(stripe, {}).setdefault(local, {})[column] = array
+        self._drop_stripes(stripe)
+        self._empty_columns.pop(column, None)
+        if is_indexable(array.type):
+            self._update_search_index(row_idx, column, array[0].as_py())
+        self._stats_dirty_rows.add(row_idx)
+        self._journal_cell(row_idx, column, array)
+
+    @staticmethod
+    def _to_array(value: Any, data_type: pyarrow.DataType) -> pyarrow.Array:
+        """Convert an edited value to a one-element array of the column type."""
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        try:
+            return pyarrow.array([value], type=data_type, from_pandas=True)
+        except (pyarrow.lib.ArrowException, TypeError, ValueError):
+            if not isinstance(value, str) or pyarrow.types.is_string(data_type):
+                raise
+            # Structs and maps come back from the edit dialog as their repr
+            return pyarrow.array([ast.literal_eval(value)], type=data_type, from_pandas=True)
+
+    def add_column(self, column_name: str, data_type: str, default_value: Any,
+                   position: Optional[int] = None) -> None:
+        """Add a new column filled with a default value (or nulls).
+
+        The column is generated whenever a stripe is read, so adding it
+        costs nothing until rows are shown or saved.
+
+        Args:
+            column_name: Name of the new column
+            data_type: Data type of the new column
+            default_value: Default value for the new column
+            position: Index to insert the column at, appended when None
+        """
+        if self._reader is None:
+            raise ValueError("No data loaded")
+        if column_name in self.column_names:
+            raise ValueError(f"Column '{column_name}' already exists")
+
+        from src.utils.type_utils import get_pyarrow_type
+
+        pa_type = get_pyarrow_type(data_type)
+        if isinstance(default_value, np.ndarray):
+            default_value = default_value.tolist()
+        if default_value is not None:
+            pyarrow.scalar(default_value, type=pa_type)  # raises if the default does not fit
+
+        schema = self._reader.schema
+        if position is None:
+            position = len(schema)
+        schema = schema.insert(position, pyarrow.field(column_name, pa_type))
+        if self.original_metadata:
+            schema = schema.with_metadata(self.original_metadata)
+        self._reader.schema = schema
+        self._reader.added[column_name] = default_value
+        self.original_schema = schema
+        self._drop_stripes()
+        self._empty_columns.pop(column_name, None)
+        self._journal_add_column(column_name, data_type, default_value, position)
+
+    # Schema operations would have to rewrite every stripe the overlay reads;
+    # they need the file loaded with ORCDataManager
+
+    @staticmethod
+    def _unsupported(operation: str, scriptable: bool = True) -> UnsupportedOperationError:
+        message = (f"{operation} is not supported by the lazy backend used for files too "
+                   f"large to load into memory")
+        if scriptable:
+            message += "; the CLI 'apply' command can run it as an operations script"
+        return UnsupportedOperationError(message)
+
+    def drop_column(self, column_name: str) -> None:
+        raise self._unsupported("Dropping columns")
+
+    def rename_column(self, column_name: str, new_name: str) -> None:
+        raise self._unsupported("Renaming columns", scriptable=False)
+
+    def cast_column(self, column_name: str, data_type: Union[str, pyarrow.DataType],
+                    safe: bool = True) -> None:
+        raise self._unsupported("Casting columns")
+
+    def reorder_columns(self, order: List[str]) -> None:
+        raise self._unsupported("Reordering columns", scriptable=False)
+
+    def undo(self) -> Optional[str]:
+        return None
+
+    @property
+    def can_undo(self) -> bool:
+        return False
+
+    def apply_operations(self, operations: Union[Pipeline, List[Dict[str, Any]]]) -> None:
+        raise self._unsupported("Applying operations scripts")
+
+    def apply_filter(self, text: str) -> Optional[np.ndarray]:
+        """Filter rows with an expression evaluated stripe by stripe.
+
+        Only the columns the expression references are decoded.
+
+        Args:
+            text: Filter expression; an empty string clears the filter
+
+        Returns:
+            Sorted array of selected row positions, or None when cleared
+
+        Raises:
+            FilterExpressionError: If the expression is invalid
+        """
+        if self._reader is None:
+            raise ValueError("No data loaded")
+        if not text.strip():
+            self.clear_filter()
+            return None
+
+        compiled = compile_filter(text, self.original_schema)
+        columns = sorted(compiled.columns)
+        selected = []
+        for stripe in range(self._reader.num_stripes):
+            start, end = self._reader.row_offsets[stripe], self._reader.row_offsets[stripe + 1]
+            table = self._reader.read(stripe, columns).append_column(
+                ROW_ID_COLUMN, pyarrow.array(np.arange(start, end, dtype=np.int64)))
+            try:
+                filtered = table.filter(compiled.expression)
+            except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError,
+                    pyarrow.lib.ArrowTypeError) as e:
+                raise FilterExpressionError(f"Cannot evaluate filter: {str(e)}")
+            selected.append(filtered.column(ROW_ID_COLUMN).to_numpy())
+
+        self.selection = np.concatenate(selected) if selected else np.array([], dtype=np.int64)
+        self.filter_text = text
+        return self.selection
+
+    def _index_source(self) -> Callable[[], pyarrow.Table]:
+        """Snapshot the overlay; the string columns are read in the background."""
+        reader = self._reader.copy()
+        columns = [field.name for field in reader.schema if is_indexable(field.type)]
+
+        def load() -> pyarrow.Table:
+            tables = [reader.read(stripe, columns) for stripe in range(reader.num_stripes)]
+            if not tables:
+                return pyarrow.schema([reader.schema.field(name) for name in columns]).empty_table()
+            return pyarrow.concat_tables(tables)
+
+        return load
+
+    def _table_slice(self, start: int, length: int, columns: List[str]) -> pyarrow.Table:
+        """Get current data for a row range, reading the stripes it spans."""
+        reader = self._reader
+        first, last = reader.stripe_of_row(start), reader.stripe_of_row(start + max(length, 1) - 1)
+        tables = []
+        for stripe in range(first, last + 1):
+            offset = reader.row_offsets[stripe]
+            table = reader.read(stripe, columns)
+            tables.append(table.slice(max(start - offset, 0), start + length - max(start, offset)))
+        return pyarrow.concat_tables(tables)
+
+    def prepare_profile(self, column_name: str) -> Callable[..., ColumnProfile]:
+        """Snapshot a column for profiling, one stripe per sketched batch.
+
+        Args:
+            column_name: Name of the column to profile
+
+        Returns:
+            Callable taking an optional progress callback and returning the ColumnProfile
+        """
+        if self._reader is None:
+            raise ValueError("No data loaded")
+        if column_name not in self.column_names:
+            raise ValueError(f"Column '{column_name}' does not exist")
+        reader = self._reader.copy()
+        data_type = reader.schema.field(column_name).type
+
+        def profile(progress: Optional[Callable[[int, int], None]] = None) -> ColumnProfile:
+            batches = [
+                (lambda stripe=stripe: reader.read(stripe, [column_name]).column(0))
+                for stripe in range(reader.num_stripes)
+            ]
+            return ColumnProfiler().profile(column_name, data_type, batches, progress)
+
+        return profile
+
+    def prepare_export(self, columns: Optional[List[str]] = None,
+                       filtered: bool = True) -> Callable[..., ExportResult]:
+        """Snapshot the overlay and filter for export, streamed stripe by stripe.
+
+        Args:
+            columns: Columns to export, in order; all columns when None
+            filtered: Export only the rows selected by the active filter
+
+        Returns:
+            Callable taking (destination, format=None, progress=None) and
+            returning an ExportResult; the format is inferred from the
+            destination's extension when None
+        """
+        if self._reader is None:
+            raise ValueError("No data loaded")
+        for name in columns or []:
+            if name not in self.column_names:
+                raise ValueError(f"Column '{name}' does not exist")
+
+        reader = self._reader.copy()
+        columns = list(columns or reader.schema.names)
+        schema = pyarrow.schema([reader.schema.field(name) for name in columns])
+        rows = self.selection if filtered else None
+        total = reader.row_offsets[-1] if rows is None else len(rows)
+
+        def export(destination: str, format: Optional[str] = None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> ExportResult:
+            def batches():
+                done = 0
+                for stripe in range(reader.num_stripes):
+                    start, end = reader.row_offsets[stripe], reader.row_offsets[stripe + 1]
+                    if rows is None:
+                        table = reader.read(stripe, columns)
+                    else:
+                        local = rows[np.searchsorted(rows, start):np.searchsorted(rows, end)] - start
+                        if not len(local):
+                            continue
+                        table = reader.read(stripe, columns).take(pyarrow.array(local))
+                    yield from table.to_batches()
+                    done += table.num_rows
+                    if progress is not None:
+                        progress(done, total)
+
+            return write_batches(destination, schema, batches(), format)
+
+        return export
+
+    def memory_consumers(self) -> List[Consumer]:
+        """What this backend can give back when memory runs short.
+
+        Decoded stripes are dropped first, then the search index.
+        """
+        def index_bytes() -> int:
+            index = self.search_index
+            return index.nbytes if index is not None else 0
+
+        return [
+            Consumer('stripe cache', lambda: _stripe_cache.nbytes(self._cache_owner), self._drop_stripes,
+                     priority=0, in_arrow_pool=True),
+            Consumer('search index', index_bytes, self.release_search_index, priority=10),
+        ]
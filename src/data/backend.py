@@ -0,0 +1,844 @@
+"""The interface between the editor window and the data of one open file.
+
+Two backends implement it:
+
+* ``ORCDataManager`` loads the whole file into a pandas DataFrame, keeping
+  the Arrow table for unmodified columns. Every cell is in memory, so
+  edits, filters and column operations are immediate.
+* ``ArrowBackend`` keeps only the file open and decodes stripes on demand;
+  edits are kept as an overlay and merged in when stripes are read or the
+  file is saved. It opens files of any size.
+
+``open_backend`` picks one per file from its estimated in-memory size.
+State that does not depend on how the data is held (filter selection,
+sort order, search index, statistics, edit journal) lives here so both
+backends share it.
+"""
+import logging
+import sys
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+
+from src.data.column_profile import ColumnProfile
+from src.data.column_stats import (ColumnStatistics, FileStatistics, collect_file_statistics,
+                                   collect_table_statistics)
+from src.data.export import ExportResult
+from src.data.importer import ImportResult
+from src.data.journal import EditJournal, decode_array, encode_array, read_journal
+from src.data.operations import Pipeline, TransformResult, transform_file
+from src.data.preview import format_cell
+from src.data.search_index import SearchIndex
+from src.exceptions.orc_exceptions import ORCImportError, ORCJournalError, ORCLoadError
+from src.utils.config import Config
+from src.utils.memory import Consumer, MemoryManager, shared_memory_manager
+
+logger = logging.getLogger('orc_editor.data')
+
+
+@dataclass
+class ValidationResult:
+    has_differences: bool
+    differences: List[str]
+
+
+_NULLABLE_DTYPES = {
+    pyarrow.int8(): pd.Int8Dtype(),
+    pyarrow.int16(): pd.Int16Dtype(),
+    pyarrow.int32(): pd.Int32Dtype(),
+    pyarrow.int64(): pd.Int64Dtype(),
+    pyarrow.uint8(): pd.UInt8Dtype(),
+    pyarrow.uint16(): pd.UInt16Dtype(),
+    pyarrow.uint32(): pd.UInt32Dtype(),
+    pyarrow.uint64(): pd.UInt64Dtype(),
+    pyarrow.float32(): pd.Float32Dtype(),
+    pyarrow.float64(): pd.Float64Dtype(),
+    pyarrow.bool_(): pd.BooleanDtype(),
+}
+
+
+def categorical_columns(table: pyarrow.Table) -> List[str]:
+    """Find the low-cardinality string columns worth keeping as categoricals.
+
+    The distinct values of each string column are counted over its first
+    ``Config.CATEGORICAL_SAMPLE_ROWS`` rows.
+
+    Args:
+        table: Table about to be converted to pandas
+
+    Returns:
+        Names of the string columns with few distinct values
+    """
+    sample = table.slice(0, Config.CATEGORICAL_SAMPLE_ROWS)
+    if sample.num_rows == 0:
+        return []
+    limit = min(Config.CATEGORICAL_MAX_VALUES, sample.num_rows * Config.CATEGORICAL_MAX_RATIO)
+    return [
+        field.name for field in table.schema
+        if (pyarrow.types.is_string(field.type) or pyarrow.types.is_large_string(field.type))
+        and pc.count_distinct(sample.column(field.name)).as_py() <= limit
+    ]
+
+
+def categorical_savings(series: pd.Series) -> int:
+    """Bytes a categorical column saves over the same strings as objects.
+
+    Measured the way ``memory_usage(deep=True)`` measures an object column:
+    a pointer per row plus the size of every string it points to.
+    """
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    sizes = np.fromiter((sys.getsizeof(value) for value in series.cat.categories), dtype=np.int64,
+                        count=len(series.cat.categories))
+    as_objects = 8 * len(series) + int(counts @ sizes) + sys.getsizeof(None) * int((codes < 0).sum())
+    return max(as_objects - int(series.memory_usage(deep=True, index=False)), 0)
+
+
+def convert_to_pandas(table: pyarrow.Table, categories: Optional[List[str]] = None) -> pd.DataFrame:
+    """Convert PyArrow table to pandas DataFrame with proper type conversions.
+
+    Args:
+        table: PyArrow table to convert
+        categories: String columns to convert to pandas categoricals
+
+    Returns:
+        pandas DataFrame with converted data
+    """
+    try:
+        # Integers, floats and booleans become masked nullable columns, so
+        # nulls stay nulls (and NaN stays distinct from null) on save
+        df = table.to_pandas(categories=categories or None, types_mapper=_NULLABLE_DTYPES.get)
+
+        # Apply type conversions for specific fields
+        for field in table.schema:
+            field_type = str(field.type)
+            if field_type.startswith('list<'):
+                if field.name in df.columns:
+                    # Ensure lists are properly converted from numpy arrays
+                    df[field.name] = df[field.name].apply(
+                        lambda x: x.tolist() if isinstance(x, np.ndarray) else x
+                    )
+
+            elif field_type.startswith('struct<'):
+                if field.name in df.columns:
+                    # Ensure structs are properly converted to dictionaries
+                    df[field.name] = df[field.name].apply(
+                        lambda x: dict(x) if x is not None else None
+                    )
+
+        return df
+
+    except Exception as e:
+        raise ORCLoadError(f"Failed to convert data: {str(e)}")
+
+
+class _CategoricalValues:
+    """Positional access to a categorical column without expanding it to objects."""
+
+    def __init__(self, series: pd.Series):
+        self.codes = series.cat.codes.to_numpy()
+        # Code -1 (missing) picks the trailing None, as object columns show it
+        self.categories = np.append(series.cat.categories.to_numpy(dtype=object), None)
+
+    def __getitem__(self, position: int) -> Any:
+        return self.categories[self.codes[position]]
+
+
+def _cell_values(series: pd.Series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _CategoricalValues(series)
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) or series.dtype.kind == 'M':
+        # Masked and datetime arrays yield <NA> / Timestamp instead of nan / datetime64
+        return series.array
+    return series.to_numpy()
+
+
+def format_rows(df: pd.DataFrame, rows: Sequence[int], columns: List[str],
+                hidden: Optional[Dict[str, np.ndarray]] = None) -> List[List[str]]:
+    """Render DataFrame cells as the strings shown in the table view.
+
+    Args:
+        df: Data to render
+        rows: Positions of the rows in ``df``
+        columns: Columns to render, in order
+        hidden: Per column, what ``preview_table`` already cut from each row
+
+    Returns:
+        One list of cell strings per row
+    """
+    hidden = hidden or {}
+    # Read straight from the column arrays so the DataFrame is never copied
+    column_values = {col: _cell_values(df[col]) for col in columns}
+    integer_columns = {col for col in columns if pd.api.types.is_integer_dtype(df[col].dtype)}
+    rendered = []
+    for idx in rows:
+        rendered.append([
+            format_cell(column_values[col][idx], col in integer_columns,
+                        int(hidden[col][idx]) if col in hidden else None)
+            for col in columns
+        ])
+    return rendered
+
+
+class DataBackend(ABC):
+    """Everything the editor window needs from the data of one file.
+
+    Row positions are 0-based positions in the file and identify a row
+    however the view is filtered or sorted. ``selection`` holds the sorted
+    positions matching the active filter, or None when every row is shown;
+    ``sort_key`` orders the view by a column on top of it.
+    """
+
+    # Most rows the table view shows at once; None shows every selected row
+    display_limit: Optional[int] = None
+    # Whether drop/rename/cast/reorder, undo and operations scripts work;
+    # when False they raise UnsupportedOperationError
+    supports_schema_operations = True
+
+    def __init__(self, memory: Optional[MemoryManager] = None):
+        self.current_file: Optional[str] = None
+        self.original_schema: Optional[pyarrow.Schema] = None
+        self.original_metadata = None
+        self.sort_key: Optional[Tuple[str, bool]] = None
+        self.selection: Optional[np.ndarray] = None
+        self.filter_text = ''
+        self.search_index: Optional[SearchIndex] = None
+        self._index_lock = threading.Lock()
+        # Changes to apply to the index being built, in order; None when no build runs
+        self._pending_index_updates: Optional[List[Callable[[SearchIndex], None]]] = None
+        self._index_generation = 0
+        self.search_index_released = False
+        self.statistics: Optional[FileStatistics] = None
+        self._stats_dirty_rows: Set[int] = set()
+        self._stats_generation = 0
+        self._stats_source: Optional[pyarrow.Table] = None
+        self.journal: Optional[EditJournal] = None
+        self.memory = memory if memory is not None else shared_memory_manager()
+        self.memory.track(self)
+
+    # Loading and saving
+
+    @property
+    @abstractmethod
+    def loaded(self) -> bool:
+        """Whether a file is open."""
+
+    @property
+    @abstractmethod
+    def num_rows(self) -> int:
+        """Number of rows, ignoring the filter."""
+
+    @property
+    @abstractmethod
+    def column_names(self) -> List[str]:
+        """All column names, in order."""
+
+    @abstractmethod
+    def load_file(self, filename: str) -> bool:
+        """Open an ORC file.
+
+        Raises:
+            ORCLoadError: If the file cannot be read
+        """
+
+    @abstractmethod
+    def save_file(self, filename: str) -> ValidationResult:
+        """Write the current data to an ORC file and validate the result.
+
+        Raises:
+            ORCSaveError: If building, writing or validating fails
+        """
+
+    def _reset_derived_state(self) -> None:
+        """Forget the filter, sort order, search index and statistics of the previous data."""
+        with self._index_lock:
+            self.search_index = None
+            self._pending_index_updates = None
+            self._index_generation += 1
+        self.search_index_released = False
+        self.sort_key = None
+        self.clear_filter()
+        self.statistics = None
+        self._stats_dirty_rows = set()
+        self._stats_generation += 1
+        self._stats_source = None
+
+    # Paging
+
+    @property
+    def selection(self) -> Optional[np.ndarray]:
+        return self._selection
+
+    @selection.setter
+    def selection(self, rows: Optional[np.ndarray]) -> None:
+        self._selection = rows
+        self._order = None  # Sorted again over the new selection when next shown
+
+    def selected_rows(self, limit: Optional[int] = None) -> np.ndarray:
+        """Get the row positions currently shown, honoring the active filter.
+
+        Args:
+            limit: Return at most this many positions
+        """
+        if self.selection is not None:
+            return self.selection if limit is None else self.selection[:limit]
+        count = self.num_rows if limit is None else min(limit, self.num_rows)
+        return np.arange(count)
+
+    def view_rows(self, limit: Optional[int] = None) -> np.ndarray:
+        """Get the selected row positions in the order the table view shows them.
+
+        Args:
+            limit: Return at most this many positions
+        """
+        order = self._view_order()
+        if order is None:
+            return self.selected_rows(limit)
+        return order if limit is None else order[:limit]
+
+    def row_at(self, position: int) -> int:
+        """Map a position in the table view to a row position in the file."""
+        order = self._view_order()
+        if order is not None:
+            return int(order[position])
+        if self.selection is not None:
+            return int(self.selection[position])
+        return int(position)
+
+    def sort_rows(self, column: Optional[str], descending: bool = False) -> None:
+        """Order the view by a column, or restore file order when column is None.
+
+        The order is a permutation of the selected rows, computed from the
+        column's current values with Arrow's stable sort; nulls come last.
+        It is kept when cells change and recomputed when the filter does.
+
+        Raises:
+            ValueError: If the column does not exist or cannot be sorted
+        """
+        if column is None:
+            self.sort_key, self._order = None, None
+            return
+        if column not in self.column_names:
+            raise ValueError(f"Column '{column}' does not exist")
+        previous = self.sort_key
+        self.sort_key, self._order = (column, descending), None
+        try:
+            self._view_order()
+        except Exception:
+            self.sort_key = previous
+            raise
+
+    def _view_order(self) -> Optional[np.ndarray]:
+        """The sorted view as row positions, or None when shown in file order."""
+        if self.sort_key is None:
+            return None
+        if self._order is None:
+            column, descending = self.sort_key
+            rows = self.selected_rows()
+            try:
+                indices = pc.array_sort_indices(self._column_array(column, rows),
+                                                order="descending" if descending else "ascending",
+                                                null_placement="at_end")
+            except pyarrow.lib.ArrowNotImplementedError:
+                raise ValueError(f"Column '{column}' cannot be sorted")
+            self._order = rows[indices.to_numpy()]
+        return self._order
+
+    @abstractmethod
+    def _column_array(self, column: str, rows: np.ndarray) -> pyarrow.Array:
+        """Get the current values of one column at some row positions."""
+
+    @abstractmethod
+    def display_rows(self, rows: Sequence[int], columns: List[str]) -> List[List[str]]:
+        """Render rows as the strings shown in the table view."""
+
+    @abstractmethod
+    def row_frame(self, row_idx: int, columns: List[str]) -> pd.DataFrame:
+        """Get one row as a single-row DataFrame, as the edit dialog expects."""
+
+    @abstractmethod
+    def is_empty_column(self, column: str) -> bool:
+        """Check if a column contains only empty lists/arrays or missing values."""
+
+    def get_column_names(self) -> List[str]:
+        """Get list of non-empty column names.
+
+        Returns:
+            List of column names excluding empty columns
+        """
+        return [col for col in self.column_names if not self.is_empty_column(col)]
+
+    # Editing
+
+    @abstractmethod
+    def update_row(self, row_idx: int, new_values: Dict[str, Any]) -> None:
+        """Update a row with new values.
+
+        Raises:
+            ValueError: If the row or a value is invalid
+        """
+
+    @abstractmethod
+    def cell(self, row_idx: int, column: str) -> pyarrow.Array:
+        """Get the current value of one cell as a one-element Arrow array.
+
+        Raises:
+            ValueError: If the row or column does not exist
+        """
+
+    @abstractmethod
+    def _set_cell(self, row_idx: int, column: str, array: pyarrow.Array) -> None:
+        """Store a new one-element array as the value of a cell."""
+
+    def update_leaf(self, row_idx: int, column: str, path: Tuple[Union[str, int], ...],
+                    value: Any) -> None:
+        """Replace one value inside a nested cell.
+
+        Only the struct and list arrays on the path to the value are rebuilt,
+        from slices of the current cell; the rest of the cell is reused.
+
+        Args:
+            row_idx: Index of the row
+            column: Name of the column
+            path: Field names and list positions leading to the value
+            value: New value, a one-element array or a Python value
+
+        Raises:
+            ValueError: If the path does not exist or the value does not fit
+        """
+        from src.data.nested import replace_leaf
+
+        try:
+            array = replace_leaf(self.cell(row_idx, column), path, value)
+        except (KeyError, IndexError, TypeError, pyarrow.lib.ArrowException) as e:
+            raise ValueError(f"Failed to update {column}{list(path)}: {str(e)}")
+        self._set_cell(row_idx, column, array)
+
+    @abstractmethod
+    def add_column(self, column_name: str, data_type: str, default_value: Any,
+                   position: Optional[int] = None) -> None:
+        """Add a new column filled with a default value (or nulls)."""
+
+    # Schema operations
+
+    @abstractmethod
+    def drop_column(self, column_name: str) -> None:
+        """Drop a column."""
+
+    @abstractmethod
+    def rename_column(self, column_name: str, new_name: str) -> None:
+        """Rename a column."""
+
+    @abstractmethod
+    def cast_column(self, column_name: str, data_type: Union[str, pyarrow.DataType],
+                    safe: bool = True) -> None:
+        """Cast a column to another type.
+
+        Raises:
+            ValueError: If the type name is unknown or the values cannot be cast
+        """
+
+    @abstractmethod
+    def reorder_columns(self, order: List[str]) -> None:
+        """Reorder the columns; ``order`` holds every column name once."""
+
+    @abstractmethod
+    def undo(self) -> Optional[str]:
+        """Undo the most recent schema operation.
+
+        Returns:
+            Description of the undone operation, or None if there was nothing to undo
+        """
+
+    @property
+    @abstractmethod
+    def can_undo(self) -> bool:
+        """Whether there is a schema operation that can be undone."""
+
+    @abstractmethod
+    def apply_operations(self, operations: Union[Pipeline, List[Dict[str, Any]]]) -> None:
+        """Apply an operations script to the loaded data.
+
+        Raises:
+            OperationError: If the operations are invalid for the data
+        """
+
+    # Edit journal
+
+    def recoverable_edits(self) -> int:
+        """Number of unsaved edits an earlier session journaled for the current file."""
+        records = read_journal(self.current_file) if self.current_file else None
+        return len(records) if records else 0
+
+    def start_journal(self, recover: bool = False) -> int:
+        """Append every following edit to a journal next to the current file.
+
+        Args:
+            recover: Replay the edits journaled by an earlier session first;
+                otherwise they are discarded
+
+        Returns:
+            Number of edits replayed
+
+        Raises:
+            ORCJournalError: If the journal cannot be read, replayed or created
+        """
+        self.close_journal()
+        records = (read_journal(self.current_file) if recover else None) or []
+        for number, record in enumerate(records):
+            try:
+                self._replay(record)
+            except Exception as e:
+                raise ORCJournalError(f"Failed to replay edit {number + 1} of {len(records)}: {str(e)}")
+        self.journal = EditJournal(self.current_file)
+        for record in records:
+            self.journal.append(record)
+        if not records:
+            self.journal.discard()  # Edits not recovered are dropped
+        return len(records)
+
+    def close_journal(self) -> None:
+        """Stop journaling; the journal stays on disk for recovery."""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def _restart_journal(self) -> None:
+        """Replace the journal by an empty one for the file just saved."""
+        if self.journal is not None:
+            self.journal.discard()
+            self.journal = EditJournal(self.current_file)
+
+    def _journal(self, record: Dict[str, Any]) -> None:
+        """Append an edit record; a journal that cannot be written is given up."""
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(record)
+        except ORCJournalError:
+            logger.exception("Edits are no longer journaled")
+            self.close_journal()
+
+    def _journal_cell(self, row_idx: int, column: str, array: pyarrow.Array) -> None:
+        if self.journal is not None:
+            self._journal({"op": "cell", "row": int(row_idx), "column": column,
+                           "value": encode_array(array)})
+
+    def _journal_add_column(self, column_name: str, data_type: str, default_value: Any,
+                            position: int) -> None:
+        if self.journal is not None:
+            from src.utils.type_utils import get_pyarrow_type
+            default = pyarrow.array([default_value], type=get_pyarrow_type(data_type))
+            self._journal({"op": "add_column", "column": column_name, "type": data_type,
+                           "default": encode_array(default), "position": position})
+
+    def _replay(self, record: Dict[str, Any]) -> None:
+        """Apply one journaled edit again.
+
+        Raises:
+            ValueError: If the edit does not fit the data
+        """
+        op = record["op"]
+        if op == "cell":
+            row_idx, column = record["row"], record["column"]
+            if not 0 <= row_idx < self.num_rows or column not in self.column_names:
+                raise ValueError(f"No cell at row {row_idx}, column '{column}'")
+            field = self.original_schema.field(column)
+            self._set_cell(row_idx, column, decode_array(record["value"], field.type))
+        elif op == "add_column":
+            from src.utils.type_utils import get_pyarrow_type
+            default = decode_array(record["default"], get_pyarrow_type(record["type"]))
+            self.add_column(record["column"], record["type"], default[0].as_py(), record["position"])
+        else:
+            raise ValueError(f"Unknown edit '{op}'")
+
+    # Filtering
+
+    @abstractmethod
+    def apply_filter(self, text: str) -> Optional[np.ndarray]:
+        """Select the rows matching a filter expression.
+
+        Returns:
+            Sorted array of selected row positions, or None when cleared
+
+        Raises:
+            FilterExpressionError: If the expression is invalid
+        """
+
+    def clear_filter(self) -> None:
+        """Remove the active filter so every row is selected."""
+        self.selection = None
+        self.filter_text = ''
+
+    # Search
+
+    @abstractmethod
+    def _index_source(self) -> Callable[[], pyarrow.Table]:
+        """Snapshot the data to index; the returned loader runs in the background."""
+
+    def prepare_search_index(self) -> Callable[[], SearchIndex]:
+        """Snapshot the current data for building the full-text search index.
+
+        Must be called on the thread that edits the data. The returned
+        builder can run on a background thread; edits and column changes
+        made while it runs are queued and applied to the index before it is
+        installed.
+
+        Returns:
+            Callable that builds, installs and returns the SearchIndex
+        """
+        load = self._index_source()
+        self.search_index_released = False
+        with self._index_lock:
+            self.search_index = None
+            self._pending_index_updates = []
+            self._index_generation += 1
+            generation = self._index_generation
+
+        def build() -> SearchIndex:
+            index = SearchIndex.build(load())
+            with self._index_lock:
+                if generation != self._index_generation:
+                    # A newer build (or a newly loaded file) superseded this one
+                    return index
+                for change in self._pending_index_updates or []:
+                    change(index)
+                self._pending_index_updates = None
+                self.search_index = index
+            return index
+
+        return build
+
+    def search(self, query: str) -> np.ndarray:
+        """Find rows whose string columns contain every word of the query.
+
+        Args:
+            query: Free text query; the last word is matched as a prefix
+
+        Returns:
+            Sorted array of matching row positions (empty if the index is not built yet)
+        """
+        with self._index_lock:
+            if self.search_index is None:
+                return np.array([], dtype=np.int64)
+            return self.search_index.search(query)
+
+    def _update_search_index(self, row_idx: int, column: str, value: Any) -> None:
+        """Keep the search index in step with a cell edit."""
+        self._change_search_index(lambda index: index.update(row_idx, column, value))
+
+    @property
+    def _search_index_wanted(self) -> bool:
+        """Whether there is an index, built or being built, that changes must reach."""
+        return self.search_index is not None or self._pending_index_updates is not None
+
+    def _change_search_index(self, change: Callable[[SearchIndex], None]) -> None:
+        """Apply a change to the search index, or queue it while the index is being built.
+
+        Args:
+            change: Updates an index in place; it must only use data captured
+                when it was made, since queued changes run on the build thread
+        """
+        with self._index_lock:
+            if self._pending_index_updates is not None:
+                self._pending_index_updates.append(change)
+            elif self.search_index is not None:
+                change(self.search_index)
+
+    def release_search_index(self) -> None:
+        """Drop the search index to save memory; it is rebuilt on demand."""
+        with self._index_lock:
+            if self.search_index is None:
+                return
+            self.search_index = None
+            self._pending_index_updates = None
+            self._index_generation += 1
+        self.search_index_released = True
+
+    # Statistics
+
+    @abstractmethod
+    def _table_slice(self, start: int, length: int, columns: List[str]) -> pyarrow.Table:
+        """Get current data for a row range."""
+
+    def load_statistics(self, progress: Optional[Callable[[int, int], None]] = None) -> None:
+        """Collect column statistics from the loaded file, stripe by stripe.
+
+        Safe to run on a background thread: it only reads the file on disk,
+        or the immutable Arrow table left by ``apply_operations``.
+        Results are cached per file fingerprint, so this is instant for a
+        file that was already scanned.
+
+        Args:
+            progress: Optional callback receiving (stripes done, total stripes)
+        """
+        generation = self._stats_generation
+        if self._stats_source is not None:
+            # Rows no longer match the file on disk (operations were applied)
+            statistics = collect_table_statistics(self._stats_source, progress=progress)
+        else:
+            statistics = collect_file_statistics(self.current_file, progress)
+        if generation == self._stats_generation:
+            self.statistics = statistics
+
+    def get_statistics(self) -> Optional[Dict[str, ColumnStatistics]]:
+        """Get per-column statistics reflecting the current, edited data.
+
+        Only the stripes containing edited rows, and columns that were added
+        or changed type since the scan, are recomputed from memory.
+
+        Returns:
+            Dictionary mapping column names to statistics, or None if
+            ``load_statistics`` has not completed yet
+        """
+        statistics = self.statistics
+        if statistics is None:
+            return None
+
+        stale_stripes = {statistics.stripe_of_row(row) for row in self._stats_dirty_rows}
+        self._stats_dirty_rows = set()
+        for stripe in sorted(stale_stripes):
+            start, length = statistics.stripe_range(stripe)
+            statistics.update_stripe(stripe, self._table_slice(start, length, self.column_names))
+
+        changed = [
+            field.name for field in self.original_schema
+            if field.name not in statistics.schema.names
+            or not statistics.schema.field(field.name).type.equals(field.type)
+        ]
+        if changed:
+            for stripe in range(len(statistics.stripes)):
+                start, length = statistics.stripe_range(stripe)
+                statistics.update_stripe(stripe, self._table_slice(start, length, changed))
+        statistics.schema = self.original_schema
+
+        return statistics.summary(self.original_schema)
+
+    # Background jobs
+
+    @abstractmethod
+    def prepare_profile(self, column_name: str) -> Callable[..., ColumnProfile]:
+        """Snapshot a column for profiling on a background thread."""
+
+    @abstractmethod
+    def prepare_export(self, columns: Optional[List[str]] = None,
+                       filtered: bool = True) -> Callable[..., ExportResult]:
+        """Snapshot the current data for export on a background thread."""
+
+    # Memory
+
+    def release_display_caches(self) -> None:
+        """Drop what only speeds up showing rows, e.g. when the file's tab is hidden."""
+
+    def close(self) -> None:
+        """Give back what the backend holds once its file is closed.
+
+        The edit journal stays on disk, so unsaved edits can be recovered.
+        """
+        self.close_journal()
+        self.release_display_caches()
+        self.memory.untrack(self)
+
+    @abstractmethod
+    def memory_consumers(self) -> List[Consumer]:
+        """What this backend can give back when memory runs short."""
+
+    def dataframe_bytes(self) -> int:
+        """Bytes held in pandas DataFrames."""
+        return 0
+
+    def categorical_savings(self) -> int:
+        """Bytes saved by keeping string columns as categoricals."""
+        return 0
+
+    # File conversions that do not need an open file
+
+    @staticmethod
+    def transform_file(source: str, destination: str,
+                       operations: Union[Pipeline, List[Dict[str, Any]]],
+                       progress: Optional[Callable[[int, int], None]] = None) -> TransformResult:
+        """Apply an operations script to an ORC file without loading it.
+
+        Stripes are streamed through the operations one at a time, so memory
+        use is bounded by the stripe size rather than the file size.
+
+        Args:
+            source: Path of the ORC file to read
+            destination: Path to write; may be the source itself
+            operations: A Pipeline, or a list of operation dictionaries
+            progress: Optional callback receiving (stripes done, total stripes)
+
+        Returns:
+            TransformResult with row counts and timing
+        """
+        pipeline = operations if isinstance(operations, Pipeline) else Pipeline.from_specs(operations)
+        return transform_file(source, destination, pipeline, progress)
+
+    @staticmethod
+    def import_file(source: str, destination: str, format: Optional[str] = None,
+                    schema_from: Optional[Union[str, pyarrow.Schema]] = None,
+                    progress: Optional[Callable[[int], None]] = None) -> ImportResult:
+        """Convert a CSV, JSON Lines or Parquet file to ORC without loading it.
+
+        The input is streamed in blocks, each coerced to the target schema
+        and appended to the ORC file, so memory use does not depend on the
+        input size. Load the result with ``load_file`` to edit it.
+
+        Args:
+            source: Path of the file to import
+            destination: Path of the ORC file to write
+            format: 'csv', 'ndjson' or 'parquet'; inferred from the extension when None
+            schema_from: Target schema, or the path of an ORC file to take it
+                from; inferred from the input when None
+            progress: Optional callback receiving the number of rows written so far
+
+        Returns:
+            ImportResult including any mismatches between the input and target schemas
+
+        Raises:
+            ORCImportError: If the input cannot be read or coerced
+        """
+        from src.data.importer import import_file
+
+        if isinstance(schema_from, str):
+            try:
+                schema_from = orc.ORCFile(schema_from).schema
+            except (OSError, pyarrow.lib.ArrowInvalid) as e:
+                raise ORCImportError(f"Cannot read schema from {schema_from}: {str(e)}")
+        return import_file(source, destination, format, schema_from, progress=progress)
+
+
+def open_backend(filename: str, memory: Optional[MemoryManager] = None) -> DataBackend:
+    """Create the backend suited to a file, without loading it.
+
+    Files whose estimated in-memory size (Arrow table plus DataFrame) is
+    above ``Config.LAZY_BACKEND_FRACTION`` of the memory budget, or would
+    not fit next to the files already open, are opened with the lazy
+    ``ArrowBackend``; everything else with ``ORCDataManager``.
+
+    Args:
+        filename: Path of the ORC file
+        memory: Memory manager to account against, the shared one when None
+
+    Returns:
+        An unloaded backend; call ``load_file`` on it
+    """
+    from src.data.arrow_backend import ArrowBackend
+    from src.data.data_manager import ORCDataManager
+    from src.utils.memory import estimate_load_bytes
+
+    memory = memory if memory is not None else shared_memory_manager()
+    try:
+        estimate = estimate_load_bytes(filename)
+    except (OSError, pyarrow.lib.ArrowInvalid):
+        estimate = 0  # load_file reports unreadable files
+    if estimate > memory.budget * Config.LAZY_BACKEND_FRACTION or not memory.fits(estimate):
+        return ArrowBackend(memory)
+    return ORCDataManager(memory)
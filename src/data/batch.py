@@ -0,0 +1,200 @@
+"""Run an operations script over many ORC files on a process pool.
+
+Each file is an independent load -> transform -> save job, so jobs are
+spread over worker processes and scale with the number of cores. Workers
+can be given an address-space cap; a job that exceeds it fails with a
+MemoryError instead of taking the whole machine down.
+
+A worker that dies outright (killed by the OS, a crash in native code)
+breaks the whole process pool. The pool is then recreated: jobs that had
+not started yet are resubmitted, and jobs that were running are retried one
+at a time in a pool of their own, so only the job that kills its worker
+again is reported as failed.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+@dataclass
+class FileOutcome:
+    source: str
+    destination: str
+    ok: bool
+    rows_in: int = 0
+    rows_out: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    # Highest resident size the worker process reached so far, which may
+    # have been while running an earlier file
+    peak_rss_mb: Optional[float] = None
+
+
+@dataclass
+class BatchSummary:
+    outcomes: List[FileOutcome] = field(default_factory=list)
+    workers: int = 1
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> List[FileOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+    @property
+    def succeeded(self) -> List[FileOutcome]:
+        return [outcome for outcome in self.outcomes if outcome.ok]
+
+    def format(self, slowest: int = 5) -> str:
+        """Render the summary as text for the console."""
+        busy = sum(outcome.seconds for outcome in self.outcomes)
+        rows_in = sum(outcome.rows_in for outcome in self.succeeded)
+        rows_out = sum(outcome.rows_out for outcome in self.succeeded)
+        lines = [
+            f"{len(self.outcomes)} files on {self.workers} workers in {self.seconds:.2f}s "
+            f"({busy:.2f}s of file time, {busy / self.seconds if self.seconds else 0:.1f}x parallel)",
+            f"{len(self.succeeded)} succeeded, {len(self.failed)} failed; "
+            f"{rows_in:,} rows in, {rows_out:,} rows out",
+        ]
+        timed = sorted(self.succeeded, key=lambda outcome: outcome.seconds, reverse=True)
+        if timed:
+            lines.append("Slowest files:")
+            for outcome in timed[:slowest]:
+                memory = f", worker peak {outcome.peak_rss_mb:,.0f} MB" if outcome.peak_rss_mb else ""
+                lines.append(f"  {outcome.seconds:8.2f}s  {outcome.source}{memory}")
+        if self.failed:
+            lines.append("Failures:")
+            for outcome in self.failed:
+                lines.append(f"  {outcome.source}: {outcome.error}")
+        return "\n".join(lines)
+
+
+# Set in each worker: where it reports the jobs it starts
+_started = None
+
+
+def _init_worker(memory_limit_mb: Optional[int], started) -> None:
+    """Cap the address space of a worker process."""
+    global _started
+    _started = started
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _process_file(index: int, source: str, destination: str,
+                  specs: List[Dict[str, Any]]) -> FileOutcome:
+    """Worker entry point: stream one file through the operations."""
+    from src.data.data_manager import ORCDataManager
+
+    if _started is not None:
+        _started.put(index)  # SimpleQueue writes synchronously, so this survives a crash
+    started = time.perf_counter()
+    try:
+        result = ORCDataManager.transform_file(source, destination, specs)
+    except MemoryError:
+        return FileOutcome(source, destination, False, seconds=time.perf_counter() - started,
+                           error="out of memory (worker memory limit reached)",
+                           peak_rss_mb=_peak_rss_mb())
+    except Exception as e:
+        return FileOutcome(source, destination, False, seconds=time.perf_counter() - started,
+                           error=str(e), peak_rss_mb=_peak_rss_mb())
+    return FileOutcome(source, destination, True, result.rows_in, result.rows_out,
+                       result.seconds, peak_rss_mb=_peak_rss_mb())
+
+
+def _run_pool(jobs: List[Tuple[str, str]], indices: List[int], specs: List[Dict[str, Any]],
+              workers: int, memory_limit_mb: Optional[int], context,
+              finish: Callable[[int, FileOutcome], None]) -> Tuple[List[int], List[int]]:
+    """Run some of the jobs on a new pool until they finish or the pool breaks.
+
+    Returns:
+        Indices of the jobs left unfinished by a broken pool: those that had
+        started, and those that had not
+    """
+    started = context.SimpleQueue()
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(memory_limit_mb, started)) as executor:
+        futures = {
+            executor.submit(_process_file, index, *jobs[index], specs): index for index in indices
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            source, destination = jobs[index]
+            try:
+                outcome = future.result()
+            except BrokenProcessPool:
+                unfinished.append(index)
+                continue
+            except Exception as e:
+                outcome = FileOutcome(source, destination, False, error=str(e))
+            finish(index, outcome)
+
+    running = set()
+    while not started.empty():
+        running.add(started.get())
+    started.close()
+    return ([index for index in unfinished if index in running],
+            [index for index in unfinished if index not in running])
+
+
+def run_batch(jobs: List[Tuple[str, str]], specs: List[Dict[str, Any]],
+              workers: Optional[int] = None, memory_limit_mb: Optional[int] = None,
+              on_done: Optional[Callable[[FileOutcome], None]] = None) -> BatchSummary:
+    """Apply an operations script to many files in parallel.
+
+    Args:
+        jobs: (source, destination) pairs
+        specs: Operation entries of the script; plain data so they can be
+            sent to the worker processes
+        workers: Number of worker processes, one per core when None
+        memory_limit_mb: Address-space cap per worker in MB (Unix only)
+        on_done: Optional callback receiving each FileOutcome as it finishes
+
+    Returns:
+        BatchSummary with an outcome per file, in job order
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    started = time.perf_counter()
+    outcomes: Dict[int, FileOutcome] = {}
+
+    def finish(index: int, outcome: FileOutcome) -> None:
+        outcomes[index] = outcome
+        if on_done is not None:
+            on_done(outcome)
+
+    # Spawned workers don't inherit threads or open file handles from the parent
+    context = multiprocessing.get_context('spawn')
+    waiting, suspects = list(range(len(jobs))), []
+    while waiting or suspects:
+        if suspects:
+            # Alone in its pool, a job that breaks it is the one killing workers
+            index = suspects.pop(0)
+            if any(_run_pool(jobs, [index], specs, 1, memory_limit_mb, context, finish)):
+                finish(index, FileOutcome(*jobs[index], False,
+                                          error="worker process died (possibly killed for memory)"))
+            continue
+        running, waiting = _run_pool(jobs, waiting, specs, workers, memory_limit_mb, context, finish)
+        if not running:
+            # Broken before any job reported starting (e.g. in the initializer)
+            running, waiting = waiting, []
+        suspects.extend(running)
+
+    return BatchSummary([outcomes[index] for index in range(len(jobs))], workers,
+                        time.perf_counter() - started)
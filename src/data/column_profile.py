@@ -0,0 +1,223 @@
+"""Sketch-based column profiling with memory that does not grow with row count.
+
+Each batch of rows (an ORC stripe, or a slice of an in-memory column) is
+sketched independently on a thread pool and the sketches are merged:
+HyperLogLog for distinct counts, SpaceSaving for heavy hitters (with a
+Count-Min sketch tightening their upper bounds) and t-digest for numeric
+quantiles.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pyarrow
+import pyarrow.compute as pc
+
+from src.utils.sketches import CountMinSketch, HyperLogLog, SpaceSaving, TDigest, hash_arrow
+
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+BATCH_ROWS = 1 << 20
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    type: str
+    rows: int = 0
+    null_count: int = 0
+    values_profiled: int = 0
+    distinct_estimate: Optional[int] = None
+    distinct_error: float = 0.0
+    heavy_hitters: List[Tuple[Any, int, int]] = field(default_factory=list)
+    quantiles: Dict[float, float] = field(default_factory=dict)
+    quantile_rank_error: Dict[float, float] = field(default_factory=dict)
+    sketch_bytes: int = 0
+
+
+class _ProfileState:
+    """Sketches for one batch of a column; merged into a single state at the end."""
+
+    def __init__(self, numeric: bool, precision: int, capacity: int, compression: float):
+        self.rows = 0
+        self.null_count = 0
+        self.values = 0
+        self.hll = HyperLogLog(precision)
+        self.heavy_hitters = SpaceSaving(capacity)
+        self.frequencies = CountMinSketch()
+        self.digest = TDigest(compression) if numeric else None
+
+    def merge(self, other: '_ProfileState') -> None:
+        self.rows += other.rows
+        self.null_count += other.null_count
+        self.values += other.values
+        self.hll.merge(other.hll)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.frequencies.merge(other.frequencies)
+        if self.digest is not None:
+            self.digest.merge(other.digest)
+
+    @property
+    def nbytes(self) -> int:
+        size = self.hll.registers.nbytes + self.frequencies.table.nbytes
+        if self.digest is not None:
+            size += self.digest.means.nbytes + self.digest.weights.nbytes
+        return size
+
+
+class ColumnProfiler:
+    """Profile a column batch by batch with fixed-size, mergeable sketches."""
+
+    def __init__(self, precision: int = 14, capacity: int = 50, compression: float = 200.0,
+                 workers: Optional[int] = None):
+        self.precision = precision
+        self.capacity = capacity
+        self.compression = compression
+        self.workers = workers or os.cpu_count() or 1
+
+    def profile(self, name: str, data_type: pyarrow.DataType,
+                batches: Iterable[Callable[[], pyarrow.Array]],
+                progress: Optional[Callable[[int, int], None]] = None,
+                top_k: int = 10) -> ColumnProfile:
+        """Sketch every batch in parallel and merge the results.
+
+        At most ``workers`` batches are loaded or sketched at a time, and each
+        sketch is merged as soon as it is done, so memory does not grow with
+        the number of batches.
+
+        Args:
+            name: Column name
+            data_type: Column type
+            batches: Callables that each load one batch of the column
+            progress: Optional callback receiving (batches done, total batches)
+            top_k: Number of heavy hitters to report
+
+        Returns:
+            ColumnProfile with estimates and their error bounds
+        """
+        batches = list(batches)
+        numeric = self._is_numeric(self._value_type(data_type))
+        merged = self._new_state(numeric)
+
+        pending, done = iter(batches), 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            running = set()
+            while True:
+                for load in pending:
+                    running.add(executor.submit(lambda load=load: self._sketch(load(), numeric)))
+                    if len(running) >= self.workers:
+                        break
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    merged.merge(future.result())
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(batches))
+
+        profile = ColumnProfile(
+            name=name,
+            type=str(data_type),
+            rows=merged.rows,
+            null_count=merged.null_count,
+            values_profiled=merged.values,
+            sketch_bytes=merged.nbytes,
+        )
+        if not pyarrow.types.is_nested(self._value_type(data_type)):
+            profile.distinct_estimate = merged.hll.estimate()
+            profile.distinct_error = merged.hll.relative_error
+            profile.heavy_hitters = self._bounded_top(merged, data_type, top_k)
+        if merged.digest is not None and merged.digest.count:
+            for q in QUANTILES:
+                profile.quantiles[q] = merged.digest.quantile(q)
+                profile.quantile_rank_error[q] = merged.digest.rank_error(q)
+        return profile
+
+    def _bounded_top(self, state: _ProfileState, data_type: pyarrow.DataType,
+                     top_k: int) -> List[Tuple[Any, int, int]]:
+        """Top values with SpaceSaving bounds, upper bounds capped by the Count-Min estimate."""
+        top = state.heavy_hitters.top(top_k)
+        if not top:
+            return top
+        values = pyarrow.array([value for value, _, _ in top], type=self._value_type(data_type))
+        estimates = state.frequencies.estimate(hash_arrow(values))
+        return [(value, low, max(low, min(high, int(estimate))))
+                for (value, low, high), estimate in zip(top, estimates)]
+
+    def _new_state(self, numeric: bool) -> _ProfileState:
+        return _ProfileState(numeric, self.precision, self.capacity, self.compression)
+
+    @staticmethod
+    def _value_type(data_type: pyarrow.DataType) -> pyarrow.DataType:
+        """List columns are profiled over their elements."""
+        if pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(data_type):
+            return data_type.value_type
+        return data_type
+
+    @staticmethod
+    def _is_numeric(data_type: pyarrow.DataType) -> bool:
+        return (pyarrow.types.is_integer(data_type) or pyarrow.types.is_floating(data_type)
+                or pyarrow.types.is_decimal(data_type))
+
+    def _sketch(self, array, numeric: bool) -> _ProfileState:
+        """Sketch one batch."""
+        state = self._new_state(numeric)
+        if isinstance(array, pyarrow.ChunkedArray):
+            array = array.combine_chunks()
+        state.rows = len(array)
+        state.null_count = array.null_count
+
+        values = array
+        if pyarrow.types.is_list(array.type) or pyarrow.types.is_large_list(array.type):
+            values = pc.list_flatten(array)
+        values = values.drop_null()
+        state.values = len(values)
+        if len(values) == 0 or pyarrow.types.is_nested(values.type):
+            return state
+
+        # Exact counts within the batch; distinct keys are hashed once for
+        # both the distinct counter and the frequency sketch
+        counts = pc.value_counts(values)
+        keys = counts.field('values')
+        freqs = counts.field('counts').to_numpy()
+        hashes = hash_arrow(keys)
+        state.hll.add_hashes(hashes)
+        state.frequencies.add_hashes(hashes, freqs)
+
+        # Trim to the top values before anything is converted to Python objects
+        floor = 0
+        if len(freqs) > self.capacity:
+            order = np.argpartition(-freqs, self.capacity)
+            floor = int(freqs[order[self.capacity:]].max())
+            keys, freqs = keys.take(pyarrow.array(order[:self.capacity])), freqs[order[:self.capacity]]
+        state.heavy_hitters = SpaceSaving.from_counts(keys.to_pylist(), freqs, self.capacity, floor)
+
+        if state.digest is not None:
+            state.digest.add_values(values.cast(pyarrow.float64()).to_numpy(zero_copy_only=False))
+        return state
+
+
+def profile_array(name: str, column: pyarrow.ChunkedArray, batch_rows: int = BATCH_ROWS,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  profiler: Optional[ColumnProfiler] = None) -> ColumnProfile:
+    """Profile an in-memory column in zero-copy slices.
+
+    Args:
+        name: Column name
+        column: Column data
+        batch_rows: Rows per sketched slice
+        progress: Optional callback receiving (batches done, total batches)
+        profiler: Profiler to use, a default one when None
+
+    Returns:
+        ColumnProfile of the column
+    """
+    profiler = profiler or ColumnProfiler()
+    batches = [
+        (lambda start=start: column.slice(start, batch_rows))
+        for start in range(0, max(len(column), 1), batch_rows)
+    ]
+    return profiler.profile(name, column.type, batches, progress)
+
@@ -1,33 +1,80 @@
-from dataclasses import dataclass
-from typing import Dict, Any, List, Optional
+import logging
+from typing import Dict, Any, List, Optional, Callable, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 import pyarrow
+import pyarrow.compute as pc
 import pyarrow.orc as orc
 
-from src.exceptions.orc_exceptions import ORCSaveError, ORCLoadError
+from src.data.backend import (DataBackend, ValidationResult, categorical_columns, categorical_savings,
+                              convert_to_pandas, format_rows)
+from src.data.column_profile import ColumnProfile, profile_array
+from src.data.export import ExportResult, write_batches
+from src.data.journal import decode_type, encode_type
+from src.data.operations import Pipeline
+from src.data.search_index import ColumnIndex, is_indexable
+from src.exceptions.orc_exceptions import ORCSaveError, ORCLoadError, FilterExpressionError
+from src.utils import timing
+from src.utils.filter_expression import compile_conjuncts, conjunct_key, split_conjuncts
+from src.utils.memory import Consumer, MemoryManager, estimate_dataframe_bytes
 
+logger = logging.getLogger('orc_editor.data')
 
-@dataclass
-class ValidationResult:
-    has_differences: bool
-    differences: List[str]
+ROW_ID_COLUMN = '__row_id__'
+EXPORT_BLOCK_ROWS = 65536
 
 
-class ORCDataManager:
-    def __init__(self):
+class ORCDataManager(DataBackend):
+    """Backend holding the whole file in a pandas DataFrame."""
+
+    def __init__(self, memory: Optional[MemoryManager] = None):
         self.df = None
-        self.original_schema = None
-        self.original_metadata = None
+        self.table = None
+        self.dirty_columns = set()
+        self._undo_stack: List[Tuple[str, Callable[[], None]]] = []
+        self._filter_cache: Dict[Tuple[str, ...], np.ndarray] = {}
+        # column -> (deep bytes, bytes saved by being categorical)
+        self._df_bytes: Dict[str, Tuple[int, int]] = {}
+        super().__init__(memory)
+
+    @property
+    def loaded(self) -> bool:
+        return self.df is not None
+
+    @property
+    def num_rows(self) -> int:
+        return 0 if self.df is None else len(self.df)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [] if self.df is None else list(self.df.columns)
+
+    def mark_dirty(self, column: str) -> None:
+        """Flag a column as modified so it is re-converted on save.
+
+        Columns that are never marked keep their originally loaded Arrow data,
+        which is reused as-is when the file is written back.
+
+        Args:
+            column: Name of the modified column
+        """
+        self.dirty_columns.add(column)
+        self._df_bytes.pop(column, None)
 
-    def add_column(self, column_name: str, data_type: str, default_value: Any) -> None:
+    def add_column(self, column_name: str, data_type: str, default_value: Any,
+                   position: Optional[int] = None) -> None:
         """Add a new column to the DataFrame.
 
+        The column is built directly as an Arrow array (``pa.repeat`` of the
+        default value, or ``pa.nulls`` when there is none), so it is written
+        back on save without any pandas round trip.
+
         Args:
             column_name: Name of the new column
             data_type: Data type of the new column
             default_value: Default value for the new column
+            position: Index to insert the column at, appended when None
         """
         if self.df is None:
             raise ValueError("No data loaded")
@@ -36,30 +83,425 @@ class ORCDataManager:
         if column_name in self.df.columns:
             raise ValueError(f"Column '{column_name}' already exists")
 
-        # Add column with default value
-        self.df[column_name] = default_value
+        from src.utils.type_utils import get_pyarrow_type
+
+        pa_type = get_pyarrow_type(data_type)
+        if isinstance(default_value, np.ndarray):
+            default_value = default_value.tolist()
+
+        num_rows = len(self.df)
+        if default_value is None:
+            array = pyarrow.nulls(num_rows, pa_type)
+        else:
+            array = pyarrow.repeat(pyarrow.scalar(default_value, type=pa_type), num_rows)
+
+        if position is None:
+            position = self.table.num_columns
+        self.table = self.table.add_column(position, pyarrow.field(column_name, pa_type), array)
+        self.df.insert(position, column_name, self._column_to_pandas(column_name))
+        self._sync_schema()
+        self._reindex_column(column_name)
+
+        self._push_undo(f"Add column '{column_name}'",
+                        lambda: self._remove_column(column_name))
+        self._journal_add_column(column_name, data_type, default_value, position)
+
+    def drop_column(self, column_name: str) -> None:
+        """Drop a column without copying the remaining columns.
+
+        Args:
+            column_name: Name of the column to drop
+        """
+        self._require_column(column_name)
+
+        position = self.table.schema.get_field_index(column_name)
+        field = self.table.schema.field(column_name)
+        column = self.table.column(column_name)
+        series = self.df[column_name]
+        was_dirty = column_name in self.dirty_columns
+
+        self._remove_column(column_name)
+
+        def restore():
+            self.table = self.table.add_column(position, field, column)
+            self.df.insert(position, column_name, series)
+            if was_dirty:
+                self.mark_dirty(column_name)
+            self._sync_schema()
+            self._reindex_column(column_name)
+
+        self._push_undo(f"Drop column '{column_name}'", restore)
+        self._journal({"op": "drop_column", "column": column_name})
+
+    def rename_column(self, column_name: str, new_name: str) -> None:
+        """Rename a column in the data, schema and dirty flags.
+
+        Args:
+            column_name: Current name of the column
+            new_name: New name for the column
+        """
+        self._require_column(column_name)
+        if new_name in self.df.columns:
+            raise ValueError(f"Column '{new_name}' already exists")
+
+        self._rename(column_name, new_name)
+        self._push_undo(f"Rename column '{column_name}' to '{new_name}'",
+                        lambda: self._rename(new_name, column_name))
+        self._journal({"op": "rename_column", "column": column_name, "new_name": new_name})
+
+    def cast_column(self, column_name: str, data_type: Union[str, pyarrow.DataType],
+                    safe: bool = True) -> None:
+        """Cast a column to another type with Arrow compute.
+
+        Args:
+            column_name: Name of the column to cast
+            data_type: Target type, either a PyArrow type or a type name as
+                accepted by ``parse_pyarrow_type``
+            safe: If True, fail on overflow or truncation instead of
+                silently producing lossy values
+
+        Raises:
+            ValueError: If the type name is unknown or the values cannot be cast
+        """
+        self._require_column(column_name)
+
+        if isinstance(data_type, str):
+            from src.utils.type_utils import parse_pyarrow_type
+            data_type = parse_pyarrow_type(data_type)
+
+        position = self.table.schema.get_field_index(column_name)
+        old_field = self.table.schema.field(column_name)
+        old_column = self._current_column(column_name)
+
+        try:
+            casted = pc.cast(old_column, data_type, safe=safe)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError) as e:
+            raise ValueError(f"Cannot cast column '{column_name}' to {data_type}: {str(e)}")
+
+        self._replace_column(position, old_field.with_type(data_type), casted)
+        self.df[column_name] = self._column_to_pandas(column_name)
+
+        def restore():
+            # Cells edited since the cast are cast back with the rest of the
+            # column; an unchanged column gets its exact old values
+            current = self._current_column(column_name)
+            if current.equals(casted):
+                restored = old_column
+            else:
+                try:
+                    restored = pc.cast(current, old_field.type)
+                except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError) as e:
+                    raise ValueError(f"Cannot cast column '{column_name}' back to "
+                                     f"{old_field.type}: {str(e)}")
+            self._replace_column(self.table.schema.get_field_index(column_name), old_field, restored)
+            self.df[column_name] = self._column_to_pandas(column_name)
+
+        self._push_undo(f"Cast column '{column_name}' to {data_type}", restore)
+        self._journal({"op": "cast_column", "column": column_name, "type": encode_type(data_type),
+                       "safe": safe})
+
+    def reorder_columns(self, order: List[str]) -> None:
+        """Reorder the columns.
+
+        Args:
+            order: All column names in their new order
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        if sorted(order) != sorted(self.df.columns):
+            raise ValueError("Column order must contain every column exactly once")
+
+        previous = list(self.df.columns)
+        self._reorder(order)
+        self._push_undo("Reorder columns", lambda: self._reorder(previous))
+        self._journal({"op": "reorder_columns", "order": list(order)})
+
+    def undo(self) -> Optional[str]:
+        """Undo the most recent schema operation.
+
+        Returns:
+            Description of the undone operation, or None if there was nothing to undo
+
+        Raises:
+            ValueError: If the operation cannot be undone, e.g. a cast whose
+                column was since edited to values the old type cannot hold;
+                it stays on the undo stack
+        """
+        if not self._undo_stack:
+            return None
+        description, restore = self._undo_stack[-1]
+        restore()
+        self._undo_stack.pop()
+        self._filter_cache.clear()
+        self._journal({"op": "undo"})
+        return description
+
+    @property
+    def can_undo(self) -> bool:
+        """Whether there is a schema operation that can be undone."""
+        return bool(self._undo_stack)
+
+    def _replay(self, record: Dict[str, Any]) -> None:
+        """Apply one journaled edit again, including schema operations."""
+        op = record["op"]
+        if op == "drop_column":
+            self.drop_column(record["column"])
+        elif op == "rename_column":
+            self.rename_column(record["column"], record["new_name"])
+        elif op == "cast_column":
+            self.cast_column(record["column"], decode_type(record["type"]), record["safe"])
+        elif op == "reorder_columns":
+            self.reorder_columns(record["order"])
+        elif op == "operations":
+            self.apply_operations(record["specs"])
+        elif op == "undo":
+            if self.undo() is None:
+                raise ValueError("Nothing to undo")
+        else:
+            super()._replay(record)
+
+    def _push_undo(self, description: str, restore: Callable[[], None]) -> None:
+        """Record how to revert a schema operation."""
+        self._filter_cache.clear()
+        self._undo_stack.append((description, restore))
+
+    def apply_filter(self, text: str) -> Optional[np.ndarray]:
+        """Filter rows with an expression evaluated by Arrow compute.
+
+        The result is a selection vector of row positions; the DataFrame is
+        never copied. Results are cached per expression, and a filter that
+        only adds ``and`` terms to a cached one is evaluated on the cached
+        rows instead of the whole table.
+
+        Args:
+            text: Expression such as ``status == "FAILED" and len(items) > 3``;
+                an empty string clears the filter
+
+        Returns:
+            Sorted array of selected row positions, or None when cleared
+
+        Raises:
+            FilterExpressionError: If the expression is invalid
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        if not text.strip():
+            self.clear_filter()
+            return None
+
+        conjuncts = split_conjuncts(text)
+        key = conjunct_key(conjuncts)
+        selection = self._filter_cache.get(key)
+
+        if selection is None:
+            # Narrow the longest cached prefix of the conjunction, if any
+            base, start = None, 0
+            for length in range(len(conjuncts) - 1, 0, -1):
+                if key[:length] in self._filter_cache:
+                    base, start = self._filter_cache[key[:length]], length
+                    break
+
+            compiled = compile_conjuncts(conjuncts[start:], self.original_schema)
+            table = self._filter_table(sorted(compiled.columns), base)
+            try:
+                filtered = table.filter(compiled.expression)
+            except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError,
+                    pyarrow.lib.ArrowTypeError) as e:
+                raise FilterExpressionError(f"Cannot evaluate filter: {str(e)}")
+            selection = filtered.column(ROW_ID_COLUMN).to_numpy()
+            self._filter_cache[key] = selection
+
+        self.selection = selection
+        self.filter_text = text
+        return selection
+
+    def clear_filter(self) -> None:
+        """Remove the active filter so every row is selected."""
+        super().clear_filter()
+        self._filter_cache.clear()
+
+    def _filter_table(self, columns: List[str], rows: Optional[np.ndarray]) -> pyarrow.Table:
+        """Build a table of just the referenced columns plus row positions."""
+        arrays = [self._current_column(column) for column in columns]
+        if rows is None:
+            row_ids = pyarrow.array(np.arange(len(self.df), dtype=np.int64))
+        else:
+            arrays = [array.take(rows) for array in arrays]
+            row_ids = pyarrow.array(rows, type=pyarrow.int64())
+        return pyarrow.Table.from_arrays(arrays + [row_ids], names=columns + [ROW_ID_COLUMN])
+
+    def _require_column(self, column_name: str) -> None:
+        """Raise ValueError unless data is loaded and contains the column."""
+        if self.df is None:
+            raise ValueError("No data loaded")
+        if column_name not in self.df.columns:
+            raise ValueError(f"Column '{column_name}' does not exist")
+
+    def _sync_schema(self) -> None:
+        """Refresh the schema from the Arrow table, keeping the file metadata."""
+        self.original_schema = self.table.schema
+        if self.original_metadata:
+            self.original_schema = self.original_schema.with_metadata(self.original_metadata)
+
+    def _current_column(self, column_name: str) -> pyarrow.ChunkedArray:
+        """Get an up-to-date Arrow column, converting it from pandas if it was edited."""
+        if column_name in self.dirty_columns:
+            field = self.table.schema.field(column_name)
+            converted = pyarrow.Table.from_pandas(
+                self.df[[column_name]],
+                schema=pyarrow.schema([field]),
+                preserve_index=False
+            )
+            position = self.table.schema.get_field_index(column_name)
+            self.table = self.table.set_column(position, field, converted.column(0))
+            self.dirty_columns.discard(column_name)
+        return self.table.column(column_name)
+
+    def _column_to_pandas(self, column_name: str) -> pd.Series:
+        """Convert a single Arrow column to pandas the same way loading does."""
+        column = self.table.select([column_name])
+        series = self._convert_to_pandas(column)[column_name]
+        series.index = self.df.index
+        return series
+
+    def _replace_column(self, position: int, field: pyarrow.Field,
+                        column: pyarrow.ChunkedArray) -> None:
+        """Swap a column in the Arrow table, leaving the others untouched."""
+        self.table = self.table.set_column(position, field, column)
+        self.dirty_columns.discard(field.name)
+        self._df_bytes.pop(field.name, None)
+        self._sync_schema()
+        self._reindex_column(field.name)
+
+    def _remove_column(self, column_name: str) -> None:
+        """Remove a column from the table, DataFrame and dirty flags."""
+        self.table = self.table.drop_columns([column_name])
+        del self.df[column_name]
+        self.dirty_columns.discard(column_name)
+        self._sync_schema()
+        self._change_search_index(lambda index: index.columns.pop(column_name, None))
+
+    def _rename(self, column_name: str, new_name: str) -> None:
+        """Rename a column in the table, DataFrame and dirty flags."""
+        self.table = self.table.rename_columns(
+            [new_name if name == column_name else name for name in self.table.column_names]
+        )
+        self.df.rename(columns={column_name: new_name}, inplace=True)
+        if column_name in self._df_bytes:
+            self._df_bytes[new_name] = self._df_bytes.pop(column_name)
+        if column_name in self.dirty_columns:
+            self.dirty_columns.discard(column_name)
+            self.dirty_columns.add(new_name)
+        self._sync_schema()
+
+        def rename(index):
+            if column_name in index.columns:
+                index.columns[new_name] = index.columns.pop(column_name)
+
+        self._change_search_index(rename)
+
+    def _reindex_column(self, column_name: str) -> None:
+        """Rebuild the search index entry of a column whose Arrow data was replaced."""
+        if not self._search_index_wanted:
+            return
+        if is_indexable(self.table.schema.field(column_name).type):
+            column = self._current_column(column_name)  # Immutable, safe to index on the build thread
+            self._change_search_index(
+                lambda index: index.columns.__setitem__(column_name, ColumnIndex.build(column))
+            )
+        else:
+            self._change_search_index(lambda index: index.columns.pop(column_name, None))
+
+    def _index_source(self) -> Callable[[], pyarrow.Table]:
+        """Snapshot the edited data; building the index does not touch the DataFrame."""
+        table = self._create_table()
+        return lambda: table
+
+    def prepare_profile(self, column_name: str) -> Callable[..., ColumnProfile]:
+        """Snapshot a column for sketch-based profiling.
+
+        Must be called on the thread that edits the data. The returned
+        profiler can run on a background thread; it sketches zero-copy row
+        blocks of the snapshot in parallel, using constant memory per column.
+
+        Args:
+            column_name: Name of the column to profile
+
+        Returns:
+            Callable taking an optional progress callback and returning the ColumnProfile
+        """
+        self._require_column(column_name)
+        column = self._current_column(column_name)
 
-        # Update schema if needed
-        if self.original_schema is not None:
-            import pyarrow as pa
-            from src.utils.type_utils import get_pyarrow_type
+        def profile(progress: Optional[Callable[[int, int], None]] = None) -> ColumnProfile:
+            return profile_array(column_name, column, progress=progress)
 
-            # Get PyArrow type for the new column
-            pa_type = get_pyarrow_type(data_type)
+        return profile
 
-            # Create new field
-            new_field = pa.field(column_name, pa_type)
+    def prepare_export(self, columns: Optional[List[str]] = None,
+                       filtered: bool = True) -> Callable[..., ExportResult]:
+        """Snapshot the current data for export to another format.
 
-            # Create new schema with the additional field
-            fields = list(self.original_schema)
-            fields.append(new_field)
+        Must be called on the thread that edits the data. The returned
+        exporter can run on a background thread; it streams blocks of rows
+        from the snapshot to the writer, so only one block is copied at a time.
+
+        Args:
+            columns: Columns to export, in order; all columns when None
+            filtered: Export only the rows selected by the active filter
 
-            # Update original schema
-            self.original_schema = pa.schema(fields)
+        Returns:
+            Callable taking (destination, format=None, progress=None) and
+            returning an ExportResult; the format is inferred from the
+            destination's extension when None
+        """
+        if self.df is None:
+            raise ValueError("No data loaded")
+        for name in columns or []:
+            self._require_column(name)
+
+        table = self._create_table()
+        if columns:
+            table = table.select(columns)
+        rows = self.selection if filtered else None
+        total = table.num_rows if rows is None else len(rows)
+
+        def export(destination: str, format: Optional[str] = None,
+                   progress: Optional[Callable[[int, int], None]] = None) -> ExportResult:
+            def batches():
+                for start in range(0, total, EXPORT_BLOCK_ROWS):
+                    if rows is None:
+                        block = table.slice(start, EXPORT_BLOCK_ROWS)
+                    else:
+                        block = table.take(pyarrow.array(rows[start:start + EXPORT_BLOCK_ROWS]))
+                    yield from block.to_batches()
+                    if progress is not None:
+                        progress(min(start + EXPORT_BLOCK_ROWS, total), total)
+
+            return write_batches(destination, table.schema, batches(), format)
+
+        return export
+
+    def _table_slice(self, start: int, length: int, columns: List[str]) -> pyarrow.Table:
+        """Get current data for a row range; clean columns are zero-copy slices."""
+        arrays = []
+        for name in columns:
+            if name in self.dirty_columns:
+                field = self.table.schema.field(name)
+                arrays.append(pyarrow.Table.from_pandas(
+                    self.df[[name]].iloc[start:start + length],
+                    schema=pyarrow.schema([field]),
+                    preserve_index=False
+                ).column(0))
+            else:
+                arrays.append(self.table.column(name).slice(start, length))
+        return pyarrow.Table.from_arrays(arrays, names=columns)
 
-            # Update metadata if it exists
-            if hasattr(self, 'original_metadata') and self.original_metadata:
-                self.original_schema = self.original_schema.with_metadata(self.original_metadata)
+    def _reorder(self, order: List[str]) -> None:
+        """Put the table and DataFrame columns in the given order."""
+        self.table = self.table.select(order)
+        self.df = self.df.reindex(columns=order, copy=False)
+        self._sync_schema()
 
     def load_file(self, filename: str) -> bool:
         """Load and parse an ORC file.
@@ -78,15 +520,13 @@ class ORCDataManager:
             self.current_file = filename
 
             # Open and read ORC file
-            orc_file = orc.ORCFile(filename)
-            table = orc_file.read()
+            with timing.span("read"):
+                orc_file = orc.ORCFile(filename)
+                table = orc_file.read()
 
             # Store schema information
-            self.original_schema = table.schema
             self.original_metadata = table.schema.metadata if table.schema.metadata else {}
-
-            # Convert to pandas DataFrame
-            self.df = self._convert_to_pandas(table)
+            self._set_table(table)
 
             return True
 
@@ -99,57 +539,166 @@ class ORCDataManager:
         except Exception as e:
             raise ORCLoadError(f"Failed to load file: {str(e)}")
 
-    def _convert_to_pandas(self, table: pyarrow.Table) -> pd.DataFrame:
-        """Convert PyArrow table to pandas DataFrame with proper type conversions.
+    def _set_table(self, table: pyarrow.Table) -> None:
+        """Replace all data with a table, resetting every derived state."""
+        self.original_schema = table.schema
+        if self.original_metadata:
+            self.original_schema = self.original_schema.with_metadata(self.original_metadata)
+
+        # Drop the previous data first, and convert from a memory-mapped copy
+        # when the DataFrame would not fit in the budget next to the table,
+        # which is already counted in the Arrow pool
+        self.df = None
+        self.table = None
+        self._df_bytes = {}
+        if not self.memory.fits(estimate_dataframe_bytes(table)):
+            with timing.span("spill"):
+                table = self.memory.spill_table(table)
+
+        # Keep the Arrow columns so unmodified data can be written back as-is
+        self.table = table
+        self.dirty_columns = set()
+        self._undo_stack = []
+        self._reset_derived_state()
+
+        # Convert to pandas DataFrame
+        with timing.span("convert"):
+            self.df = self._convert_to_pandas(table)
+        categorical = [column for column in self.df.columns
+                       if isinstance(self.df[column].dtype, pd.CategoricalDtype)]
+        if categorical:
+            logger.info("Loaded %s as categoricals, saving %d bytes",
+                        ", ".join(categorical), self.categorical_savings())
+        self.memory.enforce()
+
+    def release_display_caches(self) -> None:
+        """Drop the selections of earlier filters; the active one is kept."""
+        self._filter_cache.clear()
+
+    def memory_consumers(self) -> List[Consumer]:
+        """What this manager can give back when memory runs short.
+
+        The filter cache is dropped first, then the search index (rebuilt on
+        the next find), then the Arrow table is spilled to a memory-mapped
+        file; it is only read again for unmodified columns on save.
+        """
+        return [
+            Consumer('filter cache', lambda: sum(rows.nbytes for rows in self._filter_cache.values()),
+                     self._filter_cache.clear, priority=0),
+            Consumer('search index',
+                     lambda: self.search_index.nbytes if self.search_index is not None else 0,
+                     self.release_search_index, priority=10),
+            Consumer('Arrow table', self._resident_table_bytes, self.spill_table,
+                     priority=20, in_arrow_pool=True),
+        ]
+
+    def dataframe_bytes(self) -> int:
+        """Deep memory usage of the DataFrame, cached per unmodified column."""
+        if self.df is None:
+            return 0
+        columns = set(self.df.columns)
+        for column in list(self._df_bytes):
+            if column not in columns:
+                del self._df_bytes[column]
+        for column in columns - self._df_bytes.keys():
+            series = self.df[column]
+            saved = categorical_savings(series) if isinstance(series.dtype, pd.CategoricalDtype) else 0
+            self._df_bytes[column] = (int(series.memory_usage(deep=True, index=False)), saved)
+        return sum(size for size, _ in self._df_bytes.values()) + int(self.df.index.memory_usage())
+
+    def categorical_savings(self) -> int:
+        """Bytes the categorical columns save over object columns of strings."""
+        self.dataframe_bytes()
+        return sum(saved for _, saved in self._df_bytes.values())
+
+    def _resident_table_bytes(self) -> int:
+        if self.table is None or self.memory.is_spilled(self.table):
+            return 0
+        return self.table.get_total_buffer_size()
+
+    def spill_table(self) -> None:
+        """Move the Arrow table out of the memory pool into a memory-mapped file."""
+        if self.table is None or self.memory.is_spilled(self.table):
+            return
+        spilled = self.memory.spill_table(self.table)
+        if self._stats_source is self.table:
+            self._stats_source = spilled
+        self.table = spilled
+
+    def apply_operations(self, operations: Union[Pipeline, List[Dict[str, Any]]]) -> None:
+        """Apply an operations script to the loaded data.
+
+        The same operations the CLI streams over files are run on the whole
+        table at once. Row positions can change (``filter``), so undo history,
+        the search index, filters and statistics are reset. The script is
+        journaled, so cell edits journaled after it replay on the rows it
+        produced.
 
         Args:
-            table: PyArrow table to convert
+            operations: A Pipeline, or a list of operation dictionaries as
+                found in an operations script
 
-        Returns:
-            pandas DataFrame with converted data
+        Raises:
+            OperationError: If the operations are invalid for the data
         """
-        try:
-            # First convert to pandas without type mapping
-            df = table.to_pandas()
-
-            # Apply type conversions for specific fields
-            for field in table.schema:
-                field_type = str(field.type)
-                if field_type in ['timestamp[ms]', 'int64']:
-                    if field.name in df.columns:
-                        # Fill NaN values with -1 before converting to int64
-                        df[field.name] = df[field.name].fillna(-1).astype('int64')
-
-                elif field_type.startswith('list<'):
-                    if field.name in df.columns:
-                        # Ensure lists are properly converted from numpy arrays
-                        df[field.name] = df[field.name].apply(
-                            lambda x: x.tolist() if isinstance(x, np.ndarray) else x
-                        )
-
-                elif field_type.startswith('struct<'):
-                    if field.name in df.columns:
-                        # Ensure structs are properly converted to dictionaries
-                        df[field.name] = df[field.name].apply(
-                            lambda x: dict(x) if x is not None else None
-                        )
-
-            return df
+        if self.df is None:
+            raise ValueError("No data loaded")
+        pipeline = operations if isinstance(operations, Pipeline) else Pipeline.from_specs(operations)
+        table = self._create_table()
+        pipeline.bind(table.schema)
+        self._set_table(pipeline.apply(table))
+        self._stats_source = self.table
+        if pipeline.specs is not None:
+            self._journal({"op": "operations", "specs": pipeline.specs})
+        elif self.journal is not None:
+            # Without the script the journaled rows no longer match the source
+            logger.warning("Operations built in code are not journaled; dropping the edit journal")
+            self.journal.discard()
+            self.journal = None
 
-        except Exception as e:
-            raise ORCLoadError(f"Failed to convert data: {str(e)}")
+    def _convert_to_pandas(self, table: pyarrow.Table) -> pd.DataFrame:
+        """Convert PyArrow table to pandas DataFrame with proper type conversions.
+
+        Low-cardinality string columns become categoricals: one copy of each
+        distinct string plus small integer codes instead of an object per row.
+        """
+        return convert_to_pandas(table, categorical_columns(table))
 
     def _create_table(self) -> pyarrow.Table:
-        """Create a PyArrow table from the current DataFrame using the original schema."""
+        """Create a PyArrow table from the current DataFrame using the original schema.
+
+        Columns that were not modified since loading reuse the original Arrow
+        ``ChunkedArray`` without copying; only dirty or added columns are
+        converted from pandas.
+        """
         try:
-            if hasattr(self, 'original_schema'):
-                # Create table with original schema
-                table = pyarrow.Table.from_pandas(
-                    self.df,
-                    schema=self.original_schema
-                )
+            if self.original_schema is not None:
+                dirty_fields = [
+                    field for field in self.original_schema
+                    if field.name in self.dirty_columns
+                    or self.table is None
+                    or field.name not in self.table.column_names
+                ]
+                converted = None
+                if dirty_fields:
+                    converted = pyarrow.Table.from_pandas(
+                        self.df[[field.name for field in dirty_fields]],
+                        schema=pyarrow.schema(dirty_fields),
+                        preserve_index=False
+                    )
+
+                # Splice original and re-converted columns in schema order
+                columns = []
+                for field in self.original_schema:
+                    if converted is not None and field.name in converted.column_names:
+                        columns.append(converted.column(field.name))
+                    else:
+                        columns.append(self.table.column(field.name))
+
+                table = pyarrow.Table.from_arrays(columns, schema=self.original_schema)
+
                 # Set metadata if it exists
-                if hasattr(self, 'original_metadata'):
+                if self.original_metadata:
                     table = table.replace_schema_metadata(self.original_metadata)
             else:
                 # Infer schema from data if no original schema exists
@@ -172,6 +721,38 @@ class ORCDataManager:
         except Exception as e:
             raise ORCSaveError(f"Failed to write file: {str(e)}")
 
+    def save_file(self, filename: str) -> ValidationResult:
+        """Write the current data to an ORC file and validate the result.
+
+        Args:
+            filename: Path to save the ORC file
+
+        Returns:
+            ValidationResult containing any schema differences
+
+        Raises:
+            ORCSaveError: If building, writing or validating the table fails
+        """
+        if self.df is None:
+            raise ORCSaveError("No data to save")
+
+        with timing.span("build table"):
+            table = self._create_table()
+        with timing.span("write"):
+            self._write_table(filename, table)
+
+        # The written table now reflects every edit, so nothing is dirty
+        # anymore; the saved file is the one further edits are journaled for,
+        # and schema operations can no longer be undone past it
+        self.table = table
+        self.dirty_columns = set()
+        self.current_file = filename
+        self._undo_stack = []
+        self._restart_journal()
+
+        with timing.span("validate"):
+            return self._validate_saved_file(filename)
+
     def _validate_saved_file(self, filename: str) -> ValidationResult:
         """Validate the saved file by comparing schemas.
 
@@ -186,7 +767,7 @@ class ORCDataManager:
             saved_table = orc_file.read()
             saved_schema = saved_table.schema
 
-            if hasattr(self, 'original_schema'):
+            if self.original_schema is not None:
                 from src.utils.schema_validator import SchemaValidator
                 differences = SchemaValidator.compare_schemas(
                     self.original_schema,
@@ -223,6 +804,29 @@ class ORCDataManager:
                 return False
         return True
 
+    def display_rows(self, rows: Sequence[int], columns: List[str]) -> List[List[str]]:
+        """Render rows as the strings shown in the table view.
+
+        The values are already in pandas, so long lists are cut by slicing
+        them (numpy slices are views) before they are joined.
+
+        Args:
+            rows: Row positions to render
+            columns: Columns to render, in order
+
+        Returns:
+            One list of cell strings per row
+        """
+        if self.df is None:
+            return []
+        return format_rows(self.df, rows, columns)
+
+    def row_frame(self, row_idx: int, columns: List[str]) -> pd.DataFrame:
+        """Get one row as a single-row DataFrame, as the edit dialog expects."""
+        if self.df is None or row_idx >= len(self.df):
+            raise ValueError("Invalid row index")
+        return self.df.iloc[[row_idx]][columns].reset_index(drop=True)
+
     def get_row_display_values(self, row_idx: int) -> Dict[str, str]:
         """Get the display values for a row.
 
@@ -235,24 +839,8 @@ class ORCDataManager:
         if self.df is None or row_idx >= len(self.df):
             raise ValueError("Invalid row index")
 
-        row = self.df.iloc[row_idx]
-        display_values = {}
-
-        for col in self.df.columns:
-            value = row[col]
-            if isinstance(value, (np.ndarray, list)):
-                if isinstance(value, np.ndarray):
-                    value = f"[{','.join(map(str, value))}]" if value.size > 0 else '[]'
-                else:  # list
-                    value = f"[{','.join(map(str, value))}]" if value else '[]'
-            elif pd.api.types.is_integer_dtype(self.df[col].dtype):
-                try:
-                    value = 0 if pd.isna(value) else int(value)
-                except (ValueError, TypeError):
-                    value = 0
-            display_values[col] = str(value)
-
-        return display_values
+        columns = list(self.df.columns)
+        return dict(zip(columns, format_rows(self.df, [row_idx], columns)[0]))
 
     def update_row(self, row_idx: int, new_values: Dict[str, Any]) -> None:
         """Update a row with new values.
@@ -273,6 +861,7 @@ class ORCDataManager:
 
             # Update the row using loc with a dictionary
             for col, value in update_dict.items():
+                self.mark_dirty(col)
                 if isinstance(value, list):
                     # Handle lists (including lists of dictionaries)
                     if isinstance(self.df.loc[row_idx, col], np.ndarray):
@@ -282,24 +871,62 @@ class ORCDataManager:
                     self.df.at[row_idx, col] = value
                 else:
                     # Handle scalar values
+                    self._add_category(col, value)
                     self.df.at[row_idx, col] = value
+                self._update_search_index(row_idx, col, value)
+                if self.journal is not None:
+                    self._journal_cell(row_idx, col, self.cell(row_idx, col))
+            self._filter_cache.clear()
+            self._stats_dirty_rows.add(row_idx)
 
         except Exception as e:
-            print(f"Row update error details:")
-            print(f"Row index: {row_idx}")
-            print(f"New values: {new_values}")
-            print(f"DataFrame columns: {self.df.columns.tolist()}")
+            logger.debug("Row update failed for row %d with values %r", row_idx, new_values,
+                         exc_info=True)
             raise ValueError(f"Failed to update row: {str(e)}")
 
-    def get_column_names(self) -> List[str]:
-        """Get list of non-empty column names.
+    def cell(self, row_idx: int, column: str) -> pyarrow.Array:
+        """Get the current value of one cell as a one-element Arrow array.
 
-        Returns:
-            List of column names excluding empty columns
+        Clean columns are sliced from the loaded Arrow data; only an edited
+        column's single value is converted back from pandas.
         """
-        if self.df is None:
-            return []
-        return [col for col in self.df.columns if not self.is_empty_column(col)]
+        self._require_column(column)
+        if not 0 <= row_idx < len(self.df):
+            raise ValueError("Invalid row index")
+        if column in self.dirty_columns:
+            field = self.table.schema.field(column)
+            return pyarrow.Array.from_pandas(self.df[column].iloc[row_idx:row_idx + 1], type=field.type)
+        return self.table.column(column).slice(row_idx, 1).combine_chunks()
+
+    def _column_array(self, column: str, rows: np.ndarray) -> pyarrow.Array:
+        """Get the current values of one column at some row positions."""
+        self._require_column(column)
+        if column in self.dirty_columns:
+            field = self.table.schema.field(column)
+            return pyarrow.Table.from_pandas(
+                self.df[[column]].iloc[rows],
+                schema=pyarrow.schema([field]),
+                preserve_index=False
+            ).column(0).combine_chunks()
+        return self.table.column(column).take(pyarrow.array(rows)).combine_chunks()
+
+    def _set_cell(self, row_idx: int, column: str, array: pyarrow.Array) -> None:
+        """Store a cell converted the same way loading converts it."""
+        value = self._convert_to_pandas(pyarrow.Table.from_arrays([array], names=[column]))[column].iloc[0]
+        self.mark_dirty(column)
+        self._add_category(column, value)
+        self.df.at[row_idx, column] = value
+        self._update_search_index(row_idx, column, value)
+        self._filter_cache.clear()
+        self._stats_dirty_rows.add(row_idx)
+        self._journal_cell(row_idx, column, array)
+
+    def _add_category(self, column: str, value: Any) -> None:
+        """Make room for a new value in a categorical column."""
+        series = self.df[column]
+        if (isinstance(series.dtype, pd.CategoricalDtype) and not pd.isna(value)
+                and value not in series.cat.categories):
+            self.df[column] = series.cat.add_categories([value])
 
     def get_value_type(self, column: str) -> Optional[type]:
         """Get the type of values in a column.
@@ -0,0 +1,243 @@
+"""Streaming export of ORC data to Parquet, CSV, JSON Lines and Arrow IPC.
+
+Record batches go straight from the ORC reader (one stripe at a time) or
+from the edited in-memory table (one block of rows at a time) into the
+target writer, so only a batch is ever materialized. Nested types are kept
+as-is for Parquet, Arrow IPC and JSON Lines; CSV has no nested types, so
+list, struct and map cells are written as JSON text. JSON output is strict
+JSON, so NaN and infinite floats are written as null.
+"""
+import base64
+import datetime
+import decimal
+import json
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Optional
+
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+
+from src.exceptions.orc_exceptions import FilterExpressionError
+from src.utils.filter_expression import compile_filter
+
+FORMATS = {
+    '.parquet': 'parquet',
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.json': 'ndjson',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+
+
+@dataclass
+class ExportResult:
+    destination: str
+    format: str
+    rows: int
+    seconds: float
+
+
+def format_for(filename: str, format: Optional[str] = None) -> str:
+    """Resolve the export format from an explicit name or the file extension.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if format:
+        format = format.lower()
+        if format not in set(FORMATS.values()):
+            raise ValueError(f"Unknown export format '{format}', "
+                             f"expected one of: {', '.join(sorted(set(FORMATS.values())))}")
+        return format
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot tell the export format from '{filename}', "
+                         f"use one of: {', '.join(FORMATS)}")
+    return FORMATS[extension]
+
+
+def json_default(value: Any) -> Any:
+    """Serialize the Python values Arrow produces that json cannot."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return str(value)
+
+
+def _finite(value: Any) -> Any:
+    """Replace NaN and infinities, which JSON cannot represent, by None in a nested value."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def _finite_array(column: pyarrow.Array) -> pyarrow.Array:
+    """Null out NaN and infinities in a floating point column."""
+    if not pyarrow.types.is_floating(column.type):
+        return column
+    return pc.if_else(pc.is_finite(column), column, pyarrow.scalar(None, column.type))
+
+
+def _to_json(value: Any) -> str:
+    """Serialize a value as strict JSON; non-finite floats become null."""
+    return json.dumps(value, default=json_default, allow_nan=False)
+
+
+def _to_json_text(column: pyarrow.Array) -> pyarrow.Array:
+    """Render nested cells as JSON strings, keeping nulls."""
+    return pyarrow.array(
+        [None if value is None else _to_json(_finite(value)) for value in column.to_pylist()],
+        type=pyarrow.string()
+    )
+
+
+def _csv_schema(schema: pyarrow.Schema) -> pyarrow.Schema:
+    return pyarrow.schema([
+        pyarrow.field(field.name, pyarrow.string()) if pyarrow.types.is_nested(field.type) else field
+        for field in schema
+    ])
+
+
+class _Writer:
+    """Common interface over the per-format writers."""
+
+    def __init__(self, destination: str, format: str, schema: pyarrow.Schema):
+        self.format = format
+        self.schema = schema
+        self._file = None
+        self._writer = None
+
+        if format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(destination, schema)
+        elif format == 'arrow':
+            self._writer = pyarrow.ipc.new_file(destination, schema)
+        elif format == 'csv':
+            import pyarrow.csv as csv
+            self._writer = csv.CSVWriter(destination, _csv_schema(schema))
+        else:
+            self._file = open(destination, 'w', encoding='utf-8')
+
+    def write(self, batch: pyarrow.RecordBatch) -> None:
+        if self.format in ('parquet', 'arrow'):
+            self._writer.write_batch(batch)
+        elif self.format == 'csv':
+            arrays = [
+                _to_json_text(column) if pyarrow.types.is_nested(column.type) else column
+                for column in batch.columns
+            ]
+            self._writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=_csv_schema(self.schema)))
+        else:
+            # Scalar float columns are cleaned vectorized, nested values per row
+            batch = pyarrow.RecordBatch.from_arrays([_finite_array(column) for column in batch.columns],
+                                                    schema=batch.schema)
+            nested = [field.name for field in batch.schema if pyarrow.types.is_nested(field.type)]
+            rows = batch.to_pylist()
+            for row in rows:
+                for name in nested:
+                    row[name] = _finite(row[name])
+            self._file.writelines(_to_json(row) + '\n' for row in rows)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def write_batches(destination: str, schema: pyarrow.Schema,
+                  batches: Iterable[pyarrow.RecordBatch], format: Optional[str] = None) -> ExportResult:
+    """Write record batches to a file in the given (or inferred) format.
+
+    The destination is removed again if writing fails part way.
+
+    Args:
+        destination: Path of the file to write
+        schema: Schema of the batches
+        batches: Record batches, consumed one at a time
+        format: 'parquet', 'csv', 'ndjson' or 'arrow'; inferred from the
+            extension when None
+
+    Returns:
+        ExportResult with the row count and timing
+    """
+    started = time.perf_counter()
+    format = format_for(destination, format)
+    rows = 0
+    writer = _Writer(destination, format, schema)
+    try:
+        for batch in batches:
+            if batch.num_rows:
+                writer.write(batch)
+                rows += batch.num_rows
+    except BaseException:
+        writer.close()
+        os.unlink(destination)
+        raise
+    writer.close()
+    return ExportResult(destination, format, rows, time.perf_counter() - started)
+
+
+def export_file(source: str, destination: str, format: Optional[str] = None,
+                columns: Optional[List[str]] = None, where: Optional[str] = None,
+                progress: Optional[Callable[[int, int], None]] = None) -> ExportResult:
+    """Export an ORC file without loading it, one stripe at a time.
+
+    Args:
+        source: Path of the ORC file
+        destination: Path of the exported file
+        format: Target format; inferred from the extension when None
+        columns: Columns to export, in order; all columns when None
+        where: Optional filter expression selecting the rows to export
+        progress: Optional callback receiving (stripes done, total stripes)
+
+    Returns:
+        ExportResult with the row count and timing
+
+    Raises:
+        ValueError: If a column or the format is unknown
+        FilterExpressionError: If the filter expression is invalid
+    """
+    orc_file = orc.ORCFile(source)
+    schema = orc_file.schema
+    columns = list(columns or schema.names)
+    missing = [name for name in columns if name not in schema.names]
+    if missing:
+        raise ValueError(f"Unknown columns: {', '.join(missing)}")
+
+    compiled = compile_filter(where, schema) if where else None
+    read_columns = columns
+    if compiled is not None:
+        read_columns = columns + sorted(compiled.columns - set(columns))
+    output_schema = pyarrow.schema([schema.field(name) for name in columns])
+
+    def batches():
+        for index in range(orc_file.nstripes):
+            table = pyarrow.Table.from_batches([orc_file.read_stripe(index, columns=read_columns)])
+            if compiled is not None:
+                try:
+                    table = table.filter(compiled.expression)
+                except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError,
+                        pyarrow.lib.ArrowTypeError) as e:
+                    raise FilterExpressionError(f"Cannot evaluate filter: {str(e)}")
+            yield from table.select(columns).to_batches()
+            if progress is not None:
+                progress(index + 1, orc_file.nstripes)
+
+    return write_batches(destination, output_schema, batches(), format)
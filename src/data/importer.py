@@ -0,0 +1,297 @@
+"""Streaming import of CSV, JSON Lines and Parquet files into ORC.
+
+Input is read in blocks (``pyarrow.csv.open_csv``, JSON Lines split at line
+boundaries and parsed one block at a time, ``ParquetFile.iter_batches``),
+each block is coerced to the target schema and appended to an ``ORCWriter``,
+so imports never need to fit in memory. The target schema is taken from an
+existing ORC file or inferred from the input: the first block for CSV and
+Parquet (whose columns are fixed up front), the first ``JSON_SAMPLE_BYTES``
+for JSON Lines, whose keys may vary from line to line.
+"""
+import io
+import itertools
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+
+from src.exceptions.orc_exceptions import ORCImportError
+from src.utils.files import replacing
+from src.utils.memory import format_bytes
+
+BLOCK_SIZE = 16 << 20
+# JSON Lines input read to infer the schema, as whole blocks
+JSON_SAMPLE_BYTES = 64 << 20
+
+FORMATS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.json': 'ndjson',
+    '.parquet': 'parquet',
+}
+
+
+@dataclass
+class ImportResult:
+    source: str
+    destination: str
+    format: str
+    rows: int
+    batches: int
+    seconds: float
+    schema: pyarrow.Schema
+    mismatches: List[str] = field(default_factory=list)
+
+
+def format_for(filename: str, format: Optional[str] = None) -> str:
+    """Resolve the input format from an explicit name or the file extension."""
+    if format:
+        if format not in set(FORMATS.values()):
+            raise ORCImportError(f"Unknown import format '{format}', "
+                                 f"expected one of: {', '.join(sorted(set(FORMATS.values())))}")
+        return format
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in FORMATS:
+        raise ORCImportError(f"Cannot tell the format of '{filename}', use one of: {', '.join(FORMATS)}")
+    return FORMATS[extension]
+
+
+def _without_nulls(schema: pyarrow.Schema) -> pyarrow.Schema:
+    """Replace null-typed fields (all-null in the sample) with strings."""
+    return pyarrow.schema([
+        field.with_type(pyarrow.string()) if pyarrow.types.is_null(field.type) else field
+        for field in schema
+    ])
+
+
+def _csv_batches(source: str, target: Optional[pyarrow.Schema],
+                 block_size: int) -> Tuple[pyarrow.Schema, Iterator[pyarrow.RecordBatch]]:
+    import pyarrow.csv as csv
+
+    column_types = None
+    if target is not None:
+        # Nested cells are JSON text in CSV; they are parsed during coercion
+        column_types = {
+            field.name: pyarrow.string() if pyarrow.types.is_nested(field.type) else field.type
+            for field in target
+        }
+    reader = csv.open_csv(
+        source,
+        read_options=csv.ReadOptions(block_size=block_size),
+        convert_options=csv.ConvertOptions(column_types=column_types),
+    )
+    return reader.schema, iter(reader)
+
+
+def _json_blocks(source: str, block_size: int) -> Iterator[bytes]:
+    """Yield chunks of whole lines of roughly block_size bytes."""
+    with open(source, 'rb') as f:
+        remainder = b''
+        while True:
+            chunk = f.read(block_size)
+            if not chunk:
+                break
+            chunk = remainder + chunk
+            cut = chunk.rfind(b'\n') + 1
+            if cut == 0:
+                remainder = chunk
+                continue
+            remainder = chunk[cut:]
+            yield chunk[:cut]
+        if remainder.strip():
+            yield remainder
+
+
+def _ndjson_batches(source: str, target: Optional[pyarrow.Schema],
+                    block_size: int) -> Tuple[pyarrow.Schema, Iterator[pyarrow.RecordBatch]]:
+    import pyarrow.json as pajson
+
+    blocks = _json_blocks(source, block_size)
+
+    def parse(block: bytes, schema: Optional[pyarrow.Schema], unexpected: str) -> pyarrow.Table:
+        parse_options = pajson.ParseOptions(explicit_schema=schema, unexpected_field_behavior=unexpected)
+        return pajson.read_json(io.BytesIO(block),
+                                read_options=pajson.ReadOptions(block_size=max(len(block), 1)),
+                                parse_options=parse_options)
+
+    # Infer from several blocks so keys that are missing or null early on
+    # still get their types; the sample is bounded, later blocks must agree
+    sample, schemas, sampled = [], [], 0
+    if target is None:
+        for block in blocks:
+            sample.append(block)
+            if block.strip():
+                schemas.append(parse(block, None, 'infer').schema)
+            sampled += len(block)
+            if sampled >= JSON_SAMPLE_BYTES:
+                break
+        try:
+            schema = _without_nulls(pyarrow.unify_schemas(schemas, promote_options='permissive')
+                                    if schemas else pyarrow.schema([]))
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError) as e:
+            raise ORCImportError(f"Inconsistent types in {source}: {str(e)}")
+    else:
+        schema = target
+
+    def check(table: pyarrow.Table) -> pyarrow.Table:
+        """Fail on keys the schema was inferred without, naming them."""
+        for table_field in table.schema:
+            index = schema.get_field_index(table_field.name)
+            if index < 0 and pyarrow.types.is_null(table_field.type):
+                continue  # only nulls so far, nothing is lost by dropping it
+            if index < 0 or not schema.field(index).type.equals(table_field.type):
+                raise ORCImportError(
+                    f"Column '{table_field.name}' of {source} has values of type {table_field.type} "
+                    f"not seen in the first {format_bytes(sampled)} the schema was inferred from; "
+                    f"import with a target schema that includes it")
+        return table
+
+    def batches():
+        # The sample is parsed again with the merged types
+        for block in itertools.chain(sample, blocks):
+            if not block.strip():
+                continue
+            if target is None:
+                yield from check(parse(block, schema, 'infer')).to_batches()
+            else:
+                yield from parse(block, schema, 'ignore').to_batches()
+
+    return schema, batches()
+
+
+def _parquet_batches(source: str, block_size: int) -> Tuple[pyarrow.Schema, Iterator[pyarrow.RecordBatch]]:
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(source)
+    # Aim for blocks of about block_size bytes, like the other readers
+    metadata = parquet_file.metadata
+    row_bytes = max(1, sum(metadata.row_group(index).total_byte_size
+                           for index in range(metadata.num_row_groups)) // max(metadata.num_rows, 1))
+    batch_size = max(1024, block_size // row_bytes)
+    return parquet_file.schema_arrow, parquet_file.iter_batches(batch_size=batch_size)
+
+
+def _as_coerced(source: pyarrow.Schema, target: pyarrow.Schema) -> pyarrow.Schema:
+    """Source schema with JSON text columns shown as the nested type they parse into."""
+    fields = []
+    for source_field in source:
+        index = target.get_field_index(source_field.name)
+        if (index >= 0 and pyarrow.types.is_nested(target.field(index).type)
+                and pyarrow.types.is_string(source_field.type)):
+            source_field = source_field.with_type(target.field(index).type)
+        fields.append(source_field)
+    return pyarrow.schema(fields)
+
+
+def _describe(difference) -> str:
+    """Word a schema difference from the point of view of an import."""
+    if difference.kind == 'missing':
+        return f"{difference.path} is not in the input and will be null"
+    if difference.kind == 'extra':
+        return f"{difference.path} is not in the target schema and will be dropped"
+    return f"{difference.path} will be converted from {difference.saved} to {difference.original}"
+
+
+def _parse_json_text(column: pyarrow.Array, data_type: pyarrow.DataType) -> pyarrow.Array:
+    """Parse JSON text cells (as written by CSV export) into a nested type."""
+    return pyarrow.array(
+        [None if value is None or value == '' else json.loads(value) for value in column.to_pylist()],
+        type=data_type
+    )
+
+
+def coerce_batch(batch: pyarrow.RecordBatch, target: pyarrow.Schema) -> pyarrow.Table:
+    """Shape a batch to the target schema.
+
+    Columns are cast to the target types (JSON text is parsed for nested
+    types), missing columns are filled with nulls and extra columns dropped.
+
+    Raises:
+        ORCImportError: If a value cannot be converted
+    """
+    arrays = []
+    for target_field in target:
+        index = batch.schema.get_field_index(target_field.name)
+        if index < 0:
+            arrays.append(pyarrow.nulls(batch.num_rows, target_field.type))
+            continue
+        column = batch.column(index)
+        if column.type.equals(target_field.type):
+            arrays.append(column)
+            continue
+        try:
+            if (pyarrow.types.is_nested(target_field.type)
+                    and (pyarrow.types.is_string(column.type) or pyarrow.types.is_large_string(column.type))):
+                arrays.append(_parse_json_text(column, target_field.type))
+            else:
+                arrays.append(pc.cast(column, target_field.type))
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError,
+                pyarrow.lib.ArrowTypeError, ValueError, TypeError) as e:
+            raise ORCImportError(
+                f"Cannot convert column '{target_field.name}' from {column.type} "
+                f"to {target_field.type}: {str(e)}"
+            )
+    return pyarrow.Table.from_arrays(arrays, schema=target)
+
+
+def import_file(source: str, destination: str, format: Optional[str] = None,
+                target_schema: Optional[pyarrow.Schema] = None, block_size: int = BLOCK_SIZE,
+                progress: Optional[Callable[[int], None]] = None) -> ImportResult:
+    """Convert a CSV, JSON Lines or Parquet file to ORC block by block.
+
+    Args:
+        source: Path of the input file
+        destination: Path of the ORC file to write
+        format: 'csv', 'ndjson' or 'parquet'; inferred from the extension when None
+        target_schema: Schema to coerce the data to; inferred from the
+            start of the input when None
+        block_size: Approximate bytes read per block
+        progress: Optional callback receiving the number of rows written so far
+
+    Returns:
+        ImportResult with row counts, timing and schema mismatches
+
+    Raises:
+        ORCImportError: If the input cannot be read or converted
+    """
+    from src.utils.schema_validator import SchemaValidator
+
+    started = time.perf_counter()
+    format = format_for(source, format)
+    try:
+        if format == 'csv':
+            source_schema, batches = _csv_batches(source, target_schema, block_size)
+        elif format == 'ndjson':
+            source_schema, batches = _ndjson_batches(source, target_schema, block_size)
+        else:
+            source_schema, batches = _parquet_batches(source, block_size)
+    except (OSError, pyarrow.lib.ArrowInvalid) as e:
+        raise ORCImportError(f"Cannot read {source}: {str(e)}")
+
+    target = target_schema if target_schema is not None else _without_nulls(source_schema)
+    mismatches = [_describe(difference) for difference in
+                  SchemaValidator.diff_schemas(target, _as_coerced(source_schema, target))]
+
+    rows = count = 0
+    with replacing(destination) as temporary, orc.ORCWriter(temporary) as writer:
+        try:
+            for batch in batches:
+                table = coerce_batch(batch, target)
+                writer.write(table)
+                rows += table.num_rows
+                count += 1
+                if progress is not None:
+                    progress(rows)
+        except pyarrow.lib.ArrowInvalid as e:
+            raise ORCImportError(f"Cannot read {source} after {rows:,} rows: {str(e)}")
+        if count == 0:
+            writer.write(target.empty_table())
+
+    return ImportResult(source, destination, format, rows, count,
+                        time.perf_counter() - started, target, mismatches)
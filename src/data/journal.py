@@ -0,0 +1,173 @@
+"""Append-only journal of the unsaved edits to an open file.
+
+Every edit is appended as one JSON line next to the source file
+(``data.orc`` -> ``data.orc.journal``) and flushed, so it costs one small
+write however large the file is. The first line identifies the source by
+size and modification time; after a crash the records can be replayed on
+top of the unchanged source (they are then written to a new journal, so
+a torn last line is dropped), and saving starts a new, empty journal.
+
+Records look like ``{"op": "cell", "row": 12, "column": "status",
+"value": {"value": "FAILED"}}``. Rows are positions in the source file.
+Values are one-element Arrow arrays: plain integers, floats, booleans and
+strings are stored as JSON, anything else (timestamps, decimals, nested
+values, NaN) as a base64 Arrow IPC stream so it is replayed exactly.
+"""
+import base64
+import json
+import logging
+import math
+import os
+from typing import Any, Dict, List, Optional
+
+import pyarrow
+import pyarrow.ipc
+
+from src.exceptions.orc_exceptions import ORCJournalError
+from src.utils.config import Config
+
+logger = logging.getLogger('orc_editor.data')
+
+JOURNAL_VERSION = 1
+
+
+def _is_plain(data_type: pyarrow.DataType) -> bool:
+    """Whether values of a type survive a trip through JSON unchanged."""
+    return (pyarrow.types.is_integer(data_type) or pyarrow.types.is_floating(data_type)
+            or pyarrow.types.is_boolean(data_type) or pyarrow.types.is_string(data_type)
+            or pyarrow.types.is_large_string(data_type) or pyarrow.types.is_null(data_type))
+
+
+def encode_array(array: pyarrow.Array) -> Dict[str, Any]:
+    """Encode a one-element array for a journal record."""
+    if _is_plain(array.type):
+        value = array[0].as_py()
+        if not isinstance(value, float) or math.isfinite(value):
+            return {"value": value}
+    sink = pyarrow.BufferOutputStream()
+    schema = pyarrow.schema([pyarrow.field("value", array.type)])
+    with pyarrow.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(pyarrow.record_batch([array], schema=schema))
+    return {"arrow": base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")}
+
+
+def decode_array(encoded: Dict[str, Any], data_type: pyarrow.DataType) -> pyarrow.Array:
+    """Decode a value written by ``encode_array`` as a one-element array of a type."""
+    if "arrow" in encoded:
+        reader = pyarrow.ipc.open_stream(base64.b64decode(encoded["arrow"]))
+        array = reader.read_all().column(0).combine_chunks()
+        return array if array.type.equals(data_type) else array.cast(data_type)
+    return pyarrow.array([encoded["value"]], type=data_type)
+
+
+def encode_type(data_type: pyarrow.DataType) -> str:
+    """Encode an Arrow type for a journal record."""
+    schema = pyarrow.schema([pyarrow.field("value", data_type)])
+    return base64.b64encode(schema.serialize().to_pybytes()).decode("ascii")
+
+
+def decode_type(encoded: str) -> pyarrow.DataType:
+    """Decode a type written by ``encode_type``."""
+    return pyarrow.ipc.read_schema(pyarrow.py_buffer(base64.b64decode(encoded))).field(0).type
+
+
+def journal_path(source: str) -> str:
+    """Path of the journal kept for a source file."""
+    return source + Config.JOURNAL_SUFFIX
+
+
+def _source_header(source: str) -> Dict[str, Any]:
+    stat = os.stat(source)
+    return {"journal": JOURNAL_VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_journal(source: str) -> Optional[List[Dict[str, Any]]]:
+    """Read the edits journaled for a source file.
+
+    A last line cut short by a crash is ignored.
+
+    Args:
+        source: Path of the source file
+
+    Returns:
+        The edit records in order, or None when there is no journal or it
+        was written for a different version of the source
+    """
+    path = journal_path(source)
+    try:
+        with open(path, encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        raise ORCJournalError(f"Failed to read edit journal {path}: {str(e)}")
+
+    records = []
+    for number, line in enumerate(lines):
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            if number == len(lines) - 1:
+                logger.warning("Ignoring incomplete last record of %s", path)
+                break
+            raise ORCJournalError(f"Edit journal {path} is corrupt at line {number + 1}")
+
+    if not records or records[0] != _source_header(source):
+        logger.info("Edit journal %s does not match %s, ignoring it", path, source)
+        return None
+    return records[1:]
+
+
+class EditJournal:
+    """An open journal that edits to one source file are appended to."""
+
+    def __init__(self, source: str):
+        """Start a new journal for a source file as it is now.
+
+        The journal file replaces any previous one of the source when the
+        first edit is appended, so files that are never edited get none.
+
+        Raises:
+            ORCJournalError: If the source cannot be found
+        """
+        self.source = source
+        self.path = journal_path(source)
+        self.records = 0
+        self._handle = None
+        try:
+            self._header = _source_header(source)
+        except OSError as e:
+            raise ORCJournalError(f"Failed to start edit journal for {source}: {str(e)}")
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._handle.flush()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add one edit record.
+
+        Raises:
+            ORCJournalError: If the record cannot be written
+        """
+        try:
+            if self._handle is None:
+                self._handle = open(self.path, "w", encoding="utf-8")
+                self._write(self._header)
+            self._write(record)
+        except (OSError, ValueError) as e:
+            raise ORCJournalError(f"Failed to write edit journal {self.path}: {str(e)}")
+        self.records += 1
+
+    def close(self) -> None:
+        """Stop appending; the journal stays on disk for recovery."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def discard(self) -> None:
+        """Delete the journal file, e.g. once its edits were saved."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,151 @@
+"""Navigate and edit values inside nested cells without converting them to Python.
+
+A cell is a one-element Arrow array. Struct fields and list (or map)
+elements are reached through the child arrays and list offsets, so every
+step is a zero-copy slice however large the value is. A path is a tuple of
+steps from the cell to a value: field names for structs, element positions
+for lists and maps.
+"""
+from typing import Any, List, Optional, Tuple, Union
+
+import pyarrow
+
+Path = Tuple[Union[str, int], ...]
+
+
+def is_list_like(data_type: pyarrow.DataType) -> bool:
+    return (pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(data_type)
+            or pyarrow.types.is_map(data_type))
+
+
+def is_expandable(data_type: pyarrow.DataType) -> bool:
+    """Whether values of this type have children to drill into."""
+    return pyarrow.types.is_struct(data_type) or is_list_like(data_type)
+
+
+def _elements(array: pyarrow.Array) -> pyarrow.Array:
+    """The elements of a one-element list or map array, sliced from the child array."""
+    start, end = array.offsets[0].as_py(), array.offsets[1].as_py()
+    return array.values.slice(start, end - start)
+
+
+def child_count(array: pyarrow.Array) -> int:
+    """Number of fields or elements of a one-element array; 0 when null or a leaf."""
+    if not array.is_valid()[0].as_py():
+        return 0
+    if pyarrow.types.is_struct(array.type):
+        return array.type.num_fields
+    if is_list_like(array.type):
+        return len(_elements(array))
+    return 0
+
+
+def children(array: pyarrow.Array, start: int = 0,
+             stop: Optional[int] = None) -> List[Tuple[Union[str, int], pyarrow.Array]]:
+    """Get a range of the fields or elements of a one-element array.
+
+    Args:
+        array: One-element struct, list or map array
+        start: First element position (ignored for structs)
+        stop: Position after the last element, the end when None
+
+    Returns:
+        (step, one-element array) pairs
+    """
+    if pyarrow.types.is_struct(array.type):
+        return [(field.name, array.field(index)) for index, field in enumerate(array.type)]
+    elements = _elements(array)
+    stop = len(elements) if stop is None else min(stop, len(elements))
+    return [(position, elements.slice(position, 1)) for position in range(start, stop)]
+
+
+def child(array: pyarrow.Array, step: Union[str, int]) -> pyarrow.Array:
+    """Get one field or element of a one-element array.
+
+    Raises:
+        KeyError: If a struct has no such field
+        IndexError: If a list is null or shorter than the position
+    """
+    if pyarrow.types.is_struct(array.type):
+        if array.type.get_field_index(step) < 0:
+            raise KeyError(f"No field '{step}'")
+        return array.field(step)
+    if is_list_like(array.type):
+        elements = _elements(array) if array.is_valid()[0].as_py() else array.values.slice(0, 0)
+        if not isinstance(step, int) or not 0 <= step < len(elements):
+            raise IndexError(f"No element {step}")
+        return elements.slice(step, 1)
+    raise KeyError(f"{array.type} has no children")
+
+
+def get(array: pyarrow.Array, path: Path) -> pyarrow.Array:
+    """Follow a path from a cell to a one-element array of the value there."""
+    for step in path:
+        array = child(array, step)
+    return array
+
+
+def parse_leaf(text: str, data_type: pyarrow.DataType) -> pyarrow.Array:
+    """Convert entered text to a one-element array of a leaf type.
+
+    Empty text is null, except for strings. Other types are parsed with
+    Arrow's string casts, so e.g. timestamps and decimals work as typed.
+
+    Raises:
+        ValueError: If the text is not a valid value of the type
+    """
+    if pyarrow.types.is_string(data_type) or pyarrow.types.is_large_string(data_type):
+        return pyarrow.array([text], type=data_type)
+    if not text.strip():
+        return pyarrow.nulls(1, data_type)
+    try:
+        return pyarrow.array([text.strip()]).cast(data_type)
+    except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError) as e:
+        raise ValueError(f"Invalid {data_type} value '{text}': {str(e)}")
+
+
+def replace_leaf(array: pyarrow.Array, path: Path, value: Any) -> pyarrow.Array:
+    """Rebuild a cell with the value at a path replaced.
+
+    Only the arrays along the path are rebuilt; siblings are reused as
+    slices of the original child arrays.
+
+    Args:
+        array: One-element array of the cell
+        path: Steps from the cell to the value to replace
+        value: New value, a one-element array of the leaf type or a Python value
+
+    Returns:
+        One-element array of the new cell
+
+    Raises:
+        KeyError, IndexError: If the path does not exist
+    """
+    if not path:
+        if isinstance(value, pyarrow.Array):
+            return value.cast(array.type) if not value.type.equals(array.type) else value
+        return pyarrow.array([value], type=array.type, from_pandas=True)
+
+    step, rest = path[0], path[1:]
+    if pyarrow.types.is_struct(array.type):
+        fields = list(array.type)
+        arrays = [array.field(index) for index in range(len(fields))]
+        index = array.type.get_field_index(step)
+        if index < 0:
+            raise KeyError(f"No field '{step}'")
+        arrays[index] = replace_leaf(arrays[index], rest, value)
+        mask = array.is_null() if array.null_count else None
+        return pyarrow.StructArray.from_arrays(arrays, fields=fields, mask=mask)
+
+    child(array, step)  # raises if the element does not exist
+    elements = _elements(array)
+    replaced = replace_leaf(elements.slice(step, 1), rest, value)
+    elements = pyarrow.concat_arrays([elements.slice(0, step), replaced, elements.slice(step + 1)])
+    offset_type = pyarrow.int64() if pyarrow.types.is_large_list(array.type) else pyarrow.int32()
+    offsets = pyarrow.array([0, len(elements)], type=offset_type)
+    if pyarrow.types.is_map(array.type):
+        return pyarrow.MapArray.from_arrays(offsets, elements.field(0), elements.field(1),
+                                            type=array.type)
+    if pyarrow.types.is_large_list(array.type):
+        return pyarrow.LargeListArray.from_arrays(offsets, elements, type=array.type)
+    return pyarrow.ListArray.from_arrays(offsets, elements, type=array.type)
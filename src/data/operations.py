@@ -0,0 +1,384 @@
+"""Scriptable table operations shared by the CLI and ORCDataManager.
+
+An operations script is a JSON list of steps such as::
+
+    [
+        {"op": "filter", "where": "status != \\"DELETED\\""},
+        {"op": "set", "column": "status", "value": "FAILED", "where": "retries > 3"},
+        {"op": "replace", "column": "host", "old": ".internal", "new": "", "substring": true},
+        {"op": "add-column", "name": "source", "type": "string", "default": "batch"},
+        {"op": "drop", "column": "debug"},
+        {"op": "cast", "column": "retries", "type": "int32"}
+    ]
+
+Every operation works on Arrow tables and never looks at more than the rows
+it is given, so a pipeline can be applied to an ORC file one stripe at a time.
+"""
+import json
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+
+from src.exceptions.orc_exceptions import FilterExpressionError, OperationError
+from src.utils.files import replacing
+from src.utils.filter_expression import CompiledFilter, compile_filter
+from src.utils.type_utils import parse_pyarrow_type
+
+_ROW_ID_COLUMN = '__row_id__'
+
+
+def _require(spec: Dict[str, Any], key: str) -> Any:
+    if key not in spec:
+        raise OperationError(f"Operation '{spec.get('op')}' requires '{key}'")
+    return spec[key]
+
+
+def _parse_type(type_name: str) -> pyarrow.DataType:
+    try:
+        return parse_pyarrow_type(type_name)
+    except ValueError as e:
+        raise OperationError(str(e))
+
+
+def _compile(where: str, schema: pyarrow.Schema) -> CompiledFilter:
+    try:
+        return compile_filter(where, schema)
+    except FilterExpressionError as e:
+        raise OperationError(f"Invalid expression '{where}': {str(e)}")
+
+
+def _row_mask(table: pyarrow.Table, compiled: CompiledFilter) -> pyarrow.Array:
+    """Evaluate a filter expression to a boolean mask over the table's rows."""
+    columns = sorted(compiled.columns)
+    subset = table.select(columns).append_column(
+        _ROW_ID_COLUMN, pyarrow.array(np.arange(table.num_rows, dtype=np.int64))
+    )
+    selected = subset.filter(compiled.expression).column(_ROW_ID_COLUMN).to_numpy()
+    mask = np.zeros(table.num_rows, dtype=bool)
+    mask[selected] = True
+    return pyarrow.array(mask)
+
+
+class Operation(ABC):
+    """One step of an operations script.
+
+    ``bind`` validates the step against the schema it will see and returns
+    the schema it produces; ``apply`` transforms a table with that schema.
+    """
+    op = ''
+
+    @abstractmethod
+    def bind(self, schema: pyarrow.Schema) -> pyarrow.Schema:
+        """Validate the step against its input schema and return its output schema."""
+
+    @abstractmethod
+    def apply(self, table: pyarrow.Table) -> pyarrow.Table:
+        """Transform a table with the bound input schema."""
+
+    def _require_column(self, schema: pyarrow.Schema, column: str) -> pyarrow.Field:
+        if column not in schema.names:
+            raise OperationError(f"{self.op}: column '{column}' does not exist")
+        return schema.field(column)
+
+
+class SetValue(Operation):
+    op = 'set'
+
+    def __init__(self, column: str, value: Any, where: Optional[str] = None):
+        self.column = column
+        self.value = value
+        self.where = where
+        self._scalar = None
+        self._filter = None
+
+    def bind(self, schema):
+        field = self._require_column(schema, self.column)
+        try:
+            self._scalar = pyarrow.scalar(self.value, type=field.type)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError, TypeError) as e:
+            raise OperationError(f"set: invalid value for '{self.column}' ({field.type}): {str(e)}")
+        self._filter = _compile(self.where, schema) if self.where else None
+        return schema
+
+    def apply(self, table):
+        position = table.schema.get_field_index(self.column)
+        if self._filter is None:
+            column = pyarrow.repeat(self._scalar, table.num_rows)
+        else:
+            column = pc.if_else(_row_mask(table, self._filter), self._scalar, table.column(position))
+        return table.set_column(position, table.schema.field(position), column)
+
+
+class ReplaceValues(Operation):
+    op = 'replace'
+
+    def __init__(self, column: str, old: Any, new: Any, substring: bool = False,
+                 where: Optional[str] = None):
+        self.column = column
+        self.old = old
+        self.new = new
+        self.substring = substring
+        self.where = where
+        self._old = None
+        self._new = None
+        self._filter = None
+
+    def bind(self, schema):
+        field = self._require_column(schema, self.column)
+        if self.substring and not (pyarrow.types.is_string(field.type)
+                                   or pyarrow.types.is_large_string(field.type)):
+            raise OperationError(f"replace: substring replacement needs a string column, "
+                                 f"'{self.column}' is {field.type}")
+        try:
+            self._old = pyarrow.scalar(self.old, type=field.type)
+            self._new = pyarrow.scalar(self.new, type=field.type)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError, TypeError) as e:
+            raise OperationError(f"replace: invalid value for '{self.column}' ({field.type}): {str(e)}")
+        self._filter = _compile(self.where, schema) if self.where else None
+        return schema
+
+    def apply(self, table):
+        position = table.schema.get_field_index(self.column)
+        column = table.column(position)
+        if self.substring:
+            replaced = pc.replace_substring(column, self.old, self.new)
+            if self._filter is not None:
+                replaced = pc.if_else(_row_mask(table, self._filter), replaced, column)
+        else:
+            mask = pc.fill_null(pc.equal(column, self._old), False)
+            if self._filter is not None:
+                mask = pc.and_(mask, _row_mask(table, self._filter))
+            replaced = pc.if_else(mask, self._new, column)
+        return table.set_column(position, table.schema.field(position), replaced)
+
+
+class AddColumn(Operation):
+    op = 'add-column'
+
+    def __init__(self, name: str, type: str, default: Any = None, position: Optional[int] = None):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.position = position
+        self._field = None
+        self._scalar = None
+
+    def bind(self, schema):
+        if self.name in schema.names:
+            raise OperationError(f"add-column: column '{self.name}' already exists")
+        self._field = pyarrow.field(self.name, _parse_type(self.type))
+        try:
+            self._scalar = pyarrow.scalar(self.default, type=self._field.type)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowTypeError, TypeError) as e:
+            raise OperationError(f"add-column: invalid default for '{self.name}': {str(e)}")
+        position = len(schema) if self.position is None else self.position
+        return schema.insert(position, self._field)
+
+    def apply(self, table):
+        position = table.num_columns if self.position is None else self.position
+        if self.default is None:
+            column = pyarrow.nulls(table.num_rows, self._field.type)
+        else:
+            column = pyarrow.repeat(self._scalar, table.num_rows)
+        return table.add_column(position, self._field, column)
+
+
+class DropColumn(Operation):
+    op = 'drop'
+
+    def __init__(self, column: str):
+        self.column = column
+
+    def bind(self, schema):
+        self._require_column(schema, self.column)
+        return schema.remove(schema.get_field_index(self.column))
+
+    def apply(self, table):
+        return table.drop_columns([self.column])
+
+
+class CastColumn(Operation):
+    op = 'cast'
+
+    def __init__(self, column: str, type: str, safe: bool = True):
+        self.column = column
+        self.type = type
+        self.safe = safe
+        self._type = None
+
+    def bind(self, schema):
+        field = self._require_column(schema, self.column)
+        self._type = _parse_type(self.type)
+        position = schema.get_field_index(self.column)
+        return schema.set(position, field.with_type(self._type))
+
+    def apply(self, table):
+        position = table.schema.get_field_index(self.column)
+        try:
+            casted = pc.cast(table.column(position), self._type, safe=self.safe)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError) as e:
+            raise OperationError(f"cast: cannot cast '{self.column}' to {self._type}: {str(e)}")
+        return table.set_column(position, table.schema.field(position).with_type(self._type), casted)
+
+
+class FilterRows(Operation):
+    op = 'filter'
+
+    def __init__(self, where: str):
+        self.where = where
+        self._filter = None
+
+    def bind(self, schema):
+        self._filter = _compile(self.where, schema)
+        return schema
+
+    def apply(self, table):
+        try:
+            return table.filter(self._filter.expression)
+        except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError,
+                pyarrow.lib.ArrowTypeError) as e:
+            raise OperationError(f"filter: cannot evaluate '{self.where}': {str(e)}")
+
+
+OPERATIONS = {operation.op: operation for operation in
+              (SetValue, ReplaceValues, AddColumn, DropColumn, CastColumn, FilterRows)}
+
+
+def parse_operation(spec: Dict[str, Any]) -> Operation:
+    """Build an operation from its script entry.
+
+    Args:
+        spec: Dictionary with an ``op`` key and the operation's arguments
+
+    Returns:
+        The Operation
+
+    Raises:
+        OperationError: If the entry is not a known, well-formed operation
+    """
+    if not isinstance(spec, dict):
+        raise OperationError(f"Operation must be an object, got {spec!r}")
+    name = _require(spec, 'op')
+    if name not in OPERATIONS:
+        raise OperationError(f"Unknown operation '{name}', expected one of: {', '.join(OPERATIONS)}")
+
+    arguments = {key: value for key, value in spec.items() if key != 'op'}
+    try:
+        return OPERATIONS[name](**arguments)
+    except TypeError as e:
+        raise OperationError(f"Invalid arguments for '{name}': {str(e)}")
+
+
+def load_script(filename: str) -> List[Dict[str, Any]]:
+    """Read the operation entries of a JSON operations script.
+
+    Raises:
+        OperationError: If the file cannot be read or is not valid JSON
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise OperationError(f"Cannot read operations script {filename}: {str(e)}")
+
+
+class Pipeline:
+    """An ordered list of operations bound to an input schema."""
+
+    def __init__(self, operations: List[Operation]):
+        self.operations = operations
+        self.input_schema = None
+        self.output_schema = None
+        # Script entries the pipeline was built from, None if built from operations
+        self.specs: Optional[List[Dict[str, Any]]] = None
+
+    @classmethod
+    def from_specs(cls, specs: List[Dict[str, Any]]) -> 'Pipeline':
+        if not isinstance(specs, list):
+            raise OperationError("An operations script must be a list of operations")
+        pipeline = cls([parse_operation(spec) for spec in specs])
+        pipeline.specs = specs
+        return pipeline
+
+    @classmethod
+    def load(cls, filename: str) -> 'Pipeline':
+        """Read an operations script from a JSON file."""
+        return cls.from_specs(load_script(filename))
+
+    def bind(self, schema: pyarrow.Schema) -> pyarrow.Schema:
+        """Validate every operation against the schema it will see.
+
+        Returns:
+            The schema produced by the whole pipeline
+        """
+        self.input_schema = schema
+        for operation in self.operations:
+            schema = operation.bind(schema)
+        self.output_schema = schema
+        return schema
+
+    def apply(self, table: pyarrow.Table) -> pyarrow.Table:
+        """Run every operation on a table with the bound input schema."""
+        if self.input_schema is None or not table.schema.equals(self.input_schema,
+                                                                check_metadata=False):
+            self.bind(table.schema)
+        for operation in self.operations:
+            table = operation.apply(table)
+        return table
+
+
+@dataclass
+class TransformResult:
+    source: str
+    destination: str
+    rows_in: int
+    rows_out: int
+    stripes: int
+    seconds: float
+
+
+def transform_file(source: str, destination: str, pipeline: Pipeline,
+                   progress: Optional[Callable[[int, int], None]] = None) -> TransformResult:
+    """Apply a pipeline to an ORC file one stripe at a time.
+
+    Only one stripe is held in memory. Output goes to a temporary file next
+    to the destination which replaces it once complete, so the destination
+    may be the source itself.
+
+    Args:
+        source: Path of the ORC file to read
+        destination: Path of the ORC file to write
+        pipeline: Operations to apply
+        progress: Optional callback receiving (stripes done, total stripes)
+
+    Returns:
+        TransformResult with row counts and timing
+
+    Raises:
+        OperationError: If the pipeline does not fit the file or fails
+    """
+    started = time.perf_counter()
+    orc_file = orc.ORCFile(source)
+    output_schema = pipeline.bind(orc_file.schema)
+
+    rows_in = rows_out = 0
+    with replacing(destination) as temporary, orc.ORCWriter(temporary) as writer:
+        for index in range(orc_file.nstripes):
+            stripe = pyarrow.Table.from_batches([orc_file.read_stripe(index)])
+            rows_in += stripe.num_rows
+            stripe = pipeline.apply(stripe)
+            rows_out += stripe.num_rows
+            writer.write(stripe)
+            if progress is not None:
+                progress(index + 1, orc_file.nstripes)
+        if orc_file.nstripes == 0:
+            writer.write(output_schema.empty_table())
+
+    return TransformResult(source, destination, rows_in, rows_out, orc_file.nstripes,
+                           time.perf_counter() - started)
@@ -0,0 +1,498 @@
+"""Row-level diff of two ORC files in bounded memory.
+
+Rows are hashed per stripe with vectorized numpy code: one 64-bit hash per
+column (recursing into lists and structs), combined into a row hash and,
+when key columns are given, a key hash. Only (key hash, row hash, row
+number) triples are kept, partitioned by key hash and spilled to disk when
+the files are too large for the memory budget. Each partition is then
+matched with a sort-based hash join:
+
+* with key columns, rows with equal keys are paired and reported as
+  modified when their row hashes differ;
+* without keys, rows are paired by whole-row hash, so only added and
+  removed rows are reported.
+
+A final pass over the stripes that hold changed rows finds which columns
+differ and collects example values.
+"""
+import json
+import math
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+_EMPTY_HASH = np.uint64(0x2545F4914F6CDD1D)
+_ODD = np.uint64(0xFF51AFD7ED558CCD)
+_RECORD = np.dtype([('key', '<u8'), ('row_hash', '<u8'), ('row', '<i8')])
+# Bytes per row while joining a partition: records of both sides plus sort buffers
+_JOIN_BYTES_PER_ROW = 4 * _RECORD.itemsize
+_MAX_PARTITIONS = 1024
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer, applied element-wise to uint64 values."""
+    with np.errstate(over='ignore'):
+        values = values ^ (values >> np.uint64(30))
+        values = values * np.uint64(0xBF58476D1CE4E5B9)
+        values = values ^ (values >> np.uint64(27))
+        values = values * np.uint64(0x94D049BB133111EB)
+        return values ^ (values >> np.uint64(31))
+
+
+def _combine(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Order-dependent combination of two hash arrays."""
+    with np.errstate(over='ignore'):
+        return _mix(left * _ODD + right)
+
+
+def hash_array(array) -> np.ndarray:
+    """Hash every value of an Arrow array to uint64, recursing into nested types.
+
+    Equal values get equal hashes; nulls hash to a fixed constant.
+
+    Args:
+        array: pyarrow Array or ChunkedArray
+
+    Returns:
+        uint64 array with one hash per value
+    """
+    if isinstance(array, pyarrow.ChunkedArray):
+        array = array.combine_chunks()
+    data_type = array.type
+
+    if pyarrow.types.is_dictionary(data_type):
+        return hash_array(array.dictionary_decode())
+
+    if pyarrow.types.is_struct(data_type):
+        hashes = np.full(len(array), _EMPTY_HASH, dtype=np.uint64)
+        for child in array.flatten():
+            hashes = _combine(hashes, hash_array(child))
+    elif (pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(data_type)
+          or pyarrow.types.is_map(data_type)):
+        offsets = array.offsets.to_numpy().astype(np.int64)
+        start, end = offsets[0], offsets[-1]
+        child = hash_array(array.values.slice(start, end - start))
+        lengths = np.diff(offsets)
+        # Mix each element with its position so [1, 2] and [2, 1] differ
+        positions = np.arange(end - start, dtype=np.int64) - np.repeat(offsets[:-1] - start, lengths)
+        elements = _combine(child, positions.astype(np.uint64))
+        with np.errstate(over='ignore'):
+            sums = np.concatenate([[np.uint64(0)], np.cumsum(elements, dtype=np.uint64)])
+            hashes = sums[offsets[1:] - start] - sums[offsets[:-1] - start]
+        hashes = _combine(hashes, lengths.astype(np.uint64))
+    elif pyarrow.types.is_boolean(data_type):
+        hashes = _mix(pc.cast(array, pyarrow.uint8()).fill_null(0).to_numpy().astype(np.uint64))
+    elif (pyarrow.types.is_integer(data_type) or pyarrow.types.is_floating(data_type)
+          or pyarrow.types.is_temporal(data_type)):
+        # Hash the raw fixed-width values; slots under nulls are overwritten below
+        width = data_type.bit_width // 8
+        raw = np.frombuffer(array.buffers()[1], dtype=f'<u{width}',
+                            count=len(array) + array.offset)[array.offset:]
+        hashes = _mix(raw.astype(np.uint64))
+    elif pyarrow.types.is_null(data_type):
+        hashes = np.full(len(array), _NULL_HASH, dtype=np.uint64)
+    else:
+        if pyarrow.types.is_decimal(data_type):
+            array = pc.cast(array, pyarrow.string())
+        filler = b'' if pyarrow.types.is_binary(array.type) or pyarrow.types.is_large_binary(array.type) else ''
+        values = array.fill_null(filler).to_numpy(zero_copy_only=False)
+        hashes = pd.util.hash_array(values, categorize=False)
+
+    if array.null_count:
+        hashes = np.where(array.is_null().to_numpy(zero_copy_only=False), _NULL_HASH, hashes)
+    return hashes
+
+
+def hash_rows(table: pyarrow.Table, columns: Sequence[str]) -> np.ndarray:
+    """Hash each row of a table over the given columns, in order."""
+    hashes = np.full(table.num_rows, _EMPTY_HASH, dtype=np.uint64)
+    for name in columns:
+        hashes = _combine(hashes, hash_array(table.column(name)))
+    return hashes
+
+
+@dataclass
+class RowChange:
+    left_row: int
+    right_row: int
+    changes: Dict[str, Tuple[Any, Any]]
+
+
+@dataclass
+class DiffResult:
+    left: str
+    right: str
+    key_columns: List[str]
+    compared_columns: List[str]
+    left_rows: int = 0
+    right_rows: int = 0
+    added: np.ndarray = field(default_factory=lambda: np.array([], dtype=np.int64))
+    removed: np.ndarray = field(default_factory=lambda: np.array([], dtype=np.int64))
+    modified: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int64))
+    duplicate_keys: int = 0
+    column_changes: Dict[str, int] = field(default_factory=dict)
+    schema_differences: List[str] = field(default_factory=list)
+    added_examples: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    removed_examples: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    modified_examples: List[RowChange] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> int:
+        return self.left_rows - len(self.removed) - len(self.modified)
+
+    @property
+    def has_differences(self) -> bool:
+        return bool(len(self.added) or len(self.removed) or len(self.modified)
+                    or self.schema_differences)
+
+    def summary(self) -> str:
+        """One-line summary of the diff."""
+        return (f"{len(self.added):,} added, {len(self.removed):,} removed, "
+                f"{len(self.modified):,} modified, {self.unchanged:,} unchanged")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the diff to plain data, with example rows rather than every row."""
+        return {
+            'left': self.left,
+            'right': self.right,
+            'key_columns': self.key_columns,
+            'summary': {
+                'left_rows': self.left_rows,
+                'right_rows': self.right_rows,
+                'added': len(self.added),
+                'removed': len(self.removed),
+                'modified': len(self.modified),
+                'unchanged': self.unchanged,
+                'duplicate_keys': self.duplicate_keys,
+            },
+            'schema_differences': self.schema_differences,
+            'column_changes': self.column_changes,
+            'added': [{'row': row, 'values': values} for row, values in self.added_examples],
+            'removed': [{'row': row, 'values': values} for row, values in self.removed_examples],
+            'modified': [
+                {
+                    'left_row': change.left_row,
+                    'right_row': change.right_row,
+                    'changes': {name: {'left': old, 'right': new}
+                                for name, (old, new) in change.changes.items()},
+                }
+                for change in self.modified_examples
+            ],
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+
+class _Partitions:
+    """(key, row hash, row) records of one file, split by the top bits of the key."""
+
+    def __init__(self, count: int, directory: Optional[str], name: str):
+        self.bits = int(math.log2(count))
+        self.count = count
+        self.paths = None
+        self.memory: List[List[np.ndarray]] = [[] for _ in range(count)]
+        if directory is not None:
+            self.paths = [os.path.join(directory, f"{name}-{index}.bin") for index in range(count)]
+
+    def add(self, records: np.ndarray) -> None:
+        if self.count == 1:
+            parts = [(0, records)]
+        else:
+            partition = (records['key'] >> np.uint64(64 - self.bits)).astype(np.int64)
+            order = np.argsort(partition, kind='stable')
+            records, partition = records[order], partition[order]
+            bounds = np.searchsorted(partition, np.arange(self.count + 1))
+            parts = [(index, records[bounds[index]:bounds[index + 1]]) for index in range(self.count)]
+
+        for index, part in parts:
+            if not len(part):
+                continue
+            if self.paths is None:
+                self.memory[index].append(part)
+            else:
+                with open(self.paths[index], 'ab') as f:
+                    part.tofile(f)
+
+    def load(self, index: int) -> np.ndarray:
+        if self.paths is None:
+            parts = self.memory[index]
+            self.memory[index] = []
+            return np.concatenate(parts) if parts else np.empty(0, dtype=_RECORD)
+        if not os.path.exists(self.paths[index]):
+            return np.empty(0, dtype=_RECORD)
+        records = np.fromfile(self.paths[index], dtype=_RECORD)
+        os.unlink(self.paths[index])
+        return records
+
+
+def _stripe_tables(filename: str, columns: List[str], casts: Optional[pyarrow.Schema] = None):
+    """Yield (first row, table) for each stripe, cast to the given types."""
+    orc_file = orc.ORCFile(filename)
+    first_row = 0
+    for index in range(orc_file.nstripes):
+        table = pyarrow.Table.from_batches([orc_file.read_stripe(index, columns=columns)])
+        if casts is not None:
+            table = _align(table, casts)
+        yield first_row, table
+        first_row += table.num_rows
+
+
+def _align(table: pyarrow.Table, schema: pyarrow.Schema) -> pyarrow.Table:
+    """Cast columns to the other file's types where they differ (checked by ``_castable``)."""
+    for position, name in enumerate(table.column_names):
+        target = schema.field(name).type
+        if not table.schema.field(position).type.equals(target):
+            table = table.set_column(position, pyarrow.field(name, target),
+                                     pc.cast(table.column(position), target))
+    return table
+
+
+def _castable(filename: str, name: str, target: pyarrow.DataType) -> bool:
+    """Whether every value of a file's column can be cast to a type.
+
+    Only columns whose type differs are read, one stripe at a time.
+    """
+    orc_file = orc.ORCFile(filename)
+    source = orc_file.schema.field(name).type
+    if source.equals(target):
+        return True
+    try:
+        pc.cast(pyarrow.array([], type=source), target)
+        for index in range(orc_file.nstripes):
+            pc.cast(orc_file.read_stripe(index, columns=[name]).column(0), target)
+    except (pyarrow.lib.ArrowInvalid, pyarrow.lib.ArrowNotImplementedError):
+        return False
+    return True
+
+
+def _occurrence_keys(records: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Sort records by key and make duplicate keys unique by occurrence order.
+
+    Returns:
+        Records sorted by key with keys replaced by (key, occurrence) hashes,
+        and the number of rows that repeated an earlier key
+    """
+    records = records[np.lexsort((records['row'], records['key']))]
+    keys = records['key']
+    if len(keys) == 0:
+        return records, 0
+    starts = np.concatenate([[True], keys[1:] != keys[:-1]])
+    positions = np.arange(len(keys))
+    occurrence = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+    duplicates = int(np.count_nonzero(occurrence))
+    if duplicates:
+        records = records.copy()
+        records['key'] = _combine(keys, occurrence.astype(np.uint64))
+    return records, duplicates
+
+
+def _join(left: np.ndarray, right: np.ndarray, keyed: bool):
+    """Match one partition of both files.
+
+    Returns:
+        (removed left rows, added right rows, modified (left, right) pairs,
+        duplicate key count)
+    """
+    left, left_duplicates = _occurrence_keys(left)
+    right, right_duplicates = _occurrence_keys(right)
+    right = right[np.argsort(right['key'], kind='stable')]
+
+    position = np.searchsorted(right['key'], left['key'])
+    position = np.minimum(position, max(len(right) - 1, 0))
+    matched = (right['key'][position] == left['key']) if len(right) else np.zeros(len(left), bool)
+
+    removed = left['row'][~matched]
+    right_matched = np.zeros(len(right), dtype=bool)
+    right_matched[position[matched]] = True
+    added = right['row'][~right_matched]
+
+    pairs = np.empty((0, 2), dtype=np.int64)
+    if keyed:
+        left_hit, right_hit = left[matched], right[position[matched]]
+        changed = left_hit['row_hash'] != right_hit['row_hash']
+        pairs = np.column_stack([left_hit['row'][changed], right_hit['row'][changed]])
+    return removed, added, pairs, left_duplicates + right_duplicates
+
+
+def _scan(filename: str, columns: List[str], key_columns: List[str],
+          partitions: _Partitions, casts: Optional[pyarrow.Schema]) -> int:
+    """Hash every row of a file into the partitions; returns the row count."""
+    rows = 0
+    for first_row, table in _stripe_tables(filename, columns, casts):
+        row_hashes = hash_rows(table, columns)
+        records = np.empty(table.num_rows, dtype=_RECORD)
+        records['row_hash'] = row_hashes
+        records['key'] = hash_rows(table, key_columns) if key_columns else row_hashes
+        records['row'] = np.arange(first_row, first_row + table.num_rows)
+        partitions.add(records)
+        rows += table.num_rows
+    return rows
+
+
+def _collect_rows(filename: str, columns: List[str], rows: np.ndarray,
+                  casts: Optional[pyarrow.Schema] = None) -> Tuple[Dict[int, int], pyarrow.Table]:
+    """Read just the given rows of a file, stripe by stripe.
+
+    Returns:
+        Mapping of file row to position in the returned table, and the table
+    """
+    rows = np.unique(rows)
+    pieces, order = [], []
+    for first_row, table in _stripe_tables(filename, columns, casts):
+        lo, hi = np.searchsorted(rows, [first_row, first_row + table.num_rows])
+        if hi > lo:
+            wanted = rows[lo:hi]
+            pieces.append(table.take(pyarrow.array(wanted - first_row)))
+            order.extend(wanted.tolist())
+        if hi == len(rows):
+            break
+    schema = casts if casts is not None else orc.ORCFile(filename).schema
+    schema = pyarrow.schema([schema.field(name) for name in columns])
+    table = pyarrow.concat_tables([piece.cast(schema) for piece in pieces]) if pieces \
+        else schema.empty_table()
+    return {row: index for index, row in enumerate(order)}, table
+
+
+def _column_changes(result: DiffResult, chunk_rows: int) -> None:
+    """Count changed values per column over all modified rows, a chunk at a time."""
+    columns = result.compared_columns
+    left_schema = orc.ORCFile(result.left).schema
+    counts = np.zeros(len(columns), dtype=np.int64)
+    for start in range(0, len(result.modified), chunk_rows):
+        pairs = result.modified[start:start + chunk_rows]
+        left_index, left_table = _collect_rows(result.left, columns, pairs[:, 0])
+        right_index, right_table = _collect_rows(result.right, columns, pairs[:, 1], left_schema)
+        left_take = pyarrow.array([left_index[row] for row in pairs[:, 0].tolist()])
+        right_take = pyarrow.array([right_index[row] for row in pairs[:, 1].tolist()])
+        left_table, right_table = left_table.take(left_take), right_table.take(right_take)
+        for position, name in enumerate(columns):
+            differs = hash_array(left_table.column(name)) != hash_array(right_table.column(name))
+            counts[position] += int(np.count_nonzero(differs))
+    result.column_changes = {name: int(count) for name, count in zip(columns, counts) if count}
+
+
+def _examples(result: DiffResult, max_examples: int) -> None:
+    """Fetch the values of the first few added, removed and modified rows."""
+    columns = result.compared_columns
+    left_schema = orc.ORCFile(result.left).schema
+    removed = np.sort(result.removed)[:max_examples]
+    added = np.sort(result.added)[:max_examples]
+    modified = result.modified[np.argsort(result.modified[:, 0], kind='stable')][:max_examples]
+
+    left_index, left_table = _collect_rows(result.left, columns,
+                                           np.concatenate([removed, modified[:, 0]]))
+    right_index, right_table = _collect_rows(result.right, columns,
+                                             np.concatenate([added, modified[:, 1]]), left_schema)
+    left_values, right_values = left_table.to_pylist(), right_table.to_pylist()
+
+    result.removed_examples = [(int(row), left_values[left_index[row]]) for row in removed.tolist()]
+    result.added_examples = [(int(row), right_values[right_index[row]]) for row in added.tolist()]
+    for left_row, right_row in modified.tolist():
+        before, after = left_values[left_index[left_row]], right_values[right_index[right_row]]
+        changes = {name: (before[name], after[name]) for name in columns if before[name] != after[name]}
+        result.modified_examples.append(RowChange(left_row, right_row, changes))
+
+
+def diff_files(left: str, right: str, key_columns: Optional[List[str]] = None,
+               memory_budget_mb: int = 512, max_examples: int = 100,
+               progress: Optional[Callable[[str], None]] = None) -> DiffResult:
+    """Compare the rows of two ORC files.
+
+    Args:
+        left: Path of the original file
+        right: Path of the changed file
+        key_columns: Columns identifying a row; whole rows are compared when empty
+        memory_budget_mb: Memory allowed for row hashes; larger inputs are
+            partitioned and spilled to a temporary directory
+        max_examples: Number of added, removed and modified rows whose values
+            are included in the result
+        progress: Optional callback receiving a description of each phase
+
+    Returns:
+        DiffResult with the changed row numbers, per-column change counts and examples
+
+    Raises:
+        ValueError: If a key column is missing from either file or changed to
+            a type its old values cannot be compared with
+    """
+    from src.utils.schema_validator import SchemaValidator
+
+    key_columns = list(key_columns or [])
+    left_file, right_file = orc.ORCFile(left), orc.ORCFile(right)
+    left_schema, right_schema = left_file.schema, right_file.schema
+    for name in key_columns:
+        if name not in left_schema.names or name not in right_schema.names:
+            raise ValueError(f"Key column '{name}' must exist in both files")
+
+    shared = [name for name in left_schema.names if name in right_schema.names]
+    # Shared columns whose new values cannot be cast back to the old type are
+    # only reported through the schema differences
+    uncomparable = [name for name in shared
+                    if not _castable(right, name, left_schema.field(name).type)]
+    for name in key_columns:
+        if name in uncomparable:
+            raise ValueError(f"Key column '{name}' cannot be compared: its values changed from "
+                             f"{left_schema.field(name).type} to {right_schema.field(name).type}")
+    columns = [name for name in shared if name not in uncomparable]
+    result = DiffResult(left, right, key_columns, columns)
+    result.schema_differences = [difference.describe() for difference in
+                                 SchemaValidator.diff_schemas(left_schema, right_schema)]
+    result.schema_differences.extend(
+        f"Column {name} not compared: its values cannot be converted to "
+        f"{left_schema.field(name).type}" for name in uncomparable
+    )
+
+    # Partition so that one partition of both files fits the budget while joining
+    estimated = (left_file.nrows + right_file.nrows) * _JOIN_BYTES_PER_ROW
+    count = 1
+    while estimated / count > memory_budget_mb * 1024 * 1024 and count < _MAX_PARTITIONS:
+        count *= 2
+
+    with tempfile.TemporaryDirectory(prefix='orc-diff-') as directory:
+        spill = directory if count > 1 else None
+        left_parts = _Partitions(count, spill, 'left')
+        right_parts = _Partitions(count, spill, 'right')
+        right_casts = pyarrow.schema([left_schema.field(name) for name in columns])
+
+        if progress is not None:
+            progress(f"Hashing {left}")
+        result.left_rows = _scan(left, columns, key_columns, left_parts, None)
+        if progress is not None:
+            progress(f"Hashing {right}")
+        result.right_rows = _scan(right, columns, key_columns, right_parts, right_casts)
+
+        removed, added, modified = [], [], []
+        for index in range(count):
+            if progress is not None:
+                progress(f"Matching rows ({index + 1}/{count})")
+            part_removed, part_added, part_modified, duplicates = _join(
+                left_parts.load(index), right_parts.load(index), bool(key_columns)
+            )
+            removed.append(part_removed)
+            added.append(part_added)
+            modified.append(part_modified)
+            result.duplicate_keys += duplicates
+
+    result.removed = np.sort(np.concatenate(removed))
+    result.added = np.sort(np.concatenate(added))
+    result.modified = np.concatenate(modified).reshape(-1, 2)
+
+    if len(result.modified):
+        if progress is not None:
+            progress("Comparing columns of modified rows")
+        chunk_rows = max(1, memory_budget_mb * 1024 * 1024 // (64 * max(len(columns), 1)))
+        _column_changes(result, chunk_rows)
+    if max_examples and (len(result.added) or len(result.removed) or len(result.modified)):
+        if progress is not None:
+            progress("Collecting example rows")
+        _examples(result, max_examples)
+    return result
@@ -0,0 +1,201 @@
+"""How cell values are shortened for the table view and edit dialog.
+
+Lists longer than ``Config.PREVIEW_ITEMS`` elements and strings longer than
+``Config.PREVIEW_CHARS`` characters are cut, with a marker saying how much
+was left out, e.g. ``[1,2,3,… 49,997 more]``. Nested lists, structs and
+maps are cut the same way at every level, and a whole cell never renders to
+more than ``Config.PREVIEW_CHARS`` characters plus markers. Full values are
+only turned into text when a cell is opened in the larger editor.
+
+When rows are still Arrow data, ``preview_table`` cuts them with the list
+and string slicing kernels before anything is converted to Python objects,
+so showing a 50k element list costs no more than showing a short one.
+"""
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow
+import pyarrow.compute as pc
+
+from src.utils.config import Config
+
+
+def _is_list(data_type: pyarrow.DataType) -> bool:
+    return pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(data_type)
+
+
+def _is_string(data_type: pyarrow.DataType) -> bool:
+    return pyarrow.types.is_string(data_type) or pyarrow.types.is_large_string(data_type)
+
+
+def _cut(array: pyarrow.Array, items: int, chars: int) -> Tuple[pyarrow.Array, Optional[np.ndarray]]:
+    """Cut the cells of one array; also returns how much each cell lost, None if nothing."""
+    data_type = array.type
+    if _is_string(data_type):
+        lengths = pc.utf8_length(array).fill_null(0).to_numpy(zero_copy_only=False)
+        hidden = np.maximum(lengths - chars, 0)
+        if not hidden.any():
+            return array, None
+        return pc.utf8_slice_codeunits(array, 0, chars), hidden
+
+    if _is_list(data_type):
+        lengths = pc.list_value_length(array).fill_null(0).to_numpy(zero_copy_only=False)
+        hidden = np.maximum(lengths - items, 0)
+        if hidden.any():
+            array = pc.list_slice(array, 0, items)
+        # Elements may themselves be long strings, lists or structs
+        values, values_hidden = _cut(array.flatten(), items, chars)
+        if values_hidden is None:
+            return array, (hidden if hidden.any() else None)
+        parents = pc.list_parent_indices(array).to_numpy()
+        hidden = hidden + np.bincount(parents, weights=values_hidden, minlength=len(array)).astype(np.int64)
+        offsets = np.concatenate([[0], np.cumsum(np.minimum(lengths, items))])
+        if pyarrow.types.is_large_list(data_type):
+            offsets, list_class = pyarrow.array(offsets, pyarrow.int64()), pyarrow.LargeListArray
+        else:
+            offsets, list_class = pyarrow.array(offsets, pyarrow.int32()), pyarrow.ListArray
+        mask = array.is_null() if array.null_count else None
+        return list_class.from_arrays(offsets, values, type=data_type, mask=mask), hidden
+
+    if pyarrow.types.is_struct(data_type):
+        children, hidden = [], None
+        for index in range(data_type.num_fields):
+            child, child_hidden = _cut(array.field(index), items, chars)
+            children.append(child)
+            if child_hidden is not None:
+                hidden = child_hidden if hidden is None else hidden + child_hidden
+        if hidden is None:
+            return array, None
+        mask = array.is_null() if array.null_count else None
+        return pyarrow.StructArray.from_arrays(children, fields=list(data_type), mask=mask), hidden
+
+    return array, None
+
+
+def preview_table(table: pyarrow.Table, items: Optional[int] = None,
+                  chars: Optional[int] = None) -> Tuple[pyarrow.Table, Dict[str, np.ndarray]]:
+    """Cut long lists and strings down to what the table view shows.
+
+    Struct fields are cut the same way, recursively.
+
+    Args:
+        table: Rows about to be displayed
+        items: Most list elements to keep, ``Config.PREVIEW_ITEMS`` when None
+        chars: Most string characters to keep, ``Config.PREVIEW_CHARS`` when None
+
+    Returns:
+        The cut table, and for every column that was cut the number of
+        elements or characters each cell lost (for structs: in all fields)
+    """
+    items = Config.PREVIEW_ITEMS if items is None else items
+    chars = Config.PREVIEW_CHARS if chars is None else chars
+    columns, hidden = [], {}
+    for field, column in zip(table.schema, table.columns):
+        chunks, counts = [], []
+        for chunk in column.chunks:
+            cut, lost = _cut(chunk, items, chars)
+            chunks.append(cut)
+            counts.append(np.zeros(len(chunk), dtype=np.int64) if lost is None else lost)
+        if any(count.any() for count in counts):
+            hidden[field.name] = np.concatenate(counts)
+            column = pyarrow.chunked_array(chunks, type=chunks[0].type if chunks else field.type)
+        columns.append(column)
+    return pyarrow.Table.from_arrays(columns, names=table.column_names), hidden
+
+
+class _Text:
+    """Cell text built up to a character budget; markers do not count against it."""
+
+    def __init__(self, budget: int):
+        self.parts: List[str] = []
+        self.left = budget
+        self.cut = False
+
+    def write(self, text: str) -> bool:
+        """Append text; False once the budget is spent."""
+        if len(text) > self.left:
+            self.parts.append(text[:self.left])
+            self.left = 0
+            self.cut = True
+            return False
+        self.parts.append(text)
+        self.left -= len(text)
+        return True
+
+    def mark(self, text: str) -> None:
+        self.parts.append(text)
+        self.cut = True
+
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+
+def _write(out: _Text, value: Any) -> bool:
+    """Render a value into ``out``, shortening it at every level.
+
+    Returns:
+        False when the budget ran out before the value was complete
+    """
+    if isinstance(value, (np.ndarray, list, tuple)):
+        shown = value[:Config.PREVIEW_ITEMS]
+        if not out.write('['):
+            return False
+        for index, element in enumerate(shown):
+            if (index and not out.write(',')) or not _write(out, element):
+                return False
+        if len(value) > len(shown):
+            out.mark(f",… {len(value) - len(shown):,} more")
+        return out.write(']')
+    if isinstance(value, dict):
+        if not out.write('{'):
+            return False
+        for index, (key, element) in enumerate(islice(value.items(), Config.PREVIEW_ITEMS)):
+            if (index and not out.write(', ')) or not out.write(f"{key}: ") or not _write(out, element):
+                return False
+        if len(value) > Config.PREVIEW_ITEMS:
+            out.mark(f", … {len(value) - Config.PREVIEW_ITEMS:,} more")
+        return out.write('}')
+    if isinstance(value, (str, bytes)):
+        if not out.write(str(value[:Config.PREVIEW_CHARS])):
+            return False
+        if len(value) > Config.PREVIEW_CHARS:
+            out.mark(f"… {len(value) - Config.PREVIEW_CHARS:,} more")
+        return True
+    return out.write(str(value))
+
+
+def is_long(value: Any) -> bool:
+    """Whether a value, at any level of nesting, is too long to be shown in full."""
+    out = _Text(Config.PREVIEW_CHARS)
+    return not _write(out, value) or out.cut
+
+
+def format_cell(value: Any, integer: bool = False, hidden: Optional[int] = None) -> str:
+    """Render one cell as the text shown in the table view.
+
+    Args:
+        value: Cell value as converted to pandas
+        integer: Whether the column has an integer dtype
+        hidden: Elements or characters already cut from the value by
+            ``preview_table``; measured from the value itself when None
+
+    Returns:
+        The cell text, shortened with a marker when the value is long
+    """
+    if integer and not isinstance(value, (np.ndarray, list)):
+        return str(pd.NA) if pd.isna(value) else str(int(value))
+
+    out = _Text(Config.PREVIEW_CHARS)
+    if not _write(out, value):
+        return out.text() + "…"
+    text = out.text()
+    if not hidden:
+        return text
+    # Already cut by preview_table: report what was lost as a whole
+    if isinstance(value, (np.ndarray, list)):
+        return f"{text[:-1]},… {hidden:,} more]"
+    if isinstance(value, str):
+        return f"{text}… {hidden:,} more"
+    return text + "…"
@@ -0,0 +1,225 @@
+"""Inverted index for full-text find across string columns."""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pyarrow
+import pyarrow.compute as pc
+
+TOKEN_SPLIT_PATTERN = r'\W+'
+_TOKEN_SPLIT_RE = re.compile(TOKEN_SPLIT_PATTERN)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens the same way the index does.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of non-empty tokens
+    """
+    return [token for token in _TOKEN_SPLIT_RE.split(text.lower()) if token]
+
+
+def is_indexable(data_type: pyarrow.DataType) -> bool:
+    """Check whether a column type is covered by the index (string or list<string>)."""
+    if pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(data_type):
+        data_type = data_type.value_type
+    return pyarrow.types.is_string(data_type) or pyarrow.types.is_large_string(data_type)
+
+
+class ColumnIndex:
+    """Token postings for a single column.
+
+    Postings are stored as three compact numpy arrays: the sorted unique
+    ``terms``, an ``offsets`` array delimiting each term's slice, and the
+    concatenated, per-term sorted ``postings`` of row ids. Edits are kept in
+    a small overlay (``stale_rows`` and ``extra``) instead of rebuilding.
+    """
+
+    def __init__(self, terms: np.ndarray, offsets: np.ndarray, postings: np.ndarray):
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.stale_rows: Set[int] = set()
+        self.extra: Dict[str, Set[int]] = {}
+
+    @classmethod
+    def build(cls, column: pyarrow.ChunkedArray) -> 'ColumnIndex':
+        """Build the index for a string or list<string> column with Arrow compute.
+
+        Args:
+            column: Column to index
+
+        Returns:
+            ColumnIndex for the column
+        """
+        array = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+        num_rows = len(array)
+
+        if pyarrow.types.is_list(array.type) or pyarrow.types.is_large_list(array.type):
+            rows = pc.list_parent_indices(array).to_numpy()
+            array = pc.list_flatten(array)
+        else:
+            rows = np.arange(num_rows, dtype=np.int64)
+
+        split = pc.split_pattern_regex(pc.utf8_lower(array), TOKEN_SPLIT_PATTERN)
+        tokens = pc.list_flatten(split)
+        rows = rows[pc.list_parent_indices(split).to_numpy()]
+
+        non_empty = pc.not_equal(tokens, '')
+        tokens = tokens.filter(non_empty)
+        rows = rows[non_empty.to_numpy(zero_copy_only=False)]
+
+        if len(tokens) == 0:
+            return cls(np.array([], dtype=object), np.zeros(1, dtype=np.int64),
+                       np.array([], dtype=np.int32))
+
+        # Rank the distinct tokens so term ids follow lexical order
+        encoded = pc.dictionary_encode(tokens)
+        dictionary = encoded.dictionary.to_numpy(zero_copy_only=False)
+        order = np.argsort(dictionary, kind='stable')
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        term_ids = rank[encoded.indices.to_numpy()]
+
+        # Sort and deduplicate (term, row) pairs in a single pass
+        keys = np.unique(term_ids * max(num_rows, 1) + rows)
+        sorted_terms = keys // max(num_rows, 1)
+        postings = (keys % max(num_rows, 1)).astype(np.int32)
+        offsets = np.searchsorted(sorted_terms, np.arange(len(order) + 1)).astype(np.int64)
+
+        return cls(dictionary[order], offsets, postings)
+
+    def lookup(self, token: str, prefix: bool = False) -> np.ndarray:
+        """Find the rows containing a token.
+
+        Args:
+            token: Lowercase token to look up
+            prefix: If True, match every term starting with ``token``
+
+        Returns:
+            Sorted array of matching row ids
+        """
+        low = np.searchsorted(self.terms, token, side='left')
+        if prefix:
+            high = np.searchsorted(self.terms, token[:-1] + chr(ord(token[-1]) + 1), side='left')
+        else:
+            high = low + 1 if low < len(self.terms) and self.terms[low] == token else low
+
+        rows = self.postings[self.offsets[low]:self.offsets[high]]
+        if high - low > 1:
+            rows = np.unique(rows)
+
+        if self.stale_rows:
+            rows = rows[~np.isin(rows, np.fromiter(self.stale_rows, dtype=np.int64))]
+
+        extra_rows = [
+            row_set for term, row_set in self.extra.items()
+            if (term.startswith(token) if prefix else term == token)
+        ]
+        if extra_rows:
+            rows = np.union1d(rows, np.fromiter(set().union(*extra_rows), dtype=np.int64))
+        return rows
+
+    def update(self, row: int, value: Any) -> None:
+        """Re-index one cell after an edit.
+
+        Args:
+            row: Row id of the edited cell
+            value: New cell value (string, list of strings or None)
+        """
+        self.stale_rows.add(row)
+        for row_set in self.extra.values():
+            row_set.discard(row)
+        for token in _value_tokens(value):
+            self.extra.setdefault(token, set()).add(row)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the postings arrays."""
+        return int(self.offsets.nbytes + self.postings.nbytes
+                   + sum(len(term) for term in self.terms) + self.terms.nbytes)
+
+
+def _value_tokens(value: Any) -> Set[str]:
+    """Tokenize a Python cell value (string or list of strings)."""
+    if value is None:
+        return set()
+    if isinstance(value, str):
+        return set(tokenize(value))
+    if isinstance(value, Iterable) and not isinstance(value, (bytes, dict)):
+        tokens = set()
+        for item in value:
+            if isinstance(item, str):
+                tokens.update(tokenize(item))
+        return tokens
+    return set()
+
+
+class SearchIndex:
+    """Inverted index over all string and list<string> columns of a table."""
+
+    def __init__(self, columns: Dict[str, ColumnIndex]):
+        self.columns = columns
+
+    @classmethod
+    def build(cls, table: pyarrow.Table) -> 'SearchIndex':
+        """Build an index for every indexable column of a table.
+
+        Args:
+            table: PyArrow table to index
+
+        Returns:
+            SearchIndex for the table
+        """
+        columns = {
+            field.name: ColumnIndex.build(table.column(field.name))
+            for field in table.schema if is_indexable(field.type)
+        }
+        return cls(columns)
+
+    def search(self, query: str, columns: Optional[Iterable[str]] = None) -> np.ndarray:
+        """Find rows matching every token of a query.
+
+        All tokens but the last must match a whole word; the last one is
+        matched as a prefix so results update while the user is typing.
+
+        Args:
+            query: Free text query
+            columns: Restrict the search to these columns, all when None
+
+        Returns:
+            Sorted array of matching row ids
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return np.array([], dtype=np.int64)
+
+        indexes = [self.columns[name] for name in (columns or self.columns) if name in self.columns]
+        result = None
+        for position, token in enumerate(tokens):
+            prefix = position == len(tokens) - 1
+            matches = [index.lookup(token, prefix) for index in indexes]
+            rows = np.unique(np.concatenate(matches)) if matches else np.array([], dtype=np.int64)
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result.astype(np.int64)
+
+    def update(self, row: int, column: str, value: Any) -> None:
+        """Update the index after a cell edit; non-indexed columns are ignored.
+
+        Args:
+            row: Row id of the edited cell
+            column: Name of the edited column
+            value: New cell value
+        """
+        if column in self.columns:
+            self.columns[column].update(row, value)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the index."""
+        return sum(index.nbytes for index in self.columns.values())
@@ -13,3 +13,23 @@ class ORCSaveError(ORCEditorError):
 class SchemaValidationError(ORCEditorError):
     """Raised when schema validation fails"""
     pass
+
+class FilterExpressionError(ORCEditorError):
+    """Raised when a filter expression cannot be compiled or evaluated"""
+    pass
+
+class OperationError(ORCEditorError):
+    """Raised when an operations script is invalid or cannot be applied"""
+    pass
+
+class ORCImportError(ORCEditorError):
+    """Raised when importing data into an ORC file fails"""
+    pass
+
+class ORCJournalError(ORCEditorError):
+    """Raised when the edit journal cannot be written, read or replayed"""
+    pass
+
+class UnsupportedOperationError(ORCEditorError):
+    """Raised when the backend holding a file cannot perform an operation"""
+    pass
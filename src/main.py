@@ -1,7 +1,9 @@
 import tkinter as tk
 from src.ui.orc_editor import ORCEditor
+from src.utils.timing import configure_logging
 
 if __name__ == "__main__":
+    configure_logging()
     root = tk.Tk()
     app = ORCEditor(root)
     root.mainloop()
@@ -1,13 +1,31 @@
+import logging
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
-import numpy as np
-import pandas as pd
-import pyarrow
-import pyarrow.orc as orc
-
-from src.components.add_column_dialog import AddColumnDialog
-from src.components.edit_dialog import EditDialog
+# numpy, pandas, pyarrow and the dialogs are imported on first use (and
+# warmed up on a background thread) so the window appears without them
+from src.components.file_tab import FileTab
+from src.components.filter_bar import FilterBar
+from src.components.find_bar import FindBar
+from src.components.status_bar import StatusBar
+from src.utils import timing
+from src.utils.config import Config
+from src.utils.workers import shared_pool
+
+# Modules imported in the background once the window is on screen
+WARM_UP_MODULES = (
+    'numpy',
+    'pandas',
+    'pyarrow',
+    'pyarrow.orc',
+    'src.data.data_manager',
+    'src.data.arrow_backend',
+    'src.components.edit_dialog',
+    'src.components.add_column_dialog',
+)
+
+logger = logging.getLogger('orc_editor.ui')
 
 
 class ORCEditor:
@@ -16,10 +34,6 @@ class ORCEditor:
     def __init__(self, root):
         self.root = root
         self.root.title("ORC File Editor")
-        self.current_file = None
-        self.df = None
-        self.original_schema = None
-        self.original_metadata = None
 
         # Initialize the show_empty_columns attribute with default value
         self.show_empty_columns = False  # Default: hide empty columns
@@ -31,15 +45,21 @@ class ORCEditor:
         # Create main container
         main_frame = ttk.Frame(root, padding="10")
         main_frame.grid(row=0, column=0, sticky="nsew")
-        main_frame.grid_rowconfigure(1, weight=1)
+        main_frame.grid_rowconfigure(3, weight=1)
         main_frame.grid_columnconfigure(0, weight=1)
 
         # Create toolbar with callbacks
         callbacks = {
             "Open ORC": self.open_file,
             "Save ORC": self.save_file,
+            "Close File": self.close_tab,
             "Edit Row": self.edit_selected,
             "Add Column": self.add_column,
+            "Spark Schema": self.show_spark_schema,
+            "Statistics": self.show_statistics,
+            "Compare": self.compare_files,
+            "Export": self.export_data,
+            "Import": self.import_data,
             "toggle_empty_columns": self.toggle_empty_columns
         }
 
@@ -48,8 +68,98 @@ class ORCEditor:
         toolbar.grid(row=0, column=0, sticky="ew", pady=(0, 10))
         self.toolbar = toolbar
 
-        # Create scrollable frame for the table
-        self.create_table_view(main_frame)
+        # Find bar backed by the search index built after each load
+        self.find_bar = FindBar(main_frame, self.find, self.find_next, self.find_previous)
+        self.find_bar.grid(row=1, column=0, sticky="ew", pady=(0, 10))
+
+        # Filter bar evaluated with Arrow compute into a selection vector
+        self.filter_bar = FilterBar(main_frame, self.apply_filter, self.clear_filter)
+        self.filter_bar.grid(row=2, column=0, sticky="ew", pady=(0, 10))
+
+        # One tab per open file, each with its own backend and table view;
+        # memory budget, stripe cache and worker threads are shared
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.grid(row=3, column=0, sticky="nsew")
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.notebook.bind("<Button-2>", self._on_tab_middle_click)
+        self._active_tab = None
+        self._new_tab()
+
+        # Timing breakdown of the last operation
+        self.status_bar = StatusBar(main_frame)
+        self.status_bar.grid(row=4, column=0, sticky="ew", pady=(5, 0))
+        self.root.after(Config.WARM_UP_DELAY_MS, self._start_warm_up)
+
+    @property
+    def tab(self):
+        """The tab shown in the notebook."""
+        return self.notebook.nametowidget(self.notebook.select())
+
+    @property
+    def data_manager(self):
+        """The data backend of the shown file, created (and its modules imported) on first use."""
+        tab = self.tab
+        if tab.data_manager is None:
+            from src.data.data_manager import ORCDataManager
+            tab.data_manager = ORCDataManager()
+        return tab.data_manager
+
+    @property
+    def current_file(self):
+        return self.tab.current_file
+
+    @property
+    def tree(self):
+        return self.tab.tree
+
+    def _start_warm_up(self):
+        """Import the heavy modules in the background after the first paint."""
+        def run():
+            import importlib
+            with timing.span("warm up"):
+                for name in WARM_UP_MODULES:
+                    importlib.import_module(name)
+
+        def failed(error):
+            logger.error("Warming up failed: %s", error)
+            self._poll_memory()
+
+        # The memory display starts once the data modules are loaded
+        self._run_background(run, lambda result: self._poll_memory(), failed)
+
+    def _run_background(self, function, on_done, on_error, on_progress=None, alive=None):
+        """Run a function on the shared worker pool and report back on the UI thread.
+
+        Args:
+            function: Called without arguments on a worker thread
+            on_done: Receives the function's result once it returns
+            on_error: Receives the exception if it raised
+            on_progress: Called every poll while the function runs
+            alive: Polling stops silently once this returns False, e.g.
+                when the window showing the result was closed
+        """
+        self._poll_background(shared_pool().submit(function), on_done, on_error, on_progress, alive)
+
+    def _poll_background(self, future, on_done, on_error, on_progress, alive):
+        if alive is not None and not alive():
+            return
+        if not future.done():
+            if on_progress is not None:
+                on_progress()
+            self.root.after(100, lambda: self._poll_background(future, on_done, on_error,
+                                                               on_progress, alive))
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            on_error(e)
+            return
+        on_done(result)
+
+    @property
+    def original_schema(self):
+        """The schema of the loaded file, including added columns."""
+        return self.data_manager.original_schema
 
     # Make sure toggle_empty_columns method is correct
     def toggle_empty_columns(self):
@@ -57,184 +167,164 @@ class ORCEditor:
         self.show_empty_columns = not self.show_empty_columns  # Toggle the state
         self.update_table_view()  # Refresh the table view
 
-    # Replace the create_file_buttons method in ORCEditor class
-    def create_file_buttons(self, parent):
-        button_frame = ttk.Frame(parent)
-        button_frame.grid(row=0, column=0, sticky="ew", pady=(0, 10))
+    def _new_tab(self):
+        """Add an empty tab and show it."""
+        tab = FileTab(self.notebook, self.edit_selected, self.show_header_menu)
+        self.notebook.add(tab, text=tab.title)
+        self.notebook.select(tab)
+        self._on_tab_changed()
+        return tab
+
+    def _tab_for_file(self, filename):
+        """The tab a file is open in, or None."""
+        for name in self.notebook.tabs():
+            tab = self.notebook.nametowidget(name)
+            if tab.current_file and os.path.abspath(tab.current_file) == os.path.abspath(filename):
+                return tab
+        return None
+
+    def _on_tab_changed(self, event=None):
+        """Hide the rows of the previous tab and show the selected one with its filter and find state."""
+        tab = self.tab
+        previous = self._active_tab
+        if previous is tab:
+            return
+        if previous is not None:
+            previous.filter_expression = self.filter_bar.get_expression()
+            previous.filter_status = self.filter_bar.status.cget("text")
+            previous.find_query = self.find_bar.get_query()
+            previous.find_status = self.find_bar.status.cget("text")
+            previous.hide()
+
+        self._active_tab = tab
+        self.filter_bar.set_expression(tab.filter_expression)
+        self.filter_bar.set_status(tab.filter_status)
+        self.find_bar.set_query(tab.find_query)
+        self.find_bar.set_status(tab.find_status)
+        self.root.title(f"ORC File Editor - {tab.title}" if tab.current_file else "ORC File Editor")
+        if not tab.is_empty:
+            self.update_table_view()
+            tab.restore_selection()
+
+    def _on_tab_middle_click(self, event):
+        """Close the tab under the mouse."""
+        try:
+            index = self.notebook.index(f"@{event.x},{event.y}")
+        except tk.TclError:
+            return
+        if isinstance(index, int):
+            self.close_tab(self.notebook.nametowidget(self.notebook.tabs()[index]))
+
+    def close_tab(self, tab=None):
+        """Close a file's tab; unsaved edits stay in its journal and are offered again on reopening."""
+        tab = tab if tab is not None else self.tab
+        journal = tab.data_manager.journal if tab.data_manager is not None else None
+        if journal is not None and journal.records and not messagebox.askyesno(
+                "Close File",
+                f"{tab.title} has {journal.records:,} unsaved edits. They are kept and offered "
+                "again when the file is opened. Close it?"):
+            return
+
+        if tab.data_manager is not None:
+            tab.data_manager.close()
+        if tab is self._active_tab:
+            self._active_tab = None
+        self.notebook.forget(tab)
+        tab.destroy()
+        if self.notebook.tabs():
+            self._on_tab_changed()
+        else:
+            self._new_tab()
 
-        # Add standard buttons
-        ttk.Button(button_frame, text="Open ORC", command=self.open_file).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Save ORC", command=self.save_file).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Edit Row", command=self.edit_selected).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Add Column", command=self.add_column).pack(side=tk.LEFT, padx=5)
+    def _refresh(self, tab):
+        """Show changes to a tab's data; hidden tabs are rendered when shown."""
+        if tab is self._active_tab:
+            self.update_table_view()
 
-        # Add a toggle button for empty columns
-        self.show_empty_columns = False  # Default: hide empty columns
-        ttk.Button(
-            button_frame,
-            text="Toggle Empty Columns",
-            command=self.toggle_empty_columns
-        ).pack(side=tk.LEFT, padx=5)
-
-    def create_table_view(self, parent):
-        # Create frame for the table and scrollbars
-        table_frame = ttk.Frame(parent)
-        table_frame.grid(row=1, column=0, sticky="nsew")
-        table_frame.grid_rowconfigure(0, weight=1)
-        table_frame.grid_columnconfigure(0, weight=1)
-
-        # Create canvas and scrollbars
-        canvas = tk.Canvas(table_frame)
-        vscrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=canvas.yview)
-        hscrollbar = ttk.Scrollbar(table_frame, orient="horizontal", command=canvas.xview)
-
-        # Create frame inside canvas for the treeview
-        self.tree_frame = ttk.Frame(canvas)
-
-        # Create Treeview
-        self.tree = ttk.Treeview(self.tree_frame)
-        self.tree.pack(fill=tk.BOTH, expand=True)
-
-        # Configure canvas
-        canvas.configure(yscrollcommand=vscrollbar.set, xscrollcommand=hscrollbar.set)
-
-        # Add bindings for double-click
-        self.tree.bind('<Double-1>', lambda e: self.edit_selected())
-
-        # Layout
-        canvas.grid(row=0, column=0, sticky="nsew")
-        vscrollbar.grid(row=0, column=1, sticky="ns")
-        hscrollbar.grid(row=1, column=0, sticky="ew")
-
-        # Create window inside canvas
-        canvas.create_window((0, 0), window=self.tree_frame, anchor="nw")
-
-        # Configure scroll region when frame changes
-        self.tree_frame.bind("<Configure>",
-                             lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-
-    def is_empty_list_column(self, column):
-        """Check if a column contains only empty lists/arrays or NaN values."""
-        if column not in self.df.columns:
-            return True
-
-        for value in self.df[column]:
-            if isinstance(value, (np.ndarray, list)):
-                if isinstance(value, np.ndarray) and value.size > 0:
-                    return False
-                if isinstance(value, list) and len(value) > 0:
-                    return False
-            elif not pd.isna(value):  # If it's not an empty list/array and not NaN
-                return False
-        return True
+    def _visible_columns(self):
+        """Columns shown in the table view, honoring the empty column toggle."""
+        if self.show_empty_columns:
+            return self.data_manager.column_names
+        return self.data_manager.get_column_names()
 
     def update_table_view(self):
+        with timing.span("render"):
+            self._populate_tree()
+
+    def _populate_tree(self):
         # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.tree.delete(*self.tree.get_children())
 
-        if self.df is None or self.df.empty:
+        if not self.data_manager.loaded or self.data_manager.num_rows == 0:
             return
 
         # Determine visible columns based on the toggle state
-        if self.show_empty_columns:
-            # Show all columns
-            visible_columns = list(self.df.columns)
-        else:
-            # Hide empty columns
-            visible_columns = [col for col in self.df.columns if not self.is_empty_list_column(col)]
+        visible_columns = self._visible_columns()
 
         # Configure columns
         self.tree["columns"] = visible_columns
         self.tree["show"] = "headings"
 
+        sort_column, descending = self.data_manager.sort_key or (None, False)
         for column in visible_columns:
-            self.tree.heading(column, text=column)
+            arrow = (" \u25bc" if descending else " \u25b2") if column == sort_column else ""
+            self.tree.heading(column, text=column + arrow)
             self.tree.column(column, width=100)
 
-        # Add data
-        for idx, row in self.df.iterrows():
-            values = []
-            for col in visible_columns:
-                value = row[col]
-                if isinstance(value, (np.ndarray, list)):
-                    if isinstance(value, np.ndarray):
-                        value = f"[{','.join(map(str, value))}]" if value.size > 0 else '[]'
-                    else:  # list
-                        value = f"[{','.join(map(str, value))}]" if value else '[]'
-                elif pd.api.types.is_integer_dtype(self.df[col].dtype):
-                    try:
-                        value = 0 if pd.isna(value) else int(value)
-                    except (ValueError, TypeError):
-                        value = 0
-                values.append(str(value))
-            self.tree.insert("", "end", values=values)
+        # Add data for the rows selected by the active filter, in sort order;
+        # lazy backends only render the first display_limit of them. Each
+        # item's iid is its row position in the file, so items map to rows
+        # (and back) directly however the view is filtered or sorted
+        rows = self.data_manager.view_rows(self.data_manager.display_limit)
+        for row, values in zip(rows, self.data_manager.display_rows(rows, visible_columns)):
+            self.tree.insert("", "end", iid=str(row), values=values)
+
+        selection = self.data_manager.selection
+        total = self.data_manager.num_rows if selection is None else len(selection)
+        if len(rows) < total:
+            self.filter_bar.set_status(f"Showing the first {len(rows):,} of {total:,} rows; "
+                                       "filter to narrow them down")
+
+    def selected_rows(self):
+        """Row positions of the selected items, in view order."""
+        return [int(item) for item in self.tree.selection()]
 
     def edit_selected(self):
-        selection = self.tree.selection()
-        if not selection:
+        rows = self.selected_rows()
+        if not rows:
             messagebox.showwarning("Warning", "Please select a row to edit")
             return
 
-        idx = self.tree.index(selection[0])  # Get the index of the selected row
-        visible_columns = [col for col in self.df.columns if not self.is_empty_list_column(col)]
-
-        # Open the EditDialog
-        dialog = EditDialog(self.root, self.df, idx, visible_columns)
-        self.root.wait_window(dialog)  # Wait for the dialog to close
-
-        # If changes were made and confirmed
-        if dialog.result:
-            try:
-                # Update the DataFrame with the new values
-                for col, value in dialog.result.items():
-                    if isinstance(value, list):
-                        print("List value:", value)
-                        if isinstance(self.df.loc[idx, col], np.ndarray):
-                            print("Existing value in DataFrame (numpy array):", self.df.loc[idx, col])
-                            if self.df.loc[idx, col].size and isinstance(self.df.loc[idx, col][0], dict):
-                                # Handle list of dictionaries in a numpy array
-                                value = np.array(value)
-                                # Update the entire array at once
-                                self.df.at[idx, col] = value
-                            else:
-                                # Handle regular numpy arrays
-                                self.df.at[idx, col] = value
-                        else:
-                            # Handle regular Python lists
-                            self.df.at[idx, col] = value
-                    else:
-                        # Handle scalar values (e.g., strings, integers, dictionaries)
-                        self.df.at[idx, col] = value
-
-                # Refresh the table view to reflect the changes
-                self.update_table_view()
-
-                # Debugging: Print the updated row
-                print("Updated row:", self.df.iloc[idx])
-
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to update row: {str(e)}")
-                print("Error updating row:", e)
-                print(f"Column: {col}, Value: {value}, Type: {type(value)}")
-                print(f"Existing value in DataFrame: {self.df.loc[idx, col]}, Type: {type(self.df.loc[idx, col])}")
-
-    def get_pandas_type(self, pa_type):
-        """Map PyArrow types to pandas dtypes"""
-        import pyarrow as pa
-
-        # Define type mappings
-        type_mapping = {
-            pa.timestamp('ms'): 'datetime64[ms]',
-            pa.int64(): 'int64',
-            pa.int32(): 'int32',
-            pa.float64(): 'float64',
-            pa.float32(): 'float32',
-            pa.string(): 'object',
-            pa.bool_(): 'bool',
-        }
-
-        return type_mapping.get(pa_type, None)
+        # The dialog shows the focused row; the fields changed in it are
+        # written to every selected row
+        focus = self.tree.focus()
+        idx = int(focus) if focus in self.tree.selection() else rows[0]
+        visible_columns = self.data_manager.get_column_names()
+
+        # Open the EditDialog; parsing the entered values is timed, the wait is not
+        with timing.operation("edit row"):
+            from src.components.edit_dialog import EditDialog
+            row = self.data_manager.row_frame(idx, visible_columns)
+            dialog = EditDialog(self.root, row, 0, visible_columns)
+            if len(rows) > 1:
+                dialog.title(f"Edit {len(rows):,} Rows")
+            with timing.idle():
+                self.root.wait_window(dialog)  # Wait for the dialog to close
+
+            # If changes were made and confirmed
+            if dialog.result:
+                try:
+                    # Update the data with the new values
+                    with timing.span("update"):
+                        for row_idx in rows:
+                            self.data_manager.update_row(row_idx, dialog.result)
+
+                    # Refresh the table view to reflect the changes
+                    self.update_table_view()
+
+                except Exception as e:
+                    logger.exception("Failed to update rows %s", rows)
+                    messagebox.showerror("Error", f"Failed to update row: {str(e)}")
 
     def open_file(self):
         filename = filedialog.askopenfilename(
@@ -242,72 +332,87 @@ class ORCEditor:
         )
         if filename:
             try:
-                self.current_file = filename
-                orc_file = orc.ORCFile(filename)
-                table = orc_file.read()
+                with timing.operation("open"):
+                    loaded = self._load(filename)
+                if loaded:
+                    self.start_index_build()
+            except Exception as e:
+                logger.exception("Failed to open %s", filename)
+                messagebox.showerror("Error", f"Failed to open file: {str(e)}")
 
-                # Store the original schema and metadata
-                self.original_schema = table.schema
-                self.original_metadata = table.schema.metadata
+    def _load(self, filename):
+        """Open a file in a tab, with the backend suited to its size, and show it.
 
-                # First convert to pandas without type mapping
-                self.df = table.to_pandas()
+        The file goes into the shown tab when that is still empty, otherwise
+        into a new one. A file that is already open is only switched to.
 
-                # Then apply type conversions after the fact
-                for field in table.schema:
-                    if str(field.type) == 'timestamp[ms]' or str(field.type) == 'int64':
-                        if field.name in self.df.columns:
-                            # Fill NaN values with -1 before converting to int64
-                            self.df[field.name] = self.df[field.name].fillna(-1).astype('int64')
+        Returns:
+            Whether the file was loaded
+        """
+        from src.data.backend import open_backend
 
-                self.update_table_view()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to open file: {str(e)}")
+        tab = self._tab_for_file(filename)
+        if tab is not None:
+            self.notebook.select(tab)
+            self._on_tab_changed()
+            return False
 
-    def compare_schemas(self, original_schema, saved_schema):
-        """Compare two schemas and return differences"""
-
-        def schema_to_dict(schema):
-            result = {}
-            for field in schema:
-                if isinstance(field.type, pyarrow.ListType):
-                    list_type = field.type
-                    if isinstance(list_type.value_type, pyarrow.StructType):
-                        struct_fields = {}
-                        for struct_field in list_type.value_type:
-                            struct_fields[struct_field.name] = str(struct_field.type)
-                        result[field.name] = {
-                            'type': 'list<struct>',
-                            'struct_fields': struct_fields
-                        }
-                    else:
-                        result[field.name] = f'list<{str(list_type.value_type)}>'
-                else:
-                    result[field.name] = str(field.type)
-            return result
-
-        original_dict = schema_to_dict(original_schema)
-        saved_dict = schema_to_dict(saved_schema)
-
-        differences = []
-        for field in original_dict:
-            if field not in saved_dict:
-                differences.append(f"Missing field in saved schema: {field}")
-            elif original_dict[field] != saved_dict[field]:
-                differences.append(
-                    f"Type mismatch for {field}:\n"
-                    f"  Original: {original_dict[field]}\n"
-                    f"  Saved: {saved_dict[field]}"
-                )
+        added = not self.tab.is_empty
+        tab = self._new_tab() if added else self.tab
+        if tab.data_manager is not None:
+            tab.data_manager.close()
+        tab.data_manager = open_backend(filename)
+        try:
+            tab.data_manager.load_file(filename)
+        except Exception:
+            tab.data_manager.close()
+            tab.data_manager = None
+            if added:
+                self.close_tab(tab)
+            raise
+
+        tab.current_file = filename
+        self.notebook.tab(tab, text=tab.title)
+        self.root.title(f"ORC File Editor - {tab.title}")
+        self._start_journal(filename)
+        self.update_table_view()
+        return True
 
-        for field in saved_dict:
-            if field not in original_dict:
-                differences.append(f"Extra field in saved schema: {field}")
+    def _start_journal(self, filename):
+        """Journal the edits to a newly opened file, offering to recover earlier ones."""
+        from src.exceptions.orc_exceptions import ORCJournalError
 
-        return differences
+        try:
+            pending = self.data_manager.recoverable_edits()
+            with timing.idle():
+                recover = pending > 0 and messagebox.askyesno(
+                    "Recover Edits",
+                    f"{pending:,} unsaved edits to {os.path.basename(filename)} were found "
+                    "from an earlier session. Apply them?"
+                )
+            self.data_manager.start_journal(recover)
+        except ORCJournalError as e:
+            logger.exception("Failed to recover edits to %s", filename)
+            messagebox.showerror("Error", f"{str(e)}\n\nThe file is opened without them.")
+            self.data_manager.load_file(filename)
+            self.data_manager.start_journal()
+
+    def _poll_memory(self):
+        """Show memory use and release caches when over budget."""
+        memory = self.data_manager.memory
+        report = memory.report()
+        if report.over_budget:
+            released = memory.enforce()
+            if released:
+                logger.info("Over the memory budget, released: %s", ", ".join(released))
+                report = memory.report()
+            if 'search index' in released:
+                self.find_bar.set_status("Index released to save memory")
+        self.status_bar.set_memory(report.summary(), report.over_budget)
+        self.root.after(Config.MEMORY_POLL_MS, self._poll_memory)
 
     def save_file(self):
-        if self.df is None:
+        if not self.data_manager.loaded:
             messagebox.showwarning("Warning", "No data to save")
             return
 
@@ -320,72 +425,36 @@ class ORCEditor:
             return
 
         try:
-            # Debug: Print the DataFrame before saving
-            print("DataFrame before saving:")
-            print(self.df.head())
-
-            if hasattr(self, 'original_schema'):
-                print("Using original schema for saving:", self.original_schema)
-
-                # Create table with original schema
-                table = pyarrow.Table.from_pandas(
-                    self.df,
-                    schema=self.original_schema
-                )
-
-                # Set metadata if it exists
-                if hasattr(self, 'original_metadata'):
-                    table = table.replace_schema_metadata(self.original_metadata)
-            else:
-                print("Warning: No original schema available, inferring schema from data")
-                table = pyarrow.Table.from_pandas(self.df)
-
-            # Save the file
-            with pyarrow.orc.ORCWriter(filename) as writer:
-                writer.write(table)
-
-            # Debug: Print the saved file's schema and data
-            print("Saved file schema:")
-            orc_file = orc.ORCFile(filename)
-            saved_table = orc_file.read()
-            saved_schema = saved_table.schema
-            print(saved_schema.to_string(show_field_metadata=True))
-
-            print("Saved file data:")
-            print(saved_table.to_pandas().head())
-
-            # Compare schemas
-            if hasattr(self, 'original_schema'):
-                differences = self.compare_schemas(self.original_schema, saved_schema)
-                if differences:
-                    mismatch_msg = "Schema differences detected:\n" + "\n".join(differences)
-                    messagebox.showwarning("Schema Mismatch Warning", mismatch_msg)
-
-                    # Print detailed schema information for debugging
-                    print("\nDetailed Schema Information:")
-                    print("Original Schema:")
-                    print(self.original_schema.to_string(show_field_metadata=True))
-                    print("\nSaved Schema:")
-                    print(saved_schema.to_string(show_field_metadata=True))
-                else:
-                    messagebox.showinfo("Success", "File saved successfully with schema preserved")
+            # Only edited data is converted; the rest is written back from Arrow
+            with timing.operation("save"):
+                validation = self.data_manager.save_file(filename)
+
+            # The tab now edits the saved file
+            self.tab.current_file = filename
+            self.notebook.tab(self.tab, text=self.tab.title)
+            self.root.title(f"ORC File Editor - {self.tab.title}")
+
+            if validation.has_differences:
+                mismatch_msg = "Schema differences detected:\n" + "\n".join(validation.differences)
+                messagebox.showwarning("Schema Mismatch Warning", mismatch_msg)
             else:
-                messagebox.showinfo("Success", "File saved successfully")
+                messagebox.showinfo("Success", "File saved successfully with schema preserved")
 
         except Exception as e:
             import traceback
-            print("Error saving file:", traceback.format_exc())
+            logger.exception("Failed to save %s", filename)
             messagebox.showerror("Error", f"Failed to save file: {str(e)}")
             detail_msg = "Details:\n" + traceback.format_exc()
             messagebox.showerror("Detailed Error", detail_msg)
 
     def add_column(self):
         """Open dialog to add a new column to the dataset."""
-        if self.df is None:
+        if not self.data_manager.loaded:
             messagebox.showwarning("Warning", "Please open an ORC file first")
             return
 
         # Create dialog
+        from src.components.add_column_dialog import AddColumnDialog
         dialog = AddColumnDialog(self.root)
         self.root.wait_window(dialog)
 
@@ -397,40 +466,394 @@ class ORCEditor:
                 default_value = dialog.result['default_value']
 
                 # Check if column already exists
-                if column_name in self.df.columns:
+                if column_name in self.data_manager.column_names:
                     messagebox.showerror("Error", f"Column '{column_name}' already exists")
                     return
 
-                # Add the column to the DataFrame
-                self.df[column_name] = default_value
+                # Add the column to the DataFrame and schema
+                with timing.operation("add column"):
+                    self.data_manager.add_column(column_name, data_type, default_value)
+
+                    # Update table view
+                    self.update_table_view()
+
+                messagebox.showinfo("Success", f"Added new column: {column_name}")
+
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to add column: {str(e)}")
+
+    def show_spark_schema(self):
+        """Show the Spark DDL and StructType for the loaded file's schema."""
+        if self.original_schema is None:
+            messagebox.showwarning("Warning", "Please open an ORC file first")
+            return
+
+        from src.utils.spark import detect_json_columns, schema_to_spark_ddl, schema_to_spark_struct
 
-                # Update schema
-                if hasattr(self, 'original_schema'):
-                    # Import pyarrow and type utils
-                    import pyarrow as pa
-                    from src.utils.type_utils import get_pyarrow_type
+        # JSON detection samples the first stripe of the source file and is cached
+        json_columns = {}
+        if self.current_file:
+            try:
+                json_columns = detect_json_columns(self.current_file)
+            except Exception:
+                json_columns = {}
+
+        text = (
+            "-- Spark SQL DDL\n"
+            + schema_to_spark_ddl(self.original_schema, json_columns)
+            + "\n\n# PySpark StructType\n"
+            + schema_to_spark_struct(self.original_schema, json_columns)
+        )
 
-                    # Get PyArrow type for the new column
-                    pa_type = get_pyarrow_type(data_type)
+        window = tk.Toplevel(self.root)
+        window.title("Spark Schema")
+        window.geometry("700x500")
+
+        schema_text = tk.Text(window, wrap=tk.NONE, width=80, height=25)
+        schema_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        schema_text.insert("1.0", text)
+
+        ttk.Button(window, text="Close", command=window.destroy).pack(pady=(0, 10))
+
+    def start_index_build(self):
+        """Build the full-text search index in the background."""
+        self.find_bar.set_status("Indexing...")
+        tab = self.tab
+
+        def show_status(status):
+            if tab is not self._active_tab:
+                tab.find_status = status  # Shown when the user switches back
+                return
+            self.find_bar.set_status(status)
+            if not status and self.find_bar.get_query():
+                self.find(self.find_bar.get_query())
+
+        self._run_background(self.data_manager.prepare_search_index(),
+                             lambda index: show_status(""),
+                             lambda error: show_status(f"Indexing failed: {error}"))
+
+    def apply_filter(self, expression):
+        """Filter the table view with an Arrow compute expression."""
+        if not self.data_manager.loaded:
+            self.filter_bar.set_status("Open an ORC file first")
+            return
 
-                    # Create new field
-                    new_field = pa.field(column_name, pa_type)
+        with timing.operation("filter"):
+            try:
+                with timing.span("filter"):
+                    selection = self.data_manager.apply_filter(expression)
+            except Exception as e:
+                self.filter_bar.set_status(str(e))
+                return
 
-                    # Create new schema with the additional field
-                    fields = list(self.original_schema)
-                    fields.append(new_field)
+            self.update_table_view()
+        if selection is None:
+            self.filter_bar.set_status("")
+        else:
+            self.filter_bar.set_status(f"{len(selection)} of {self.data_manager.num_rows} rows")
+        self.find(self.find_bar.get_query())
 
-                    # Update original schema
-                    self.original_schema = pa.schema(fields)
+    def clear_filter(self):
+        """Show every row again."""
+        if not self.data_manager.loaded:
+            return
+        self.data_manager.clear_filter()
+        self.update_table_view()
+        self.find(self.find_bar.get_query())
+
+    def find(self, query):
+        """Search the index and jump to the first match."""
+        import numpy as np
+
+        if query and self.data_manager.search_index_released:
+            self.start_index_build()
+        self.tab.find_matches = self.data_manager.search(query) if query else []
+        if self.data_manager.selection is not None and len(self.tab.find_matches):
+            # Only rows visible through the filter can be navigated to
+            self.tab.find_matches = np.intersect1d(self.tab.find_matches, self.data_manager.selection)
+        self.tab.find_position = -1
+
+        if not query:
+            self.find_bar.set_status("")
+        elif self.data_manager.search_index is None:
+            self.find_bar.set_status("Indexing...")
+        elif len(self.tab.find_matches) == 0:
+            self.find_bar.set_status("No matches")
+        else:
+            self.find_next()
 
-                    # Update metadata if it exists
-                    if hasattr(self, 'original_metadata') and self.original_metadata:
-                        self.original_schema = self.original_schema.with_metadata(self.original_metadata)
+    def find_next(self):
+        """Move to the next match, wrapping around at the end."""
+        self._step_match(1)
 
-                # Update table view
+    def find_previous(self):
+        """Move to the previous match, wrapping around at the start."""
+        self._step_match(-1)
+
+    def _step_match(self, step):
+        """Select and scroll to the match ``step`` positions away."""
+        if len(self.tab.find_matches) == 0:
+            return
+
+        self.tab.find_position = (self.tab.find_position + step) % len(self.tab.find_matches)
+        row = int(self.tab.find_matches[self.tab.find_position])
+        self.find_bar.set_status(f"{self.tab.find_position + 1} of {len(self.tab.find_matches)}")
+
+        # Items are keyed by row position, wherever sorting put them
+        item = str(row)
+        if self.tree.exists(item):
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+            self.tree.see(item)
+
+    def show_statistics(self):
+        """Open the column statistics panel, scanning stripes in the background."""
+        if not self.data_manager.loaded:
+            messagebox.showwarning("Warning", "Please open an ORC file first")
+            return
+
+        from src.components.statistics_panel import StatisticsPanel
+        data_manager = self.data_manager
+        panel = StatisticsPanel(self.root, row_count=data_manager.num_rows)
+
+        # Already scanned: only stripes touched by edits are recomputed
+        statistics = data_manager.get_statistics()
+        if statistics is not None:
+            panel.show_statistics(statistics)
+            return
+
+        progress = {'done': 0, 'total': 0}
+        self._run_background(
+            lambda: data_manager.load_statistics(
+                lambda done, total: progress.update(done=done, total=total)
+            ),
+            lambda result: panel.show_statistics(data_manager.get_statistics()),
+            lambda error: panel.status.configure(text=f"Failed to compute statistics: {error}"),
+            on_progress=lambda: panel.set_progress(progress['done'], progress['total']),
+            alive=panel.winfo_exists,
+        )
+
+    def export_data(self):
+        """Export the current (edited) data to Parquet, CSV, JSON Lines or Arrow IPC."""
+        if not self.data_manager.loaded:
+            messagebox.showwarning("Warning", "Please open an ORC file first")
+            return
+
+        from src.components.export_dialog import ExportDialog
+        dialog = ExportDialog(self.root, self.data_manager.column_names, self.data_manager.filter_text)
+        self.root.wait_window(dialog)
+        if not dialog.result:
+            return
+
+        try:
+            export = self.data_manager.prepare_export(dialog.result['columns'],
+                                                      dialog.result['filtered'])
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Export")
+        status = ttk.Label(window, text="Exporting...", padding="20")
+        status.pack()
+        progress = {'done': 0, 'total': 0}
+
+        def show_progress():
+            if window.winfo_exists() and progress['total']:
+                status.configure(text=f"Exporting {progress['done']:,} of {progress['total']:,} rows...")
+
+        def done(exported):
+            if window.winfo_exists():
+                window.destroy()
+            messagebox.showinfo("Success", f"Exported {exported.rows:,} rows to {exported.destination} "
+                                           f"in {exported.seconds:.1f}s")
+
+        def failed(error):
+            if window.winfo_exists():
+                window.destroy()
+            messagebox.showerror("Error", f"Failed to export: {str(error)}")
+
+        self._run_background(
+            lambda: export(dialog.result['filename'],
+                           progress=lambda done, total: progress.update(done=done, total=total)),
+            done, failed, on_progress=show_progress,
+        )
+
+    def import_data(self):
+        """Convert a CSV, JSON Lines or Parquet file to ORC and open the result."""
+        source = filedialog.askopenfilename(
+            title="Import",
+            filetypes=[("Data files", "*.csv *.ndjson *.jsonl *.json *.parquet"), ("All files", "*.*")]
+        )
+        if not source:
+            return
+
+        schema_from = None
+        if self.current_file:
+            use_schema = messagebox.askyesnocancel(
+                "Target Schema",
+                "Convert the data to the schema of the open file?\n"
+                "Choose No to infer the schema from the input."
+            )
+            if use_schema is None:
+                return
+            if use_schema:
+                schema_from = self.original_schema
+
+        destination = filedialog.asksaveasfilename(
+            title="Save imported data as",
+            defaultextension=".orc",
+            filetypes=[("ORC files", "*.orc"), ("All files", "*.*")]
+        )
+        if not destination:
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Import")
+        status = ttk.Label(window, text="Importing...", padding="20")
+        status.pack()
+        progress = {'rows': 0}
+        data_manager = self.data_manager
+
+        def show_progress():
+            if window.winfo_exists():
+                status.configure(text=f"Imported {progress['rows']:,} rows...")
+
+        def failed(error):
+            if window.winfo_exists():
+                window.destroy()
+            messagebox.showerror("Error", f"Failed to import: {str(error)}")
+
+        def done(imported):
+            if window.winfo_exists():
+                window.destroy()
+            self._open_imported(imported)
+
+        self._run_background(
+            lambda: data_manager.import_file(source, destination, schema_from=schema_from,
+                                             progress=lambda rows: progress.update(rows=rows)),
+            done, failed, on_progress=show_progress,
+        )
+
+    def _open_imported(self, imported):
+        """Open the ORC file written by an import in a tab."""
+        if imported.mismatches:
+            messagebox.showwarning("Schema Mismatch Warning",
+                                   "Input and target schema differ:\n" + "\n".join(imported.mismatches))
+        try:
+            tab = self._tab_for_file(imported.destination)
+            if tab is not None:
+                self.close_tab(tab)  # Written over; open it again
+            if self._load(imported.destination):
+                self.start_index_build()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to open file: {str(e)}")
+
+    def compare_files(self):
+        """Diff the open file's rows against another ORC file in the background."""
+        if not self.current_file:
+            messagebox.showwarning("Warning", "Please open an ORC file first")
+            return
+
+        other = filedialog.askopenfilename(
+            title="Compare with",
+            filetypes=[("ORC files", "*.orc"), ("All files", "*.*")]
+        )
+        if not other:
+            return
+
+        from tkinter import simpledialog
+        keys = simpledialog.askstring(
+            "Key Columns",
+            "Columns identifying a row, comma separated\n(leave empty to compare whole rows):",
+            parent=self.root
+        )
+        if keys is None:
+            return
+        key_columns = [key.strip() for key in keys.split(",") if key.strip()]
+
+        from src.components.diff_view import DiffView
+        from src.data.orc_diff import diff_files
+        current_file = self.current_file
+        view = DiffView(self.root, current_file, other)
+        progress = {'text': 'Comparing...'}
+        self._run_background(
+            lambda: diff_files(current_file, other, key_columns,
+                               progress=lambda text: progress.update(text=text)),
+            view.show_result,
+            lambda error: view.set_progress(f"Failed to compare files: {error}"),
+            on_progress=lambda: view.set_progress(progress['text']),
+            alive=view.winfo_exists,
+        )
+
+    def show_header_menu(self, event):
+        """Offer column actions on a right-clicked heading, or exploring a nested cell."""
+        region = self.tree.identify_region(event.x, event.y)
+        if not self.data_manager.loaded or region not in ("heading", "cell"):
+            return
+        column_id = self.tree.identify_column(event.x)
+        columns = self.tree["columns"]
+        index = int(column_id.lstrip('#')) - 1
+        if not 0 <= index < len(columns):
+            return
+        column = columns[index]
+
+        from src.data.nested import is_expandable
+        nested = is_expandable(self.original_schema.field(column).type)
+
+        menu = tk.Menu(self.root, tearoff=0)
+        if region == "heading":
+            if not nested:
+                menu.add_command(label="Sort Ascending", command=lambda: self.sort_by_column(column))
+                menu.add_command(label="Sort Descending",
+                                 command=lambda: self.sort_by_column(column, descending=True))
+            if self.data_manager.sort_key is not None:
+                menu.add_command(label="Clear Sort", command=lambda: self.sort_by_column(None))
+            menu.add_separator()
+            menu.add_command(label=f"Profile '{column}'...", command=lambda: self.profile_column(column))
+        else:
+            if not nested:
+                return
+            row = int(self.tree.identify_row(event.y))
+            menu.add_command(label=f"Explore '{column}'...", command=lambda: self.explore_cell(row, column))
+        try:
+            menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            menu.grab_release()
+
+    def sort_by_column(self, column, descending=False):
+        """Order the view by a column, or restore file order when column is None."""
+        try:
+            with timing.operation("sort"):
+                self.data_manager.sort_rows(column, descending)
                 self.update_table_view()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
 
-                messagebox.showinfo("Success", f"Added new column: {column_name}")
+    def explore_cell(self, row, column):
+        """Open the nested value explorer on one cell."""
+        from src.components.nested_explorer import NestedExplorer
+        try:
+            tab = self.tab
+            NestedExplorer(self.root, tab.data_manager, row, column, on_change=lambda: self._refresh(tab))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
 
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to add column: {str(e)}")
+    def profile_column(self, column):
+        """Open a profile of one column, sketched in the background."""
+        try:
+            profile = self.data_manager.prepare_profile(column)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        from src.components.profile_panel import ProfilePanel
+        panel = ProfilePanel(self.root, column)
+        progress = {'done': 0, 'total': 0}
+        self._run_background(
+            lambda: profile(lambda done, total: progress.update(done=done, total=total)),
+            panel.show_profile,
+            lambda error: panel.status.configure(text=f"Failed to profile column: {error}"),
+            on_progress=lambda: panel.set_progress(progress['done'], progress['total']),
+            alive=panel.winfo_exists,
+        )
@@ -1,3 +1,6 @@
+import os
+
+
 class Config:
     DEFAULT_WINDOW_SIZE = "700x600"
     DEFAULT_PADDING = "10"
@@ -6,10 +9,49 @@ class Config:
         ("All files", "*.*")
     ]
     DEFAULT_COLUMN_WIDTH = 100
-    EMPTY_VALUE = -1
 
-    # Type mappings
-    TYPE_MAPPINGS = {
-        'timestamp[ms]': 'int64',
-        'int64': 'int64'
-    }
+    # Logging and timing
+    LOG_DIRECTORY = os.path.join(os.path.expanduser("~"), ".orc_editor", "logs")
+    LOG_FILENAME = "orc_editor.log"
+    LOG_MAX_BYTES = 1 << 20
+    LOG_BACKUP_COUNT = 3
+    PROFILE_TOP_ENTRIES = 25
+
+    # Memory budget; 0 means MEMORY_BUDGET_FRACTION of physical memory
+    MEMORY_BUDGET_MB = 0
+    MEMORY_BUDGET_FRACTION = 0.5
+    MEMORY_POLL_MS = 2000
+
+    # Files estimated to need more than this fraction of the budget are
+    # opened with the lazy Arrow backend instead of pandas
+    LAZY_BACKEND_FRACTION = 0.5
+    LAZY_DISPLAY_ROWS = 10000
+    # Decoded stripes kept in memory, for all open files together
+    LAZY_STRIPE_CACHE = 4
+
+    # Cells show at most this many list elements / string characters;
+    # the full value is shown in the larger editor
+    PREVIEW_ITEMS = 20
+    PREVIEW_CHARS = 200
+
+    # String columns whose first CATEGORICAL_SAMPLE_ROWS rows hold at most
+    # CATEGORICAL_MAX_RATIO distinct values per row (and no more than
+    # CATEGORICAL_MAX_VALUES) are loaded as pandas categoricals
+    CATEGORICAL_SAMPLE_ROWS = 65536
+    CATEGORICAL_MAX_RATIO = 0.1
+    CATEGORICAL_MAX_VALUES = 10000
+
+    # Unsaved edits are appended to a journal next to the file, e.g.
+    # data.orc.journal, and can be replayed after a crash
+    JOURNAL_SUFFIX = ".journal"
+
+    # List elements the nested explorer adds per page
+    EXPLORER_PAGE_SIZE = 100
+
+    # Threads running background work (indexing, statistics, export...)
+    # for every open file
+    WORKER_THREADS = 4
+
+    # Delay before heavy modules are imported in the background, so the
+    # window is painted first
+    WARM_UP_DELAY_MS = 50
@@ -0,0 +1,40 @@
+"""Writing files so that readers never see them half written."""
+import os
+import secrets
+import shutil
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def replacing(destination: str) -> Iterator[str]:
+    """Write a file next to its destination and move it into place once complete.
+
+    The destination may be the file being read. The finished file keeps the
+    permissions of the file it replaces; a new file gets the default
+    permissions for the user's umask, as if it had been created directly.
+
+    Args:
+        destination: Path of the file to write
+
+    Yields:
+        Path of the temporary file to write to; it is removed if the block fails
+    """
+    directory, name = os.path.split(os.path.abspath(destination))
+    while True:
+        temporary = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            # Created like any new file (0666 less the umask), unlike mkstemp's 0600
+            os.close(os.open(temporary, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+            break
+        except FileExistsError:
+            continue
+    try:
+        yield temporary
+        if os.path.exists(destination):
+            shutil.copymode(destination, temporary)
+        os.replace(temporary, destination)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
@@ -0,0 +1,257 @@
+"""Compile filter expressions such as ``status == "FAILED" and len(items) > 3``
+into ``pyarrow.compute`` expressions.
+
+The syntax is a small, safe subset of Python expressions: comparisons,
+``and``/``or``/``not``, ``in``/``not in`` against literal lists, ``is None``,
+arithmetic, dotted access into struct fields and a handful of functions.
+"""
+import ast
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+import pyarrow
+import pyarrow.compute as pc
+
+from src.exceptions.orc_exceptions import FilterExpressionError
+
+_COMPARISONS = {
+    ast.Eq: lambda left, right: left == right,
+    ast.NotEq: lambda left, right: left != right,
+    ast.Lt: lambda left, right: left < right,
+    ast.LtE: lambda left, right: left <= right,
+    ast.Gt: lambda left, right: left > right,
+    ast.GtE: lambda left, right: left >= right,
+}
+
+_ARITHMETIC = {
+    ast.Add: pc.add,
+    ast.Sub: pc.subtract,
+    ast.Mult: pc.multiply,
+    ast.Div: pc.divide,
+}
+
+# name -> (compute function, number of arguments)
+_FUNCTIONS = {
+    'contains': (pc.match_substring, 2),
+    'startswith': (pc.starts_with, 2),
+    'endswith': (pc.ends_with, 2),
+    'lower': (pc.utf8_lower, 1),
+    'upper': (pc.utf8_upper, 1),
+    'isnull': (pc.is_null, 1),
+    'notnull': (pc.is_valid, 1),
+    'abs': (pc.abs, 1),
+}
+
+
+@dataclass
+class CompiledFilter:
+    """A compiled filter expression and the top-level columns it reads."""
+    expression: pc.Expression
+    columns: Set[str]
+
+
+def split_conjuncts(text: str) -> List[ast.expr]:
+    """Parse a filter and split its top-level ``and`` into separate terms.
+
+    Args:
+        text: Filter expression text
+
+    Returns:
+        List of AST nodes whose conjunction is the whole filter
+
+    Raises:
+        FilterExpressionError: If the text is not a valid expression
+    """
+    try:
+        tree = ast.parse(text.strip(), mode='eval').body
+    except SyntaxError as e:
+        raise FilterExpressionError(f"Invalid filter expression: {e.msg}")
+
+    conjuncts = []
+    pending = [tree]
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And):
+            pending[:0] = node.values
+        else:
+            conjuncts.append(node)
+    return conjuncts
+
+
+def conjunct_key(conjuncts: List[ast.expr]) -> Tuple[str, ...]:
+    """Get a whitespace-insensitive cache key for a list of conjuncts."""
+    return tuple(ast.dump(conjunct) for conjunct in conjuncts)
+
+
+def compile_filter(text: str, schema: pyarrow.Schema) -> CompiledFilter:
+    """Compile filter text into a pyarrow compute expression.
+
+    Args:
+        text: Filter expression text
+        schema: Schema the expression is evaluated against
+
+    Returns:
+        CompiledFilter with the expression and referenced columns
+
+    Raises:
+        FilterExpressionError: If the expression is invalid or uses unknown names
+    """
+    return compile_conjuncts(split_conjuncts(text), schema)
+
+
+def compile_conjuncts(conjuncts: List[ast.expr], schema: pyarrow.Schema) -> CompiledFilter:
+    """Compile already split conjuncts into a single AND-ed expression.
+
+    Args:
+        conjuncts: AST nodes as returned by ``split_conjuncts``
+        schema: Schema the expression is evaluated against
+
+    Returns:
+        CompiledFilter with the expression and referenced columns
+    """
+    compiler = _Compiler(schema)
+    expression = None
+    for conjunct in conjuncts:
+        compiled = compiler.visit(conjunct)
+        expression = compiled if expression is None else expression & compiled
+    return CompiledFilter(expression, compiler.columns)
+
+
+class _Compiler:
+    """Translate a Python AST into a pyarrow compute expression."""
+
+    def __init__(self, schema: pyarrow.Schema):
+        self.schema = schema
+        self.columns: Set[str] = set()
+
+    def visit(self, node: ast.AST):
+        method = getattr(self, f"visit_{type(node).__name__}", None)
+        if method is None:
+            raise FilterExpressionError(
+                f"Unsupported syntax in filter: {ast.unparse(node)}"
+            )
+        return method(node)
+
+    def visit_BoolOp(self, node: ast.BoolOp):
+        values = [self.visit(value) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = result & value if isinstance(node.op, ast.And) else result | value
+        return result
+
+    def visit_UnaryOp(self, node: ast.UnaryOp):
+        operand = self.visit(node.operand)
+        if isinstance(node.op, ast.Not):
+            return ~operand
+        if isinstance(node.op, ast.USub):
+            return pc.negate(operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        raise FilterExpressionError(f"Unsupported operator in filter: {ast.unparse(node)}")
+
+    def visit_BinOp(self, node: ast.BinOp):
+        function = _ARITHMETIC.get(type(node.op))
+        if function is None:
+            raise FilterExpressionError(f"Unsupported operator in filter: {ast.unparse(node)}")
+        return function(self.visit(node.left), self.visit(node.right))
+
+    def visit_Compare(self, node: ast.Compare):
+        result = None
+        left_node = node.left
+        for op, right_node in zip(node.ops, node.comparators):
+            comparison = self._compare(left_node, op, right_node)
+            result = comparison if result is None else result & comparison
+            left_node = right_node
+        return result
+
+    def _compare(self, left_node: ast.expr, op: ast.cmpop, right_node: ast.expr):
+        if isinstance(op, (ast.Is, ast.IsNot)):
+            if not (isinstance(right_node, ast.Constant) and right_node.value is None):
+                raise FilterExpressionError("'is' can only be used with None")
+            left = self.visit(left_node)
+            return left.is_null() if isinstance(op, ast.Is) else left.is_valid()
+
+        if isinstance(op, (ast.In, ast.NotIn)):
+            try:
+                values = ast.literal_eval(right_node)
+            except ValueError:
+                raise FilterExpressionError("'in' requires a literal list of values")
+            if not isinstance(values, (list, tuple, set)):
+                raise FilterExpressionError("'in' requires a literal list of values")
+            membership = self.visit(left_node).isin(list(values))
+            return membership if isinstance(op, ast.In) else ~membership
+
+        return _COMPARISONS[type(op)](self.visit(left_node), self.visit(right_node))
+
+    def visit_Call(self, node: ast.Call):
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise FilterExpressionError(f"Unsupported call in filter: {ast.unparse(node)}")
+        name = node.func.id
+
+        if name == 'len':
+            if len(node.args) != 1:
+                raise FilterExpressionError("len() takes exactly one argument")
+            data_type = self._type_of(node.args[0])
+            argument = self.visit(node.args[0])
+            if data_type is not None and (pyarrow.types.is_string(data_type)
+                                          or pyarrow.types.is_large_string(data_type)):
+                return pc.utf8_length(argument)
+            return pc.list_value_length(argument)
+
+        if name not in _FUNCTIONS:
+            supported = ', '.join(['len'] + sorted(_FUNCTIONS))
+            raise FilterExpressionError(f"Unknown function '{name}'. Supported: {supported}")
+
+        function, arity = _FUNCTIONS[name]
+        if len(node.args) != arity:
+            raise FilterExpressionError(f"{name}() takes exactly {arity} argument(s)")
+        if arity == 2:
+            pattern = node.args[1]
+            if not (isinstance(pattern, ast.Constant) and isinstance(pattern.value, str)):
+                raise FilterExpressionError(f"The second argument of {name}() must be a string")
+            return function(self.visit(node.args[0]), pattern.value)
+        return function(self.visit(node.args[0]))
+
+    def visit_Name(self, node: ast.Name):
+        return pc.field(*self._resolve_path(node))
+
+    def visit_Attribute(self, node: ast.Attribute):
+        return pc.field(*self._resolve_path(node))
+
+    def visit_Constant(self, node: ast.Constant):
+        return pc.scalar(node.value)
+
+    def visit_List(self, node: ast.List):
+        raise FilterExpressionError("Lists are only supported on the right of 'in'")
+
+    def _resolve_path(self, node: ast.expr) -> Tuple[str, ...]:
+        """Turn ``a`` or ``a.b.c`` into a validated field path."""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            raise FilterExpressionError(f"Unsupported field reference: {ast.unparse(node)}")
+        parts.append(node.id)
+        parts.reverse()
+
+        if parts[0] not in self.schema.names:
+            raise FilterExpressionError(f"Unknown column '{parts[0]}'")
+        self.columns.add(parts[0])
+
+        data_type = self.schema.field(parts[0]).type
+        for part in parts[1:]:
+            if not pyarrow.types.is_struct(data_type) or data_type.get_field_index(part) < 0:
+                raise FilterExpressionError(f"Unknown field '{'.'.join(parts)}'")
+            data_type = data_type.field(part).type
+        return tuple(parts)
+
+    def _type_of(self, node: ast.expr) -> Optional[pyarrow.DataType]:
+        """Get the Arrow type of a plain field reference, or None for other nodes."""
+        if not isinstance(node, (ast.Name, ast.Attribute)):
+            return None
+        parts = self._resolve_path(node)
+        data_type = self.schema.field(parts[0]).type
+        for part in parts[1:]:
+            data_type = data_type.field(part).type
+        return data_type
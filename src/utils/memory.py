@@ -0,0 +1,275 @@
+"""Memory accounting against a budget, with eviction and spill to disk.
+
+Owners (a data backend per open file) register with a
+``MemoryManager`` and describe what they hold as ``Consumer`` objects:
+caches that can simply be dropped, and Arrow tables that can be spilled to
+an Arrow IPC file and memory-mapped back. Mapped pages are backed by the
+file rather than by swap, so the operating system can drop them under
+pressure and fault them back in on access.
+
+Accounting adds up the Arrow memory pool, the pandas DataFrames
+(``memory_usage(deep=True)``) and the caches outside the pool. When that
+total exceeds the budget, ``enforce`` releases consumers in priority order
+until it fits again.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import pyarrow
+import pyarrow.orc as orc
+
+from src.utils.config import Config
+
+# Assumed when the physical memory size cannot be determined
+_FALLBACK_MEMORY = 8 << 30
+
+
+@dataclass
+class Consumer:
+    """Something an owner holds that can be given back under pressure.
+
+    Attributes:
+        name: Label shown in the memory report
+        size: Returns the bytes currently held (0 once released)
+        release: Drops or spills the data
+        priority: Lower priorities are released first
+        in_arrow_pool: Whether the bytes are part of the Arrow memory pool
+            (and so already counted by the pool total)
+    """
+    name: str
+    size: Callable[[], int]
+    release: Callable[[], None]
+    priority: int = 0
+    in_arrow_pool: bool = False
+
+
+@dataclass
+class MemoryReport:
+    budget: int
+    arrow_pool: int
+    dataframes: int
+    caches: Dict[str, int] = field(default_factory=dict)
+    spilled: int = 0
+    categorical_savings: int = 0
+
+    @property
+    def total(self) -> int:
+        """Bytes counted against the budget."""
+        return self.arrow_pool + self.dataframes + sum(self.caches.values())
+
+    @property
+    def over_budget(self) -> bool:
+        return self.total > self.budget
+
+    def summary(self) -> str:
+        """One-line summary for the status bar."""
+        text = (f"Memory {format_bytes(self.total)} of {format_bytes(self.budget)} "
+                f"(Arrow {format_bytes(self.arrow_pool)}, DataFrame {format_bytes(self.dataframes)}")
+        caches = sum(self.caches.values())
+        if caches:
+            text += f", caches {format_bytes(caches)}"
+        text += ")"
+        if self.spilled:
+            text += f", {format_bytes(self.spilled)} spilled to disk"
+        if self.categorical_savings:
+            text += f", {format_bytes(self.categorical_savings)} saved by categoricals"
+        return text
+
+
+def format_bytes(size: int) -> str:
+    """Human readable byte count, e.g. ``1.5 GB``."""
+    if abs(size) < 1024:
+        return f"{size} B"
+    for unit in ('KB', 'MB', 'GB', 'TB'):
+        size /= 1024
+        if abs(size) < 1024 or unit == 'TB':
+            break
+    return f"{size:.1f} {unit}"
+
+
+def physical_memory() -> int:
+    """Installed memory in bytes, or a conservative guess if unknown."""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return _FALLBACK_MEMORY
+
+
+def default_budget() -> int:
+    """The configured budget, or a fraction of physical memory."""
+    if Config.MEMORY_BUDGET_MB:
+        return Config.MEMORY_BUDGET_MB << 20
+    return int(physical_memory() * Config.MEMORY_BUDGET_FRACTION)
+
+
+def estimate_dataframe_bytes(table: pyarrow.Table, sample_rows: int = 65536) -> int:
+    """Estimate the size of a table converted to pandas.
+
+    The first ``sample_rows`` rows are converted and measured, and the
+    bytes per row are scaled to the whole table.
+
+    Args:
+        table: Arrow table or record batch about to be converted
+
+    Returns:
+        Estimated bytes of the DataFrame
+    """
+    if table.num_rows == 0:
+        return 0
+    sample = table.slice(0, sample_rows)
+    pandas_bytes = sample.to_pandas().memory_usage(deep=True, index=False).sum()
+    return int(pandas_bytes / sample.num_rows * table.num_rows)
+
+
+def estimate_load_bytes(filename: str) -> int:
+    """Estimate the memory needed to open a file in the editor.
+
+    The first stripe is decoded and converted to pandas to measure bytes
+    per row for both copies, which is scaled to the whole file.
+
+    Args:
+        filename: Path of the ORC file
+
+    Returns:
+        Estimated bytes for the Arrow table plus the DataFrame
+    """
+    orc_file = orc.ORCFile(filename)
+    if orc_file.nrows == 0 or orc_file.nstripes == 0:
+        return 0
+    stripe = orc_file.read_stripe(0)
+    if stripe.num_rows == 0:
+        return 0
+    per_row = (stripe.get_total_buffer_size() + estimate_dataframe_bytes(stripe)) / stripe.num_rows
+    return int(per_row * orc_file.nrows)
+
+
+class MemoryManager:
+    """Tracks owners against a shared budget and spills or evicts on demand."""
+
+    def __init__(self, budget: Optional[int] = None, spill_directory: Optional[str] = None):
+        self.budget = budget if budget is not None else default_budget()
+        self._spill_root = spill_directory
+        self._spill_directory: Optional[str] = None
+        self._owners: 'weakref.WeakSet' = weakref.WeakSet()
+        self._spilled: Dict[int, int] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def track(self, owner) -> None:
+        """Start accounting for an owner.
+
+        The owner must provide ``memory_consumers() -> List[Consumer]``,
+        ``dataframe_bytes() -> int`` and ``categorical_savings() -> int``.
+        Owners are held weakly.
+        """
+        self._owners.add(owner)
+
+    def untrack(self, owner) -> None:
+        """Stop accounting for an owner."""
+        self._owners.discard(owner)
+
+    def _consumers(self) -> List[Consumer]:
+        return [consumer for owner in list(self._owners) for consumer in owner.memory_consumers()]
+
+    def report(self) -> MemoryReport:
+        """Measure current usage."""
+        caches: Dict[str, int] = {}
+        for consumer in self._consumers():
+            if not consumer.in_arrow_pool:
+                caches[consumer.name] = caches.get(consumer.name, 0) + consumer.size()
+        with self._lock:
+            spilled = sum(self._spilled.values())
+        return MemoryReport(
+            budget=self.budget,
+            arrow_pool=pyarrow.total_allocated_bytes(),
+            dataframes=sum(owner.dataframe_bytes() for owner in list(self._owners)),
+            caches={name: size for name, size in caches.items() if size},
+            spilled=spilled,
+            categorical_savings=sum(owner.categorical_savings() for owner in list(self._owners)),
+        )
+
+    def fits(self, additional: int) -> bool:
+        """Whether another allocation of this size stays within the budget."""
+        return self.report().total + additional <= self.budget
+
+    def enforce(self) -> List[str]:
+        """Release consumers, lowest priority first, until usage fits the budget.
+
+        Returns:
+            Names of the consumers that were released
+        """
+        released = []
+        if not self.report().over_budget:
+            return released
+        for consumer in sorted(self._consumers(), key=lambda c: c.priority):
+            if not consumer.size():
+                continue
+            consumer.release()
+            released.append(consumer.name)
+            if not self.report().over_budget:
+                break
+        return released
+
+    def _directory(self) -> str:
+        if self._spill_directory is None:
+            self._spill_directory = tempfile.mkdtemp(prefix='orc_editor_spill_', dir=self._spill_root)
+            atexit.register(shutil.rmtree, self._spill_directory, True)
+        return self._spill_directory
+
+    def spill_table(self, table: pyarrow.Table) -> pyarrow.Table:
+        """Write a table to an Arrow IPC file and return it memory-mapped.
+
+        The returned table has the same contents but no longer uses the
+        Arrow memory pool. On POSIX systems the file is unlinked right away;
+        the mapping keeps it readable until the table is released.
+
+        Args:
+            table: Table to spill
+
+        Returns:
+            The memory-mapped copy
+        """
+        with self._lock:
+            self._counter += 1
+            path = os.path.join(self._directory(), f"table-{self._counter}.arrow")
+        with pyarrow.OSFile(path, 'wb') as sink:
+            with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        size = os.path.getsize(path)
+        mapped = pyarrow.ipc.open_file(pyarrow.memory_map(path, 'r')).read_all()
+        if os.name == 'posix':
+            os.unlink(path)
+
+        key = id(mapped)
+        with self._lock:
+            self._spilled[key] = size
+        weakref.finalize(mapped, self._forget, key)
+        return mapped
+
+    def is_spilled(self, table: pyarrow.Table) -> bool:
+        """Whether a table was returned by ``spill_table``."""
+        with self._lock:
+            return id(table) in self._spilled
+
+    def _forget(self, key: int) -> None:
+        with self._lock:
+            self._spilled.pop(key, None)
+
+
+_shared: Optional[MemoryManager] = None
+_shared_lock = threading.Lock()
+
+
+def shared_memory_manager() -> MemoryManager:
+    """The process-wide manager every open file is accounted against."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = MemoryManager()
+        return _shared
@@ -1,131 +1,206 @@
-from typing import Dict, List, Union, Optional
+import weakref
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
 
 import pyarrow
 
 
-class SchemaValidator:
-    @staticmethod
-    def compare_schemas(original_schema: pyarrow.Schema, saved_schema: pyarrow.Schema) -> List[str]:
-        """Compare two schemas and return a list of differences.
+class SchemaNode:
+    """Hash-consed, immutable representation of a (possibly nested) Arrow type.
 
-        Args:
-            original_schema: The original PyArrow schema
-            saved_schema: The schema to compare against
+    Nodes are interned: two structurally equal types always map to the same
+    node object, so equality of whole subtrees is an identity check and the
+    fingerprint of every subtree is computed exactly once. The intern table
+    holds nodes weakly, so nodes of schemas no longer in use are freed.
+    """
 
-        Returns:
-            List of string descriptions of differences found
-        """
-        differences = []
-        orig_dict = SchemaValidator._schema_to_dict(original_schema)
-        saved_dict = SchemaValidator._schema_to_dict(saved_schema)
+    __slots__ = ('kind', 'label', 'type_string', 'children', 'fingerprint', '__weakref__')
 
-        # Compare fields and types
-        differences.extend(SchemaValidator._compare_fields(orig_dict, saved_dict))
-        return differences
+    # A key names its children by id; a live node keeps its children alive,
+    # so those ids cannot be reused while the key is in the table
+    _interned: 'weakref.WeakValueDictionary[tuple, SchemaNode]' = weakref.WeakValueDictionary()
 
-    @staticmethod
-    def _schema_to_dict(schema: pyarrow.Schema) -> Dict[str, Dict[str, Union[str, Dict]]]:
-        """Convert a PyArrow schema to a dictionary representation.
+    def __init__(self, kind: str, label: str, type_string: str,
+                 children: Tuple[Tuple[str, 'SchemaNode'], ...], fingerprint: int):
+        self.kind = kind
+        self.label = label
+        self.type_string = type_string
+        self.children = children
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def intern(cls, kind: str, label: str, type_string: str,
+               children: Tuple[Tuple[str, 'SchemaNode'], ...] = ()) -> 'SchemaNode':
+        """Return the unique node for the given kind, label and children.
 
         Args:
-            schema: PyArrow schema to convert
+            kind: Node kind ('primitive', 'list', 'struct' or 'map')
+            label: Type identity at this level, excluding the children
+            type_string: String form of the Arrow type
+            children: Named child nodes, already interned
 
         Returns:
-            Dictionary representation of the schema
+            The shared SchemaNode instance
         """
-        result = {}
-        for field in schema:
-            result[field.name] = SchemaValidator._get_field_type(field)
-        return result
+        # Children are interned, so their identity stands in for their structure
+        key = (kind, label, tuple((name, id(child)) for name, child in children))
+        node = cls._interned.get(key)
+        if node is None:
+            fingerprint = hash((key[0], key[1],
+                                tuple((name, child.fingerprint) for name, child in children)))
+            node = cls(kind, label, type_string, children, fingerprint)
+            cls._interned[key] = node
+        return node
+
+    def child(self, name: str) -> Optional['SchemaNode']:
+        """Get a child node by name, or None if it does not exist."""
+        for child_name, child in self.children:
+            if child_name == name:
+                return child
+        return None
+
+    def __repr__(self) -> str:
+        return f"SchemaNode({self.type_string})"
+
+
+def _node_for_type(data_type: pyarrow.DataType) -> SchemaNode:
+    """Build (or fetch) the interned node for an Arrow data type."""
+    if pyarrow.types.is_map(data_type):
+        children = (
+            ('key', _node_for_type(data_type.key_type)),
+            ('value', _node_for_type(data_type.item_type)),
+        )
+        return SchemaNode.intern('map', 'map', str(data_type), children)
+
+    if (pyarrow.types.is_list(data_type) or pyarrow.types.is_large_list(data_type)
+            or pyarrow.types.is_fixed_size_list(data_type)):
+        children = (('[]', _node_for_type(data_type.value_type)),)
+        label = str(data_type.id)
+        if pyarrow.types.is_fixed_size_list(data_type):
+            label = f"{label}[{data_type.list_size}]"
+        return SchemaNode.intern('list', label, str(data_type), children)
+
+    if pyarrow.types.is_struct(data_type):
+        children = tuple(
+            (data_type.field(i).name, _node_for_type(data_type.field(i).type))
+            for i in range(data_type.num_fields)
+        )
+        return SchemaNode.intern('struct', 'struct', str(data_type), children)
+
+    return SchemaNode.intern('primitive', str(data_type), str(data_type))
+
+
+def _node_for_schema(schema: pyarrow.Schema) -> SchemaNode:
+    """Build (or fetch) the interned root node for a schema.
+
+    Schemas carrying metadata are not hashable, so only the field types are
+    cached; the root itself is interned from the already cached children.
+    """
+    children = tuple((field.name, _node_for_type(field.type)) for field in schema)
+    return SchemaNode.intern('struct', 'struct', 'schema', children)
+
+
+@dataclass(frozen=True)
+class SchemaDifference:
+    kind: str  # 'missing', 'extra' or 'type_mismatch'
+    path: str
+    original: Optional[str] = None
+    saved: Optional[str] = None
+
+    def describe(self) -> str:
+        """Format the difference as a readable message."""
+        if self.kind == 'missing':
+            return f"Missing field in saved schema: {self.path}"
+        if self.kind == 'extra':
+            return f"Extra field in saved schema: {self.path}"
+        return (
+            f"Type mismatch for {self.path}:\n"
+            f"  Original: {self.original}\n"
+            f"  Saved: {self.saved}"
+        )
+
 
+class SchemaValidator:
     @staticmethod
-    def _get_field_type(field: pyarrow.Field) -> Dict[str, Union[str, Dict]]:
-        """Get the type information for a field.
+    def compare_schemas(original_schema: pyarrow.Schema, saved_schema: pyarrow.Schema) -> List[str]:
+        """Compare two schemas and return a list of differences.
 
         Args:
-            field: PyArrow field to analyze
+            original_schema: The original PyArrow schema
+            saved_schema: The schema to compare against
 
         Returns:
-            Dictionary containing type information
+            List of string descriptions of differences found
         """
-        type_info = {'type': str(field.type)}
-
-        # Handle list types
-        if isinstance(field.type, pyarrow.ListType):
-            list_type = field.type
-            if isinstance(list_type.value_type, pyarrow.StructType):
-                struct_fields = {}
-                for struct_field in list_type.value_type:
-                    struct_fields[struct_field.name] = str(struct_field.type)
-                type_info = {
-                    'type': 'list<struct>',
-                    'struct_fields': struct_fields
-                }
-            else:
-                type_info['type'] = f'list<{str(list_type.value_type)}>'
-
-        # Handle struct types
-        elif isinstance(field.type, pyarrow.StructType):
-            struct_fields = {}
-            for struct_field in field.type:
-                struct_fields[struct_field.name] = str(struct_field.type)
-            type_info['struct_fields'] = struct_fields
-
-        return type_info
+        return [difference.describe()
+                for difference in SchemaValidator.diff_schemas(original_schema, saved_schema)]
 
     @staticmethod
-    def _compare_fields(original_dict: Dict, saved_dict: Dict) -> List[str]:
-        """Compare two schema dictionaries and return differences.
+    def diff_schemas(original_schema: pyarrow.Schema,
+                     saved_schema: pyarrow.Schema) -> List[SchemaDifference]:
+        """Compute a structured, recursive diff between two schemas.
+
+        Identical subtrees share a node and are skipped without being walked,
+        so equal schemas compare in constant time and unequal ones only visit
+        the subtrees that changed.
 
         Args:
-            original_dict: Dictionary representation of original schema
-            saved_dict: Dictionary representation of schema to compare against
+            original_schema: The original PyArrow schema
+            saved_schema: The schema to compare against
 
         Returns:
-            List of string descriptions of differences found
+            List of differences with full dotted field paths
         """
         differences = []
-
-        # Check for missing or different fields in saved schema
-        for field_name, original_type in original_dict.items():
-            if field_name not in saved_dict:
-                differences.append(f"Missing field in saved schema: {field_name}")
-            elif saved_dict[field_name] != original_type:
-                # Get detailed type information for better error messages
-                orig_type_str = SchemaValidator._format_type_info(original_type)
-                saved_type_str = SchemaValidator._format_type_info(saved_dict[field_name])
-                differences.append(
-                    f"Type mismatch for {field_name}:\n"
-                    f"  Original: {orig_type_str}\n"
-                    f"  Saved: {saved_type_str}"
-                )
-
-        # Check for extra fields in saved schema
-        for field_name in saved_dict:
-            if field_name not in original_dict:
-                differences.append(f"Extra field in saved schema: {field_name}")
-
+        SchemaValidator._diff_nodes(
+            _node_for_schema(original_schema),
+            _node_for_schema(saved_schema),
+            '',
+            differences
+        )
         return differences
 
     @staticmethod
-    def _format_type_info(type_info: Dict[str, Union[str, Dict]]) -> str:
-        """Format type information into a readable string.
+    def _diff_nodes(original: SchemaNode, saved: SchemaNode, path: str,
+                    differences: List[SchemaDifference]) -> None:
+        """Recursively collect the differences between two schema nodes.
 
         Args:
-            type_info: Dictionary containing type information
-
-        Returns:
-            Formatted string representation of the type
+            original: Node from the original schema
+            saved: Node from the schema to compare against
+            path: Field path of the nodes being compared
+            differences: List the differences are appended to
         """
-        if isinstance(type_info, str):
-            return type_info
-
-        base_type = type_info['type']
-        if 'struct_fields' in type_info:
-            struct_fields = [f"{name}: {type_}"
-                             for name, type_ in type_info['struct_fields'].items()]
-            return f"{base_type}{{{', '.join(struct_fields)}}}"
-        return base_type
+        if original is saved:
+            return
+
+        if (original.kind != saved.kind or original.label != saved.label
+                or original.kind == 'primitive'):
+            differences.append(SchemaDifference(
+                'type_mismatch', path, original.type_string, saved.type_string
+            ))
+            return
+
+        if original.kind == 'list':
+            SchemaValidator._diff_nodes(
+                original.children[0][1], saved.children[0][1], f"{path}[]", differences
+            )
+            return
+
+        saved_children = dict(saved.children)
+        original_names = set()
+        for name, child in original.children:
+            original_names.add(name)
+            child_path = f"{path}.{name}" if path else name
+            if name not in saved_children:
+                differences.append(SchemaDifference('missing', child_path, child.type_string))
+            else:
+                SchemaValidator._diff_nodes(child, saved_children[name], child_path, differences)
+
+        for name, child in saved.children:
+            if name not in original_names:
+                child_path = f"{path}.{name}" if path else name
+                differences.append(SchemaDifference('extra', child_path, saved=child.type_string))
 
     @staticmethod
     def validate_schema_compatibility(original_schema: pyarrow.Schema,
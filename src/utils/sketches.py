@@ -0,0 +1,258 @@
+"""Mergeable, fixed-size sketches for profiling columns of any length.
+
+Every sketch takes vectorized input (numpy arrays of 64-bit hashes, values
+or counts), uses memory that depends only on its parameters, and can be
+merged with another sketch of the same parameters, so stripes can be
+sketched in parallel and combined afterwards.
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow
+
+_MASK_32 = np.uint64(0xFFFFFFFF)
+
+
+def hash_values(values: np.ndarray) -> np.ndarray:
+    """Hash values to uint64 with pandas' vectorized hashing.
+
+    Args:
+        values: numpy array of numbers, strings or other hashable objects
+
+    Returns:
+        uint64 array of hashes
+    """
+    return pd.util.hash_array(values, categorize=False)
+
+
+def hash_arrow(values: pyarrow.Array) -> np.ndarray:
+    """Hash an Arrow array the same way whichever batch it comes from."""
+    array = values.to_numpy(zero_copy_only=False)
+    if array.dtype.kind in 'mM':
+        array = array.view(np.int64)
+    return hash_values(array)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Exact bit length of uint64 values, computed on 32-bit halves."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & _MASK_32).astype(np.float64)
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter with 2**precision one-byte registers."""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add a batch of uint64 hashes."""
+        if len(hashes) == 0:
+            return
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << remaining_bits) - 1)
+        rank = (remaining_bits - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Merge another sketch with the same precision into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error of the estimate relative to the true count."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class CountMinSketch:
+    """Count-Min sketch for approximate value frequencies.
+
+    Estimates never undercount and overcount by at most ``epsilon * total``
+    with probability ``1 - delta``.
+    """
+
+    def __init__(self, epsilon: float = 0.001, delta: float = 0.01):
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        self.epsilon = epsilon
+        self.delta = delta
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        """Derive one column per row from each 64-bit hash (double hashing)."""
+        first = (hashes & _MASK_32).astype(np.int64)
+        second = (hashes >> np.uint64(32)).astype(np.int64) | 1
+        rows = np.arange(self.depth, dtype=np.int64)[:, None]
+        return (first[None, :] + rows * second[None, :]) % self.width
+
+    def add_hashes(self, hashes: np.ndarray, counts: Optional[np.ndarray] = None) -> None:
+        """Add a batch of hashes, optionally with a count per hash."""
+        if len(hashes) == 0:
+            return
+        counts = np.ones(len(hashes), dtype=np.int64) if counts is None else counts.astype(np.int64)
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+        self.total += int(counts.sum())
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        """Merge another sketch with the same dimensions into this one."""
+        self.table += other.table
+        self.total += other.total
+
+    def estimate(self, hashes: np.ndarray) -> np.ndarray:
+        """Estimate the frequencies of the values with the given hashes."""
+        columns = self._columns(hashes)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    @property
+    def error_bound(self) -> float:
+        """Maximum overcount (with probability 1 - delta)."""
+        return self.epsilon * self.total
+
+
+class SpaceSaving:
+    """Mergeable SpaceSaving summary of the ``capacity`` most frequent values.
+
+    Each tracked value has a guaranteed count (a lower bound) and an error
+    so that ``count + error`` is an upper bound on its true frequency.
+    """
+
+    def __init__(self, capacity: int = 50):
+        self.capacity = capacity
+        self.counters: Dict[Any, Tuple[int, int]] = {}
+        self.floor = 0  # upper bound on the count of any untracked value
+
+    @classmethod
+    def from_counts(cls, values: List[Any], counts: np.ndarray, capacity: int = 50,
+                    floor: int = 0) -> 'SpaceSaving':
+        """Summarize exact counts of one batch, keeping only the top values.
+
+        Args:
+            values: Distinct values of the batch
+            counts: Exact count of each value
+            capacity: Number of values to keep
+            floor: Largest count among values the caller already dropped
+
+        Returns:
+            SpaceSaving summary of the batch
+        """
+        summary = cls(capacity)
+        summary.floor = floor
+        if len(counts) > capacity:
+            order = np.argpartition(-counts, capacity)
+            top, rest = order[:capacity], order[capacity:]
+            summary.floor = max(floor, int(counts[rest].max()))
+        else:
+            top = np.arange(len(counts))
+        summary.counters = {values[i]: (int(counts[i]), 0) for i in top}
+        return summary
+
+    def merge(self, other: 'SpaceSaving') -> None:
+        """Merge another summary into this one, keeping the top ``capacity`` values."""
+        merged = {}
+        for value in set(self.counters) | set(other.counters):
+            count_a, error_a = self.counters.get(value, (0, self.floor))
+            count_b, error_b = other.counters.get(value, (0, other.floor))
+            merged[value] = (count_a + count_b, error_a + error_b)
+
+        ranked = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)
+        floor = self.floor + other.floor
+        if len(ranked) > self.capacity:
+            dropped = ranked[self.capacity]
+            floor = max(floor, dropped[1][0] + dropped[1][1])
+        self.counters = dict(ranked[:self.capacity])
+        self.floor = floor
+
+    def top(self, k: int) -> List[Tuple[Any, int, int]]:
+        """Get the k most frequent values as (value, lower bound, upper bound)."""
+        ranked = sorted(self.counters.items(), key=lambda item: item[1][0], reverse=True)
+        return [(value, count, count + error) for value, (count, error) in ranked[:k]]
+
+
+class TDigest:
+    """Merging t-digest for approximate quantiles of numeric values.
+
+    Compression is vectorized: points are sorted, mapped through the k1
+    scale function and summed per integer k bucket.
+    """
+
+    def __init__(self, compression: float = 200.0):
+        self.compression = compression
+        self.means = np.array([], dtype=np.float64)
+        self.weights = np.array([], dtype=np.float64)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def add_values(self, values: np.ndarray) -> None:
+        """Add a batch of numeric values (NaN is ignored)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other: 'TDigest') -> None:
+        """Merge another digest into this one."""
+        if other.count == 0:
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # Quantile at the center of each point, mapped through the k1 scale function
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * np.clip(q, 0, 1) - 1)
+        bucket = np.floor(k).astype(np.int64)
+
+        starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+        bucket_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / bucket_weights
+        self.weights = bucket_weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the value at quantile q (0..1)."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        centers = (np.cumsum(self.weights) - self.weights / 2) / self.count
+        positions = np.concatenate([[0.0], centers, [1.0]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q, positions, values))
+
+    def rank_error(self, q: float) -> float:
+        """Approximate rank error at quantile q, as a fraction of the count."""
+        return min(0.5, math.pi * math.sqrt(q * (1 - q)) / self.compression)
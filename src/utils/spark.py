@@ -1,12 +1,17 @@
+import json
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
-import json
 
 
 def is_json(value):
     """Check if a value is a JSON string"""
     if not isinstance(value, str):
         return False
+    # Only objects and arrays are treated as JSON; skip parsing anything else
+    if not value.lstrip().startswith(('{', '[')):
+        return False
     try:
         json.loads(value)
         return True
@@ -71,3 +76,185 @@ def get_spark_type(pandas_dtype, sample_value=None):
         return 'StringType()'
     else:
         return 'StringType()'  # Default to string for unknown types
+
+
+# Schema-driven export: everything below works from the Arrow schema alone.
+
+_SPARK_PRIMITIVES = {
+    'bool': ('BooleanType()', 'BOOLEAN'),
+    'int8': ('ByteType()', 'TINYINT'),
+    'int16': ('ShortType()', 'SMALLINT'),
+    'int32': ('IntegerType()', 'INT'),
+    'int64': ('LongType()', 'BIGINT'),
+    'uint8': ('ShortType()', 'SMALLINT'),
+    'uint16': ('IntegerType()', 'INT'),
+    'uint32': ('LongType()', 'BIGINT'),
+    'uint64': ('DecimalType(20,0)', 'DECIMAL(20,0)'),
+    'halffloat': ('FloatType()', 'FLOAT'),
+    'float': ('FloatType()', 'FLOAT'),
+    'double': ('DoubleType()', 'DOUBLE'),
+    'string': ('StringType()', 'STRING'),
+    'large_string': ('StringType()', 'STRING'),
+    'binary': ('BinaryType()', 'BINARY'),
+    'large_binary': ('BinaryType()', 'BINARY'),
+    'date32[day]': ('DateType()', 'DATE'),
+    'date64[ms]': ('DateType()', 'DATE'),
+    'null': ('NullType()', 'VOID'),
+}
+
+
+def _spark_type(data_type, ddl):
+    """Recursively translate an Arrow type to Spark StructType code or DDL."""
+    import pyarrow as pa
+
+    if pa.types.is_struct(data_type):
+        fields = [data_type.field(i) for i in range(data_type.num_fields)]
+        if ddl:
+            return f"STRUCT<{', '.join(_ddl_field(field, ':') for field in fields)}>"
+        return f"StructType([{', '.join(_struct_field(field) for field in fields)}])"
+
+    if pa.types.is_map(data_type):
+        key_type = _spark_type(data_type.key_type, ddl)
+        value_type = _spark_type(data_type.item_type, ddl)
+        if ddl:
+            return f"MAP<{key_type}, {value_type}>"
+        return f"MapType({key_type}, {value_type}, {data_type.item_field.nullable})"
+
+    if (pa.types.is_list(data_type) or pa.types.is_large_list(data_type)
+            or pa.types.is_fixed_size_list(data_type)):
+        element_type = _spark_type(data_type.value_type, ddl)
+        if ddl:
+            return f"ARRAY<{element_type}>"
+        return f"ArrayType({element_type}, {data_type.value_field.nullable})"
+
+    if pa.types.is_decimal(data_type):
+        if ddl:
+            return f"DECIMAL({data_type.precision},{data_type.scale})"
+        return f"DecimalType({data_type.precision},{data_type.scale})"
+
+    if pa.types.is_timestamp(data_type):
+        return 'TIMESTAMP' if ddl else 'TimestampType()'
+
+    if pa.types.is_dictionary(data_type):
+        return _spark_type(data_type.value_type, ddl)
+
+    code, ddl_name = _SPARK_PRIMITIVES.get(str(data_type), ('StringType()', 'STRING'))
+    return ddl_name if ddl else code
+
+
+def _struct_field(field, data_type=None):
+    """Render a StructField for an Arrow field, optionally overriding its type."""
+    spark_type = _spark_type(data_type if data_type is not None else field.type, ddl=False)
+    return f"StructField({field.name!r}, {spark_type}, {field.nullable})"
+
+
+def _ddl_field(field, separator='', data_type=None):
+    """Render a DDL column definition (or ``name: type`` struct member) for an Arrow field."""
+    name = field.name.replace('`', '``')
+    spark_type = _spark_type(data_type if data_type is not None else field.type, ddl=True)
+    not_null = '' if field.nullable else ' NOT NULL'
+    return f"`{name}`{separator} {spark_type}{not_null}"
+
+
+def arrow_to_spark_type(data_type, ddl=False):
+    """Convert a PyArrow data type to a PySpark type expression or DDL type.
+
+    Args:
+        data_type: PyArrow data type, possibly nested
+        ddl: If True, return a Spark SQL DDL type (e.g. ``ARRAY<BIGINT>``)
+            instead of a ``pyspark.sql.types`` expression
+
+    Returns:
+        String representation of the Spark type
+    """
+    return _spark_type(data_type, ddl)
+
+
+def schema_to_spark_struct(schema, json_columns=None):
+    """Build a complete PySpark StructType expression for an Arrow schema.
+
+    Args:
+        schema: PyArrow schema of the file
+        json_columns: Optional mapping of string column names to the Arrow
+            type inferred for their JSON content (see ``detect_json_columns``)
+
+    Returns:
+        String with a ``StructType([...])`` expression
+    """
+    json_columns = json_columns or {}
+    fields = [_struct_field(field, json_columns.get(field.name)) for field in schema]
+    return "StructType([\n    " + ",\n    ".join(fields) + "\n])"
+
+
+def schema_to_spark_ddl(schema, json_columns=None):
+    """Build a Spark SQL DDL column list for an Arrow schema.
+
+    Args:
+        schema: PyArrow schema of the file
+        json_columns: Optional mapping of string column names to the Arrow
+            type inferred for their JSON content
+
+    Returns:
+        String such as ``\\`id\\` BIGINT, \\`tags\\` ARRAY<STRING>``
+    """
+    json_columns = json_columns or {}
+    return ",\n".join(_ddl_field(field, data_type=json_columns.get(field.name)) for field in schema)
+
+
+def detect_json_columns(filename, max_rows=1000):
+    """Find string columns whose values are JSON objects, by sampling.
+
+    Only the first stripe is read, only string columns are decoded, and at
+    most ``max_rows`` values per column are parsed. Results are cached per
+    file path, size and modification time.
+
+    Args:
+        filename: Path to the ORC file
+        max_rows: Maximum number of values to sample per column
+
+    Returns:
+        Dictionary mapping JSON column names to their inferred Arrow type
+    """
+    import os
+
+    stat = os.stat(filename)
+    return dict(_detect_json_columns(os.path.abspath(filename), stat.st_size,
+                                     stat.st_mtime_ns, max_rows))
+
+
+@lru_cache(maxsize=64)
+def _detect_json_columns(filename, size, mtime_ns, max_rows):
+    """Cached worker for ``detect_json_columns``; size and mtime key the cache."""
+    import io
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
+    import pyarrow.orc as orc
+
+    orc_file = orc.ORCFile(filename)
+    string_columns = [field.name for field in orc_file.schema
+                      if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)]
+    if not string_columns or orc_file.nstripes == 0:
+        return ()
+
+    sample = orc_file.read_stripe(0, columns=string_columns).slice(0, max_rows)
+    detected = []
+    for name in string_columns:
+        values = sample.column(name).drop_null()
+        if len(values) == 0:
+            continue
+
+        # Cheap vectorized pre-check before parsing anything
+        trimmed = pc.utf8_trim_whitespace(values)
+        if not pc.all(pc.starts_with(trimmed, '{')).as_py():
+            continue
+
+        try:
+            lines = "\n".join(trimmed.to_pylist()).encode('utf-8')
+            parsed = pa_json.read_json(io.BytesIO(lines))
+        except (pa.lib.ArrowInvalid, UnicodeEncodeError):
+            continue
+        detected.append((name, pa.struct(list(parsed.schema))))
+
+    return tuple(detected)
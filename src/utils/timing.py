@@ -0,0 +1,238 @@
+"""Lightweight timing of user-visible operations, built on ``logging``.
+
+An *operation* is one thing the user asked for (open a file, save, edit a
+row); a *span* is one phase inside it (read, convert, render, parse, build
+table, write, validate)::
+
+    with timing.operation("save"):
+        with timing.span("build table"):
+            ...
+        with timing.span("write"):
+            ...
+
+Operations are tracked per thread. When an operation finishes its
+breakdown is logged at INFO on the ``orc_editor.timing`` logger and kept as
+the last operation for the status bar. Spans outside any operation (from
+the CLI or a background thread) are only logged at DEBUG, so the cost of
+an untimed span is two ``perf_counter`` calls.
+
+Calling ``profile_next()`` runs the next operation under cProfile; the
+stats are written next to the log file and the top entries are logged.
+"""
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from src.utils.config import Config
+
+logger = logging.getLogger('orc_editor.timing')
+
+_local = threading.local()
+_lock = threading.Lock()
+_last: Optional['Operation'] = None
+_generation = 0
+_profile_next = False
+_log_directory: Optional[str] = None
+
+
+@dataclass
+class Operation:
+    name: str
+    started: float = field(default_factory=time.perf_counter)
+    spans: List[Tuple[str, float]] = field(default_factory=list)
+    seconds: float = 0.0
+    idle: float = 0.0
+    profile_path: Optional[str] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time to a phase, merging repeated phases."""
+        for index, (name, total) in enumerate(self.spans):
+            if name == phase:
+                self.spans[index] = (name, total + seconds)
+                return
+        self.spans.append((phase, seconds))
+
+    def breakdown(self) -> str:
+        """One-line summary, e.g. ``save 412 ms: build table 35 ms, write 310 ms``."""
+        parts = [f"{phase} {_format_seconds(seconds)}" for phase, seconds in self.spans]
+        other = self.seconds - sum(seconds for _, seconds in self.spans)
+        if self.spans and other >= 0.001:
+            parts.append(f"other {_format_seconds(other)}")
+        text = f"{self.name} {_format_seconds(self.seconds)}"
+        return f"{text}: {', '.join(parts)}" if parts else text
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 10:
+        return f"{seconds:.1f} s"
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    return f"{seconds * 1000:.0f} ms"
+
+
+def _stack() -> List[Operation]:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current_operation() -> Optional[Operation]:
+    """The innermost operation running on this thread, if any."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def span(phase: str) -> Iterator[None]:
+    """Time one phase of the current operation."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        operation = current_operation()
+        if operation is not None:
+            operation.add(phase, seconds)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s took %s", phase, _format_seconds(seconds))
+
+
+@contextmanager
+def idle() -> Iterator[None]:
+    """Exclude time spent waiting for the user (e.g. a modal dialog)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        operation = current_operation()
+        if operation is not None:
+            operation.idle += time.perf_counter() - started
+
+
+@contextmanager
+def operation(name: str) -> Iterator[Operation]:
+    """Time a user-visible operation and publish its breakdown.
+
+    An operation started inside another one on the same thread is recorded
+    as a span of the outer operation.
+    """
+    outer = current_operation()
+    if outer is not None:
+        with span(name):
+            yield outer
+        return
+
+    global _profile_next
+    profiler = None
+    with _lock:
+        if _profile_next:
+            import cProfile
+            _profile_next = False
+            profiler = cProfile.Profile()
+
+    current = Operation(name)
+    stack = _stack()
+    stack.append(current)
+    failed = False
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield current
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        stack.pop()
+        current.seconds = time.perf_counter() - current.started - current.idle
+        if profiler is not None:
+            current.profile_path = _save_profile(profiler, name)
+        _publish(current, failed)
+
+
+def _publish(current: Operation, failed: bool) -> None:
+    global _last, _generation
+    with _lock:
+        _last = current
+        _generation += 1
+    if failed:
+        logger.warning("%s (failed)", current.breakdown())
+    else:
+        logger.info("%s", current.breakdown())
+
+
+def last_operation() -> Tuple[int, Optional[Operation]]:
+    """The most recently finished operation and a counter that changes with it."""
+    with _lock:
+        return _generation, _last
+
+
+def profile_next(enabled: bool = True) -> None:
+    """Run the next operation (on any thread) under cProfile."""
+    global _profile_next
+    with _lock:
+        _profile_next = enabled
+
+
+def profile_pending() -> bool:
+    """Whether the next operation will be profiled."""
+    with _lock:
+        return _profile_next
+
+
+def _save_profile(profiler, name: str) -> Optional[str]:
+    """Write profiler stats to the log directory and log the top entries."""
+    import io
+    import pstats
+
+    text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=text)
+    stats.sort_stats('cumulative').print_stats(Config.PROFILE_TOP_ENTRIES)
+    logger.info("Profile of %s:\n%s", name, text.getvalue())
+
+    directory = _log_directory or Config.LOG_DIRECTORY
+    slug = ''.join(c if c.isalnum() else '-' for c in name)
+    path = os.path.join(directory, f"profile-{slug}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        stats.dump_stats(path)
+    except OSError as e:
+        logger.warning("Cannot write profile to %s: %s", path, e)
+        return None
+    return path
+
+
+def configure_logging(directory: Optional[str] = None, level: int = logging.INFO) -> Optional[str]:
+    """Send the application's log records to a rotating file.
+
+    Args:
+        directory: Where to keep the log; Config.LOG_DIRECTORY when None
+        level: Level for the ``orc_editor`` loggers
+
+    Returns:
+        Path of the log file, or None if it cannot be created
+    """
+    global _log_directory
+    directory = directory or Config.LOG_DIRECTORY
+    path = os.path.join(directory, Config.LOG_FILENAME)
+    root = logging.getLogger('orc_editor')
+    root.setLevel(level)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=Config.LOG_MAX_BYTES, backupCount=Config.LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+    except OSError as e:
+        logger.warning("Cannot open log file %s: %s", path, e)
+        return None
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root.addHandler(handler)
+    _log_directory = directory
+    return path
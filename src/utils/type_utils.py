@@ -24,3 +24,37 @@ def get_pyarrow_type(data_type):
     }
 
     return type_mapping.get(data_type, pa.string())
+
+
+def parse_pyarrow_type(type_name):
+    """Parse a type name from a script or command line into a PyArrow type.
+
+    Accepts the names offered by the Add Column dialog (``Integer``,
+    ``List<String>``...) as well as Arrow type names such as ``int32``,
+    ``timestamp[ms]`` or ``list<int64>``.
+
+    Args:
+        type_name: Type name to parse
+
+    Returns:
+        PyArrow data type object
+
+    Raises:
+        ValueError: If the type name is not recognized
+    """
+    import pyarrow as pa
+
+    name = type_name.strip()
+    if name in ("String", "Integer", "Float", "Boolean"):
+        return get_pyarrow_type(name)
+
+    lowered = name.lower()
+    if lowered.startswith("list<") and lowered.endswith(">"):
+        return pa.list_(parse_pyarrow_type(name[5:-1]))
+    try:
+        return pa.type_for_alias(lowered)
+    except ValueError:
+        pass
+    if lowered.startswith("timestamp[") and lowered.endswith("]"):
+        return pa.timestamp(lowered[10:-1])
+    raise ValueError(f"Unknown data type: {type_name}")
@@ -0,0 +1,64 @@
+"""Background threads shared by every open file.
+
+Long-running work started from the window (indexing, statistics, export,
+import, comparing, profiling) is submitted to one pool of
+``Config.WORKER_THREADS`` threads instead of starting a thread per job, so
+several open files cannot oversubscribe the CPU. The window polls the
+returned futures with ``root.after`` as before.
+
+The workers are daemon threads, like the per-job threads they replace, so
+closing the window never waits for a scan to finish.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from src.utils.config import Config
+
+
+class WorkerPool:
+    """A fixed number of daemon threads running submitted functions in order."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._tasks: 'queue.SimpleQueue' = queue.SimpleQueue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, function: Callable, *args) -> Future:
+        """Queue a call; the future completes with its result or exception."""
+        future = Future()
+        self._tasks.put((future, function, args))
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, daemon=True,
+                                          name=f"orc-editor-worker-{len(self._threads)}")
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def _work(self) -> None:
+        while True:
+            future, function, args = self._tasks.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = function(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+
+_shared: Optional[WorkerPool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool() -> WorkerPool:
+    """The worker pool used by every open file."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = WorkerPool(Config.WORKER_THREADS)
+        return _shared
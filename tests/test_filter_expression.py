@@ -0,0 +1,63 @@
+"""Compiling filter expressions, and refusing anything outside the safe subset."""
+import pyarrow
+import pytest
+
+from src.exceptions.orc_exceptions import FilterExpressionError
+from src.utils.filter_expression import compile_filter, split_conjuncts
+
+TABLE = pyarrow.table({
+    "status": ["OK", "FAILED", None, "FAILED"],
+    "retries": [0, 5, 2, 1],
+    "items": [[1], [1, 2, 3, 4], [], None],
+    "host": [{"name": "a.internal"}, {"name": "b"}, {"name": "c.internal"}, None],
+})
+
+
+def _rows(text):
+    compiled = compile_filter(text, TABLE.schema)
+    return TABLE.filter(compiled.expression).column("retries").to_pylist()
+
+
+def test_comparisons_and_boolean_operators():
+    assert _rows('status == "FAILED" and retries > 3') == [5]
+    assert _rows('retries >= 1 or not status == "FAILED"') == [0, 5, 2, 1]
+    assert _rows("0 < retries <= 2") == [2, 1]
+    assert _rows("retries * 2 + 1 == 11") == [5]
+
+
+def test_membership_null_checks_and_functions():
+    assert _rows('status in ["OK", "MISSING"]') == [0]
+    assert _rows("status is None") == [2]
+    assert _rows("len(items) > 2") == [5]
+    assert _rows('endswith(host.name, ".internal")') == [0, 2]
+    assert _rows('lower(status) == "failed" and notnull(items)') == [5]
+
+
+def test_compiled_filter_reports_the_columns_it_reads():
+    compiled = compile_filter('host.name == "b" and retries > 0', TABLE.schema)
+    assert compiled.columns == {"host", "retries"}
+
+
+def test_top_level_and_is_split_into_conjuncts():
+    assert len(split_conjuncts("retries > 0 and (status == 'OK' or retries < 3) and items is None")) == 3
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('true')",
+    "open('/etc/passwd')",
+    "status.__class__",
+    "(lambda: 1)()",
+    "status[0] == 'O'",
+    "[x for x in status]",
+    "status.upper()",
+    "contains(status, pattern=1)",
+    "retries ** 2 > 1",
+    "retries if status else 0",
+    "missing == 1",
+    "status is 'OK'",
+    "retries in range(3)",
+    "status ==",
+])
+def test_unsafe_or_unknown_syntax_is_rejected(text):
+    with pytest.raises(FilterExpressionError):
+        compile_filter(text, TABLE.schema)
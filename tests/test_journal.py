@@ -0,0 +1,37 @@
+"""Replaying the edit journal on top of the unchanged source file."""
+import pyarrow
+import pyarrow.orc as orc
+
+from src.data.data_manager import ORCDataManager
+
+
+def _write_source(path):
+    orc.write_table(pyarrow.table({"i": list(range(1000)),
+                                   "s": [f"row {i}" for i in range(1000)]}), str(path))
+
+
+def _open(path, recover=False):
+    data_manager = ORCDataManager()
+    data_manager.load_file(str(path))
+    data_manager.start_journal(recover)
+    return data_manager
+
+
+def test_cell_edits_after_operations_replay_on_the_operated_rows(tmp_path):
+    source = tmp_path / "data.orc"
+    _write_source(source)
+
+    edited = _open(source)
+    edited.apply_operations([{"op": "filter", "where": "i > 500"}])
+    edited.update_row(0, {"s": "edited"})
+    edited.close_journal()
+
+    recovered = ORCDataManager()
+    recovered.load_file(str(source))
+    assert recovered.recoverable_edits() == 2
+    recovered.start_journal(recover=True)
+
+    assert recovered.num_rows == 499
+    assert recovered.df["i"].iloc[0] == 501
+    assert recovered.df["s"].iloc[0] == "edited"
+    assert recovered.df["s"].iloc[1] == "row 502"
@@ -0,0 +1,113 @@
+"""Row-level diffs with and without key columns, in memory and spilled."""
+import numpy as np
+import pyarrow
+import pyarrow.orc as orc
+import pytest
+
+from src.data.orc_diff import diff_files
+
+
+def _write(path, ids, values, tags=None):
+    columns = {"id": pyarrow.array(ids, pyarrow.int64()), "value": values}
+    columns["tag"] = tags if tags is not None else [f"t{i % 7}" for i in ids]
+    orc.write_table(pyarrow.table(columns), str(path), stripe_size=64 * 1024)
+    return str(path)
+
+
+def _files(tmp_path):
+    """1000 rows; the right file changes row 5, drops id 10 and adds id 1000."""
+    ids = list(range(1000))
+    left = _write(tmp_path / "left.orc", ids, [i * 10 for i in ids])
+    right_ids = [i for i in ids if i != 10] + [1000]
+    right_values = [-1 if i == 5 else i * 10 for i in right_ids]
+    right = _write(tmp_path / "right.orc", right_ids, right_values)
+    return left, right
+
+
+@pytest.mark.parametrize("memory_budget_mb", [512, 0])
+def test_keyed_diff_pairs_rows_by_key(tmp_path, memory_budget_mb):
+    # A zero budget forces the largest number of spilled partitions
+    left, right = _files(tmp_path)
+    result = diff_files(left, right, key_columns=["id"], memory_budget_mb=memory_budget_mb)
+
+    assert result.removed.tolist() == [10]
+    assert result.added.tolist() == [999]
+    assert result.modified.tolist() == [[5, 5]]
+    assert result.column_changes == {"value": 1}
+    assert result.modified_examples[0].changes == {"value": (50, -1)}
+    assert result.unchanged == 998
+    assert result.duplicate_keys == 0
+
+
+@pytest.mark.parametrize("memory_budget_mb", [512, 0])
+def test_unkeyed_diff_reports_changed_rows_as_removed_and_added(tmp_path, memory_budget_mb):
+    left, right = _files(tmp_path)
+    result = diff_files(left, right, memory_budget_mb=memory_budget_mb)
+
+    assert result.removed.tolist() == [5, 10]
+    assert result.added.tolist() == [5, 999]
+    assert len(result.modified) == 0
+    assert result.removed_examples[0] == (5, {"id": 5, "value": 50, "tag": "t5"})
+
+
+def test_identical_files_have_no_differences(tmp_path):
+    left, _ = _files(tmp_path)
+    result = diff_files(left, left, key_columns=["id"])
+    assert not result.has_differences
+    assert result.unchanged == 1000
+
+
+def test_duplicate_keys_are_paired_in_file_order(tmp_path):
+    left = _write(tmp_path / "left.orc", [1, 1, 2, 2, 2], [10, 11, 20, 21, 22])
+    right = _write(tmp_path / "right.orc", [1, 1, 2, 2], [10, 99, 20, 21])
+    result = diff_files(left, right, key_columns=["id"])
+
+    assert result.modified.tolist() == [[1, 1]]
+    assert result.removed.tolist() == [4]
+    assert result.added.tolist() == []
+    assert result.duplicate_keys == 3 + 2
+
+
+def test_unkeyed_diff_counts_repeated_rows(tmp_path):
+    tags = ["same"] * 3
+    left = _write(tmp_path / "left.orc", [1, 1, 1], [0, 0, 0], tags)
+    right = _write(tmp_path / "right.orc", [1, 1], [0, 0], tags[:2])
+    result = diff_files(left, right)
+    assert len(result.removed) == 1
+    assert len(result.added) == 0
+
+
+def test_columns_with_incompatible_new_values_are_reported_not_compared(tmp_path):
+    left = _write(tmp_path / "left.orc", [1, 2], [10, 20], ["1", "2"])
+    right = _write(tmp_path / "right.orc", [1, 2], [10, 21], pyarrow.array([1, 2], pyarrow.int64()))
+    assert diff_files(left, right, key_columns=["id"]).compared_columns == ["id", "value", "tag"]
+
+    right = _write(tmp_path / "right.orc", [1, 2], [10, 21], ["x", "y"])
+    left = _write(tmp_path / "left.orc", [1, 2], [10, 20], pyarrow.array([1, 2], pyarrow.int64()))
+    result = diff_files(left, right, key_columns=["id"])
+    assert result.compared_columns == ["id", "value"]
+    assert any("tag not compared" in difference for difference in result.schema_differences)
+    assert result.modified.tolist() == [[1, 1]]
+
+    with pytest.raises(ValueError, match="cannot be compared"):
+        diff_files(left, right, key_columns=["tag"])
+
+
+def test_spilled_and_in_memory_diffs_agree_on_random_changes(tmp_path):
+    rng = np.random.default_rng(3)
+    ids = np.arange(20_000)
+    values = rng.integers(0, 100, size=len(ids))
+    left = _write(tmp_path / "left.orc", ids, values)
+    changed = values.copy()
+    changed[rng.choice(len(ids), 200, replace=False)] += 1
+    keep = np.ones(len(ids), bool)
+    keep[rng.choice(len(ids), 50, replace=False)] = False
+    right = _write(tmp_path / "right.orc", ids[keep], changed[keep])
+
+    in_memory = diff_files(left, right, key_columns=["id"])
+    spilled = diff_files(left, right, key_columns=["id"], memory_budget_mb=0)
+    assert len(in_memory.removed) == 50
+    assert len(in_memory.modified) == 200 - np.count_nonzero(~keep & (changed != values))
+    assert np.array_equal(in_memory.removed, spilled.removed)
+    assert np.array_equal(in_memory.added, spilled.added)
+    assert sorted(in_memory.modified.tolist()) == sorted(spilled.modified.tolist())
@@ -0,0 +1,26 @@
+"""Schema changes made while the search index is built in the background."""
+import pyarrow
+import pyarrow.orc as orc
+
+from src.data.data_manager import ORCDataManager
+
+
+def test_column_changes_during_build_reach_the_installed_index(tmp_path):
+    source = tmp_path / "data.orc"
+    orc.write_table(pyarrow.table({"host": ["alpha", "bravo"], "status": ["failed", "ok"],
+                                   "debug": ["secret", "trace"]}), str(source))
+    data_manager = ORCDataManager()
+    data_manager.load_file(str(source))
+
+    build = data_manager.prepare_search_index()
+    data_manager.drop_column("debug")
+    data_manager.rename_column("status", "state")
+    data_manager.add_column("region", "String", "europe")
+    data_manager.update_row(0, {"state": "retried"})
+    build()
+
+    assert list(data_manager.search("secret")) == []
+    assert sorted(data_manager.search_index.columns) == ["host", "region", "state"]
+    assert list(data_manager.search("europe")) == [0, 1]
+    assert list(data_manager.search("retried")) == [0]
+    assert list(data_manager.search("failed")) == []
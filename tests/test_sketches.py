@@ -0,0 +1,90 @@
+"""Sketch estimates stay within the error bounds the sketches report."""
+import numpy as np
+
+from src.utils.sketches import CountMinSketch, HyperLogLog, SpaceSaving, TDigest, hash_values
+
+
+def _zipf_counts(distinct, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.zipf(1.3, size=200_000)
+    values = values[values <= distinct]
+    keys, counts = np.unique(values, return_counts=True)
+    return keys, counts
+
+
+def test_hyperloglog_estimate_is_within_three_standard_errors():
+    sketch = HyperLogLog(precision=12)
+    sketch.add_hashes(hash_values(np.arange(100_000)))
+    assert abs(sketch.estimate() - 100_000) <= 3 * sketch.relative_error * 100_000
+
+
+def test_hyperloglog_merge_counts_the_union():
+    left, right = HyperLogLog(precision=12), HyperLogLog(precision=12)
+    left.add_hashes(hash_values(np.arange(0, 60_000)))
+    right.add_hashes(hash_values(np.arange(40_000, 100_000)))
+    left.merge(right)
+    assert abs(left.estimate() - 100_000) <= 3 * left.relative_error * 100_000
+
+
+def test_hyperloglog_small_counts_are_nearly_exact():
+    sketch = HyperLogLog(precision=12)
+    sketch.add_hashes(hash_values(np.arange(100)))
+    assert abs(sketch.estimate() - 100) <= 2
+
+
+def test_count_min_never_undercounts_and_stays_within_its_bound():
+    keys, counts = _zipf_counts(50_000)
+    halves = [CountMinSketch(epsilon=0.001, delta=0.01) for _ in range(2)]
+    hashes = hash_values(keys)
+    halves[0].add_hashes(hashes[::2], counts[::2])
+    halves[1].add_hashes(hashes[1::2], counts[1::2])
+    sketch = halves[0]
+    sketch.merge(halves[1])
+
+    estimates = sketch.estimate(hashes)
+    assert sketch.total == counts.sum()
+    assert (estimates >= counts).all()
+    assert np.mean(estimates - counts <= sketch.error_bound) >= 1 - sketch.delta
+
+
+def test_space_saving_bounds_contain_the_true_counts():
+    keys, counts = _zipf_counts(5_000)
+    true_counts = dict(zip(keys.tolist(), counts.tolist()))
+
+    # Shuffle the rows into four batches, as stripes would hold them
+    rows = np.random.default_rng(1).permutation(np.repeat(keys, counts))
+    summary = SpaceSaving(capacity=50)
+    for batch in np.array_split(rows, 4):
+        batch_keys, batch_counts = np.unique(batch, return_counts=True)
+        summary.merge(SpaceSaving.from_counts(batch_keys.tolist(), batch_counts, capacity=50))
+
+    for value, low, high in summary.top(50):
+        assert low <= true_counts[value] <= high
+    untracked = max(count for value, count in true_counts.items() if value not in summary.counters)
+    assert untracked <= summary.floor
+    expected_top = sorted(true_counts, key=true_counts.get, reverse=True)[:10]
+    assert [value for value, _, _ in summary.top(10)] == expected_top
+
+
+def test_space_saving_is_exact_when_nothing_is_dropped():
+    summary = SpaceSaving.from_counts(['a', 'b'], np.array([3, 1]), capacity=10)
+    summary.merge(SpaceSaving.from_counts(['b', 'c'], np.array([4, 2]), capacity=10))
+    assert summary.floor == 0
+    assert summary.top(3) == [('b', 5, 5), ('a', 3, 3), ('c', 2, 2)]
+
+
+def test_t_digest_quantiles_are_within_the_rank_error():
+    rng = np.random.default_rng(2)
+    values = rng.lognormal(size=200_000)
+    digest = TDigest(compression=200)
+    for batch in np.array_split(values, 8):
+        part = TDigest(compression=200)
+        part.add_values(batch)
+        digest.merge(part)
+
+    ordered = np.sort(values)
+    assert digest.count == len(values)
+    assert digest.quantile(0) == ordered[0] and digest.quantile(1) == ordered[-1]
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        rank = np.searchsorted(ordered, digest.quantile(q)) / len(values)
+        assert abs(rank - q) <= digest.rank_error(q)